@@ -19,13 +19,67 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-"""To get started, you will want to initialize an instance of `Client` or `GatewayClient`"""
+"""To get started, you will want to initialize an instance of `Client` or `GatewayClient`
+
+Heavy submodules (`alertapi.api`, `alertapi.impl`, `alertapi.internal` and
+everything depending on aiohttp) are imported lazily on first attribute
+access, so importing the package only for entities stays cheap.
+"""
+
+import importlib
+import typing
 
-from alertapi import api
-from alertapi import impl
-from alertapi import internal
-from alertapi.impl import APIClient, GatewayClient
 from alertapi.events.base_events import *
 from alertapi.errors import *
 from alertapi.snowflakes import *
 from alertapi.states import *
+from alertapi.events import base_events
+from alertapi import errors
+from alertapi import snowflakes
+from alertapi import states
+
+if typing.TYPE_CHECKING:
+    from alertapi import api
+    from alertapi import impl
+    from alertapi import internal
+    from alertapi import images
+    from alertapi import maps
+    from alertapi import frames
+    from alertapi import queries
+    from alertapi.impl import APIClient, GatewayClient
+
+_LAZY_SUBMODULES: typing.Final[typing.FrozenSet[str]] = frozenset(
+    ('api', 'impl', 'internal', 'images', 'maps', 'frames', 'queries', 'snapshots', 'regions', 'history', 'exports')
+)
+"""Submodules imported on first access."""
+
+_LAZY_ATTRIBUTES: typing.Final[typing.Mapping[str, str]] = {
+    'APIClient': 'alertapi.impl',
+    'GatewayClient': 'alertapi.impl',
+}
+"""Attributes imported on first access mapped to the module they live in."""
+
+__all__: typing.Sequence[str] = (
+    *base_events.__all__,
+    *errors.__all__,
+    *snowflakes.__all__,
+    *states.__all__,
+    *_LAZY_ATTRIBUTES,
+    *sorted(_LAZY_SUBMODULES),
+)
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f'{__name__}.{name}')
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_LAZY_SUBMODULES, *_LAZY_ATTRIBUTES})
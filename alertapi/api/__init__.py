@@ -25,3 +25,4 @@ from alertapi.api.entity_factory import *
 from alertapi.api.event_factory import *
 from alertapi.api.event_manager import *
 from alertapi.api.http import *
+from alertapi.api.sink import *
@@ -32,6 +32,7 @@ if typing.TYPE_CHECKING:
     from alertapi.internal import data_binding
     from alertapi import states
     from alertapi import images
+    from alertapi import frames
 
 
 class EntityFactory(abc.ABC):
@@ -68,12 +69,32 @@ class EntityFactory(abc.ABC):
         """
 
     @abc.abstractmethod
-    def deserialize_image(self, url: str) -> images.Image:
+    def deserialize_states_frame(self, payload: typing.Sequence[data_binding.JSONObject]) -> frames.StatesFrame:
+        """Parse a sequence of raw payload from Alert API into a columnar frame.
+
+        Parameters
+        ----------
+        payload : typing.Sequence[alertapi.internal.data_binding.JSONObject]
+            The sequence of JSON payload to deserialize.
+
+        Returns
+        -------
+        alertapi.frames.StatesFrame
+            The columnar frame of deserialized states.
+        """
+
+    @abc.abstractmethod
+    def deserialize_image(
+        self, url: str, headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> images.Image:
         """Parse a url to static map into Image object.
 
         Parameters
         ----------
         url : builtins.str
+            Url to image.
+        headers : typing.Optional[typing.Mapping[builtins.str, builtins.str]]
+            Headers to send when downloading the image.
 
         Returns
         -------
@@ -29,6 +29,7 @@ import abc
 import typing
 
 if typing.TYPE_CHECKING:
+    from alertapi import states
     from alertapi.events import base_events
     from alertapi.internal import data_binding
 
@@ -61,6 +62,30 @@ class EventFactory(abc.ABC):
             The parsed state update event object.
         """
 
+    @abc.abstractmethod
+    def deserialize_state_transition_event(
+        self,
+        state: states.State,
+        previous_alert: typing.Optional[bool],
+        suppressed: int = 0
+    ) -> base_events.StateTransitionEvent:
+        """Build a settled alert transition event of a state.
+
+        Parameters
+        ----------
+        state : alertapi.states.State
+            The state in its settled status.
+        previous_alert : typing.Optional[builtins.bool]
+            Alert status before the transition, if it is known.
+        suppressed : builtins.int
+            Number of alert changes folded into the transition.
+
+        Returns
+        -------
+        alertapi.events.base_events.StateTransitionEvent
+            The transition event object.
+        """
+
     @abc.abstractmethod
     def deserialize_ping_event(self) -> base_events.PingEvent:
         """Parse ping event payload into ping update object.
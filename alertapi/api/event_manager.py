@@ -31,9 +31,8 @@ import abc
 if typing.TYPE_CHECKING:
     import asyncio
 
-    from aiohttp_sse_client import client as sse_client
-
     from alertapi.events import base_events
+    from alertapi import snowflakes
 
 
 class EventManager(abc.ABC):
@@ -50,7 +49,10 @@ class EventManager(abc.ABC):
     def subscribe(
         self,
         event_type: typing.Type[base_events.Event],
-        callback: typing.Callable
+        callback: typing.Callable,
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        predicate: typing.Optional[typing.Callable[[base_events.Event], bool]] = None
     ) -> None:
         """Subscribe a given callback to a given event type.
 
@@ -62,6 +64,18 @@ class EventManager(abc.ABC):
         callback : typing.Callable
             Must be a coroutine function to invoke. This should
             consume an instance of the given event.
+        states : typing.Optional[typing.Iterable[typing.Union[alertapi.snowflakes.Snowflake, builtins.str]]]
+            If specified, the callback is only invoked for events of
+            these states, given by identificator or name. Events are
+            routed to such callbacks by state without checking the others.
+        predicate : typing.Optional[typing.Callable[[alertapi.events.base_events.Event], builtins.bool]]
+            If specified, the callback is only invoked for events
+            the predicate returns `builtins.True` for.
+
+        Raises
+        ------
+        alertapi.errors.StateNotFound
+            * If one of the state names does not exist.
 
         Example
         -------
@@ -75,16 +89,27 @@ class EventManager(abc.ABC):
                 ...
 
             client.subscribe(StateUpdateEvent, on_state_update)
+            client.subscribe(StateUpdateEvent, on_state_update, states=['Lviv', 'Kyiv city'])
         """
 
     @abc.abstractmethod
-    def listen(self, event_type: typing.Type[base_events.EventT]) -> typing.Callable:
+    def listen(
+        self,
+        event_type: typing.Type[base_events.EventT],
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        predicate: typing.Optional[typing.Callable[[base_events.EventT], bool]] = None
+    ) -> typing.Callable:
         """Generate a decorator to subscribe a callback to an event type.
 
         Parameters
         ----------
         event_type : typing.Type[alertapi.events.base_events.Event]
             The event type to subscribe to.
+        states : typing.Optional[typing.Iterable[typing.Union[alertapi.snowflakes.Snowflake, builtins.str]]]
+            States to invoke the callback for, see `EventManager.subscribe`.
+        predicate : typing.Optional[typing.Callable[[alertapi.events.base_events.Event], builtins.bool]]
+            Predicate events must satisfy, see `EventManager.subscribe`.
 
         Returns
         -------
@@ -94,7 +119,7 @@ class EventManager(abc.ABC):
             reference.
         """
         def decorator(callback: typing.Callable) -> typing.Callable:
-            self.subscribe(event_type, callback)
+            self.subscribe(event_type, callback, states=states, predicate=predicate)
 
             return callback
 
@@ -119,13 +144,15 @@ class EventManager(abc.ABC):
         """
 
     @abc.abstractmethod
-    def consume_raw_event(self, event: sse_client.MessageEvent) -> None:
-        """Consume a raw MessageEvent event.
+    def consume_raw_event(self, event_type: str, data: str) -> None:
+        """Consume a raw event of the event stream.
 
         Parameters
         ----------
-        event : aiohttp_sse_client.client.MessageEvent
+        event_type : builtins.str
             The name of the event being triggered.
+        data : builtins.str
+            The data of the event.
 
         Raises
         ------
@@ -33,6 +33,8 @@ if typing.TYPE_CHECKING:
     from alertapi.internal import data_binding
     from alertapi import snowflakes
     from alertapi import states
+    from alertapi import frames
+    from alertapi import queries
 
 
 class HTTPClient(abc.ABC):
@@ -52,7 +54,7 @@ class HTTPClient(abc.ABC):
     async def _request(
         self,
         compiled_route: routes.CompiledRoute
-    ) -> typing.Optional[typing.Union[data_binding.JSONObject], str]:
+    ) -> data_binding.JSONObject:
         """Method for making HTTP-requests.
 
         Parameters
@@ -61,8 +63,8 @@ class HTTPClient(abc.ABC):
 
         Returns
         -------
-        typing.Optional[typing.Union[alertapi.internal.data_binding.JSONObject], str]
-            JSON-object with recieved data or route to static map image.
+        alertapi.internal.data_binding.JSONObject
+            JSON-object with recieved data.
 
         Raises
         ------
@@ -72,23 +74,23 @@ class HTTPClient(abc.ABC):
 
     @abc.abstractmethod
     async def fetch_states(
-        self,
-        with_alert: typing.Union[bool, None], limit: int
-    ) -> tuple[states.State]:
+        self, query: queries.StateQuery, *, as_frame: bool = False
+    ) -> typing.Union[tuple[states.State], frames.StatesFrame]:
         """Fetch all state entities in Alert API.
 
         Parameters
         ----------
-        with_alert : typing.Optional[builtins.bool]
-            * If `builtins.True`, returns states with active alarms.
-            * If `builtins.False`, returns states with inactive alarms.
-        limit : builtins.int
-            Limit of states.
+        query : alertapi.queries.StateQuery
+            Query selecting states. It is applied to raw payloads
+            before any state object is built.
+        as_frame : builtins.bool
+            If `builtins.True`, returns a columnar `alertapi.frames.StatesFrame`
+            instead of state objects.
 
         Returns
         -------
-        builtins.tuple[alertapi.states.State]
-            Tuple of deserialised state objects.
+        typing.Union[builtins.tuple[alertapi.states.State], alertapi.frames.StatesFrame]
+            Tuple of deserialised state objects or a frame of them.
         """
 
     @abc.abstractmethod
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Core interface for destinations events are forwarded to."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('Sink',)
+
+import typing
+import abc
+
+
+class Sink(abc.ABC):
+    """Base interface for sink implementations.
+
+    A sink receives serialized events in batches. It does not need to buffer
+    or retry on its own: batching, retries and spilling of undelivered
+    records are done by the component writing to the sink.
+    """
+
+    __slots__: typing.Sequence[str] = ()
+
+    @property
+    def name(self) -> str:
+        """Name of the sink used in its statistics."""
+        return type(self).__name__
+
+    @abc.abstractmethod
+    async def write(self, records: typing.Sequence[bytes]) -> None:
+        """Deliver a batch of records.
+
+        Parameters
+        ----------
+        records : typing.Sequence[builtins.bytes]
+            Serialized records, each terminated by a newline.
+
+        Raises
+        ------
+        builtins.Exception
+            If the batch was not delivered. The batch is retried.
+        """
+
+    async def close(self) -> None:
+        """Release resources held by the sink."""
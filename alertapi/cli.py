@@ -0,0 +1,620 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Command-line interface for watching and streaming alerts.
+
+Run `alertapi --help`, or `python -m alertapi --help`, for the usage.
+The access token is read from `--token` or the `ALERTAPI_TOKEN`
+environment variable.
+"""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('main',)
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import sys
+import time
+import typing
+
+if typing.TYPE_CHECKING:
+    from aiohttp import web
+
+    from alertapi import states as states_
+    from alertapi.impl import client as client_
+
+_EVENT_TYPES: typing.Final[typing.Sequence[str]] = ('update', 'transition', 'hello', 'ping')
+"""Event types which can be streamed."""
+
+_CLEAR_SCREEN: typing.Final[str] = '\x1b[H\x1b[J'
+_RED: typing.Final[str] = '\x1b[31m'
+_RESET: typing.Final[str] = '\x1b[0m'
+
+
+def _state_json(state: states_.State) -> dict[str, typing.Any]:
+    changed = state.raw_changed
+    return {
+        'id': int(state.id),
+        'name': state.name,
+        'name_en': state.name_en,
+        'alert': state.alert,
+        'changed': changed if isinstance(changed, str) else changed.isoformat()
+    }
+
+
+def _silence_stdout() -> None:
+    # Keeps the interpreter from failing to flush stdout to a closed pipe at exit.
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+
+def _format_table(states: typing.Iterable[states_.State], *, color: bool = False) -> str:
+    lines = [f'{"ID":>2}  {"State":<24}  {"Alert":<5}  Changed']
+
+    for state in sorted(states, key=lambda state: state.id):
+        alert = 'yes' if state.alert else 'no'
+        line = f'{state.id:>2}  {state.name_en:<24}  {alert:<5}  {state.changed.isoformat(sep=" ")}'
+        lines.append(f'{_RED}{line}{_RESET}' if color and state.alert else line)
+    return '\n'.join(lines)
+
+
+def _gateway(args: argparse.Namespace, **options: typing.Any) -> client_.GatewayClient:
+    from alertapi.impl import client
+
+    return client.GatewayClient(args.token, base_urls=args.base_url, **options)
+
+
+async def _run_until_stopped(gateway: client_.GatewayClient) -> None:
+    async with gateway:
+        await gateway.join()
+
+
+async def _states(args: argparse.Namespace) -> int:
+    from alertapi.impl import client
+
+    api = client.APIClient(args.token, base_urls=args.base_url)
+    states = await api.fetch_states(with_alert=True) if args.alerts else await api.fetch_states(limit=None)
+
+    if args.json:
+        print(json.dumps([_state_json(state) for state in states], ensure_ascii=False, indent=2))
+    else:
+        print(_format_table(states, color=sys.stdout.isatty()))
+    return 0
+
+
+async def _watch(args: argparse.Namespace) -> int:
+    from alertapi.events import base_events
+
+    gateway = _gateway(args)
+    changed = asyncio.Event()
+    tty = sys.stdout.isatty()
+
+    async def on_change(_: base_events.Event) -> None:
+        changed.set()
+
+    gateway.subscribe(base_events.ClientConnectedEvent, on_change)
+    gateway.subscribe(base_events.StateUpdateEvent, on_change)
+
+    async def redraw() -> None:
+        while True:
+            snapshot = gateway.snapshot
+            active = bin(snapshot.alert_mask).count('1')
+            status = 'connected' if gateway.is_connected else 'polling' if gateway.is_polling else 'connecting'
+            now = datetime.datetime.now().strftime('%H:%M:%S')
+            header = f'Air raid alerts: {active}/{len(snapshot.states)} active, {status}, {now}'
+
+            if snapshot.stale:
+                header += ' (states may be outdated)'
+
+            board = f'{header}\n\n{_format_table(snapshot.states.values(), color=tty)}\n'
+            sys.stdout.write(_CLEAR_SCREEN + board if tty else board + '\n')
+            sys.stdout.flush()
+
+            # The board is redrawn on every change, or every interval to keep the clock going.
+            try:
+                await asyncio.wait_for(changed.wait(), args.interval)
+            except asyncio.TimeoutError:
+                pass
+            changed.clear()
+
+    drawing = asyncio.create_task(redraw())
+
+    try:
+        await _run_until_stopped(gateway)
+    finally:
+        drawing.cancel()
+    return 0
+
+
+async def _stream(args: argparse.Namespace) -> int:
+    from alertapi.events import base_events
+    from alertapi.impl import sinks
+
+    gateway = _gateway(args)
+    event_types = {
+        'update': base_events.StateUpdateEvent,
+        'transition': base_events.StateTransitionEvent,
+        'hello': base_events.ClientConnectedEvent,
+        'ping': base_events.PingEvent
+    }
+    write = sys.stdout.buffer.write
+    flush = sys.stdout.buffer.flush
+    serialize_event = sinks.serialize_event
+    closed = asyncio.Event()
+
+    async def on_event(event: base_events.Event) -> None:
+        try:
+            write(serialize_event(event))
+            flush()
+        except BrokenPipeError:
+            # The reading end is gone, e.g. `alertapi stream | head`.
+            closed.set()
+
+    if 'transition' in args.event:
+        gateway.enable_debounce(hold=args.hold)
+
+    for name in dict.fromkeys(args.event):
+        gateway.subscribe(event_types[name], on_event)
+
+    async with gateway:
+        stopped = asyncio.create_task(gateway.join())
+        piped = asyncio.create_task(closed.wait())
+
+        try:
+            await asyncio.wait((stopped, piped), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopped.cancel()
+            piped.cancel()
+
+    if closed.is_set():
+        _silence_stdout()
+    return 0
+
+
+def _bench_payloads() -> list[dict[str, typing.Any]]:
+    from alertapi.internal import converters
+
+    return [
+        {
+            'id': int(state_id),
+            'name': converters.StateConverter.NAMES[state_id],
+            'name_en': name,
+            'alert': False,
+            'changed': '2022-04-04T16:00:00+03:00'
+        }
+        for name, state_id in converters.StateConverter.STATES.items()
+    ]
+
+
+async def _start_stand_in(events: int, batch: int) -> tuple[web.AppRunner, str, asyncio.Event]:
+    from aiohttp import web
+
+    payloads = _bench_payloads()
+    stopping = asyncio.Event()
+    updates = [
+        f'event: update\ndata: {json.dumps({"state": {**payload, "alert": True}}, ensure_ascii=False)}\n\n'.encode()
+        for payload in payloads
+    ]
+
+    async def fetch_states(_: web.Request) -> web.Response:
+        return web.json_response({'states': payloads})
+
+    async def live(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        await response.write(b'event: hello\ndata: \n\n')
+
+        for start in range(0, events, batch):
+            await response.write(b''.join(updates[i % len(updates)] for i in range(start, min(start + batch, events))))
+
+        # The stream is held open, so the client does not reconnect during the run.
+        await stopping.wait()
+        return response
+
+    app = web.Application()
+    app.router.add_get('/api/states', fetch_states)
+    app.router.add_get('/api/states/live', live)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f'http://{host}:{port}', stopping
+
+
+async def _bench_stream(args: argparse.Namespace) -> int:
+    from alertapi.events import base_events
+    from alertapi.impl import client
+
+    runner, url, stopping = await _start_stand_in(args.events, args.batch)
+    gateway = client.GatewayClient('bench', base_urls=[url])
+    received = 0
+    done = asyncio.Event()
+
+    async def on_update(_: base_events.StateUpdateEvent) -> None:
+        nonlocal received
+        received += 1
+
+        if received == args.events:
+            done.set()
+
+    gateway.subscribe(base_events.StateUpdateEvent, on_update)
+
+    try:
+        started = time.perf_counter()
+
+        async with gateway:
+            await asyncio.wait_for(done.wait(), args.timeout)
+            elapsed = time.perf_counter() - started
+            lane = gateway.event_manager.lane_stats()[0]
+    except asyncio.TimeoutError:
+        print(f'Received {received} of {args.events} events in {args.timeout} seconds', file=sys.stderr)
+        return 1
+    finally:
+        stopping.set()
+        await runner.cleanup()
+
+    loop = type(asyncio.get_running_loop())
+    print(f'{args.events} events in {elapsed:.3f} s: {args.events / elapsed:,.0f} events/s ({loop.__module__})')
+    print(f'listener latency: mean {lane.mean_latency * 1000:.2f} ms, max {lane.max_latency * 1000:.2f} ms')
+    return 0
+
+
+async def _bench_allocation(args: argparse.Namespace) -> int:
+    import tracemalloc
+
+    from alertapi.impl import entity_factory
+
+    # Repeated fetches of all states with one alert changing between them,
+    # as a long-running gateway sees them when reconciling and polling.
+    payloads = _bench_payloads()
+    updates = []
+
+    for fetch in range(2 * len(payloads)):
+        updates.extend(payloads)
+        payloads = payloads.copy()
+        changed = payloads[fetch % len(payloads)]
+        payloads[fetch % len(payloads)] = {**changed, 'alert': not changed['alert']}
+
+    retained = {}
+
+    for flyweight in (False, True):
+        factory = entity_factory.EntityFactoryImpl(flyweight=flyweight)
+        started = time.perf_counter()
+        kept = [factory.deserialize_state(updates[i % len(updates)]) for i in range(args.events)]
+        elapsed = time.perf_counter() - started
+        del kept
+
+        # Memory is traced in a second pass, so tracing does not skew the time.
+        factory = entity_factory.EntityFactoryImpl(flyweight=flyweight)
+        tracemalloc.start()
+        kept = [factory.deserialize_state(updates[i % len(updates)]) for i in range(args.events)]
+        retained[flyweight] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+
+        print(
+            f'{"flyweight" if flyweight else "plain":>9}: {args.events} states in {elapsed:.3f} s: '
+            f'{args.events / elapsed:,.0f} states/s, {retained[flyweight] / 1024:,.0f} KiB retained'
+        )
+
+    print(f'flyweight states retain {1 - retained[True] / retained[False]:.0%} less memory')
+    return 0
+
+
+async def _bench_parser(args: argparse.Namespace) -> int:
+    import importlib.util
+
+    import aiohttp
+
+    from alertapi.internal import sse
+
+    runner, url, stopping = await _start_stand_in(args.events, args.batch)
+    live_url = f'{url}/api/states/live'
+
+    async def read_in_tree() -> None:
+        parser = sse.SSEParser()
+        received = 0
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(live_url) as response:
+                async for chunk in response.content.iter_any():
+                    received += sum(event_type == 'update' for event_type, _ in parser.feed(chunk))
+
+                    if received >= args.events:
+                        return
+
+    async def read_sse_client() -> None:
+        from aiohttp_sse_client import client as sse_client
+
+        received = 0
+
+        async with sse_client.EventSource(live_url) as source:
+            async for event in source:
+                received += event.type == 'update'
+
+                if received >= args.events:
+                    return
+
+    readers = {'alertapi.internal.sse': read_in_tree}
+
+    # The client the in-tree parser replaced is compared with when it is still installed.
+    if importlib.util.find_spec('aiohttp_sse_client') is not None:
+        readers['aiohttp_sse_client'] = read_sse_client
+
+    rates = {}
+
+    try:
+        for name, read in readers.items():
+            started = time.perf_counter()
+            await asyncio.wait_for(read(), args.timeout)
+            elapsed = time.perf_counter() - started
+            rates[name] = args.events / elapsed
+            print(f'{name}: {args.events} events in {elapsed:.3f} s: {rates[name]:,.0f} events/s')
+    except asyncio.TimeoutError:
+        print(f'{name} did not read {args.events} events in {args.timeout} seconds', file=sys.stderr)
+        return 1
+    finally:
+        stopping.set()
+        await runner.cleanup()
+
+    if 'aiohttp_sse_client' in rates:
+        print(f'the in-tree parser reads {rates["alertapi.internal.sse"] / rates["aiohttp_sse_client"]:.1f}x as fast')
+    return 0
+
+
+async def _measure_dispatch(args: argparse.Namespace) -> typing.Optional[tuple[float, float, float]]:
+    from alertapi.events import base_events
+    from alertapi.impl import client
+
+    updates = [json.dumps({'state': {**payload, 'alert': True}}) for payload in _bench_payloads()]
+    # Listeners run on the event loop only, so the stream and the server stay out of the measurement.
+    gateway = client.GatewayClient('bench')
+    event_manager = gateway.event_manager
+    received = 0
+
+    async def on_update(_: base_events.StateUpdateEvent) -> None:
+        nonlocal received
+        received += 1
+
+    gateway.subscribe(base_events.StateUpdateEvent, on_update)
+    started = time.perf_counter()
+
+    for i in range(args.events):
+        event_manager.consume_raw_event('update', updates[i % len(updates)])
+
+    drained = await event_manager.drain(args.timeout)
+    elapsed = time.perf_counter() - started
+
+    if not drained:
+        print(f'Dispatched {received} of {args.events} events in {args.timeout} seconds', file=sys.stderr)
+        return None
+
+    lane = event_manager.lane_stats()[0]
+    return elapsed, lane.mean_latency, lane.max_latency
+
+
+def _run_dispatch(
+    args: argparse.Namespace, loop_factory: typing.Callable[[], asyncio.AbstractEventLoop]
+) -> typing.Optional[tuple[float, float, float]]:
+    loop = loop_factory()
+
+    try:
+        return loop.run_until_complete(_measure_dispatch(args))
+    finally:
+        loop.close()
+
+
+async def _bench_dispatch(args: argparse.Namespace) -> int:
+    loop_factories: dict[str, typing.Callable[[], asyncio.AbstractEventLoop]] = {'asyncio': asyncio.new_event_loop}
+
+    try:
+        import uvloop
+    except ImportError:
+        print('uvloop is not installed, measuring asyncio only', file=sys.stderr)
+    else:
+        loop_factories['uvloop'] = uvloop.new_event_loop
+
+    loop = asyncio.get_running_loop()
+    rates: dict[str, float] = {}
+
+    # Every loop runs in a thread of its own, so neither measurement shares a loop with the other.
+    for name, loop_factory in loop_factories.items():
+        result = await loop.run_in_executor(None, _run_dispatch, args, loop_factory)
+
+        if result is None:
+            return 1
+
+        elapsed, mean_latency, max_latency = result
+        rates[name] = args.events / elapsed
+        print(f'{name}: {args.events} events in {elapsed:.3f} s: {rates[name]:,.0f} events/s')
+        print(f'{name}: listener latency: mean {mean_latency * 1000:.2f} ms, max {max_latency * 1000:.2f} ms')
+
+    if 'uvloop' in rates:
+        print(f'uvloop dispatches {rates["uvloop"] / rates["asyncio"]:.2f}x the events of asyncio')
+    return 0
+
+
+async def _bench_compiled(args: argparse.Namespace) -> int:
+    import importlib.machinery
+
+    from alertapi.events import base_events
+    from alertapi.impl import client
+    from alertapi.impl import entity_factory
+    from alertapi.impl import event_manager
+    from alertapi.internal import converters
+    from alertapi.internal import routes
+
+    # The modules setup.py compiles when ALERTAPI_COMPILE=1 is set.
+    for module in (entity_factory, event_manager, routes, converters):
+        compiled = (module.__file__ or '').endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+        print(f'{module.__name__}: {"compiled" if compiled else "pure Python"}')
+
+    gateway = client.GatewayClient('bench')
+    manager = gateway.event_manager
+    update = json.dumps({'state': {**_bench_payloads()[0], 'alert': True}})
+
+    async def on_update(_: base_events.StateUpdateEvent) -> None:
+        pass
+
+    gateway.subscribe(base_events.StateUpdateEvent, on_update)
+    started = time.perf_counter()
+
+    # Every event is queued, parsed and dispatched to its listener before the next one.
+    for _ in range(args.events):
+        manager.consume_raw_event('update', update)
+        await manager.drain()
+
+    per_event = (time.perf_counter() - started) / args.events
+    converter = converters.StateConverter()
+    names = tuple(converters.StateConverter.STATES)
+    started = time.perf_counter()
+
+    # A request by state name resolves the name and builds the URL of the route.
+    for i in range(args.events):
+        routes.GET_STATE.compile(state=converter.convert(names[i % len(names)])).create_url(routes.BASE_URL)
+
+    per_request = (time.perf_counter() - started) / args.events
+    print(f'per event (consume, parse, dispatch): {per_event * 1_000_000:.2f} us')
+    print(f'per request (name lookup, route, URL): {per_request * 1_000_000:.2f} us')
+    return 0
+
+
+_BENCH_SCENARIOS: typing.Final[typing.Mapping[str, typing.Callable[[argparse.Namespace], typing.Awaitable[int]]]] = {
+    'stream': _bench_stream,
+    'allocation': _bench_allocation,
+    'parser': _bench_parser,
+    'dispatch': _bench_dispatch,
+    'compiled': _bench_compiled,
+}
+"""Benchmarks by scenario name."""
+
+
+async def _bench(args: argparse.Namespace) -> int:
+    return await _BENCH_SCENARIOS[args.scenario](args)
+
+
+def _parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        '--token', default=os.environ.get('ALERTAPI_TOKEN'), help='access token, defaults to $ALERTAPI_TOKEN'
+    )
+    common.add_argument(
+        '--base-url', action='append', metavar='URL', help='base URL of Alert API or a mirror, may be repeated'
+    )
+
+    loop = argparse.ArgumentParser(add_help=False)
+    loop.add_argument('--uvloop', action='store_true', help='run in an event loop of uvloop')
+
+    parser = argparse.ArgumentParser(prog='alertapi', description='Watch and stream air raid alerts.')
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    states = commands.add_parser('states', parents=[common], help='print the states once')
+    states.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    states.add_argument('--alerts', action='store_true', help='print only the states with an active alert')
+    states.set_defaults(handler=_states, needs_token=True)
+
+    watch = commands.add_parser('watch', parents=[common, loop], help='show a live board of the states')
+    watch.add_argument('--interval', type=float, default=1.0, help='seconds between redraws, defaults to 1')
+    watch.set_defaults(handler=_watch, needs_token=True)
+
+    stream = commands.add_parser('stream', parents=[common, loop], help='print events as NDJSON')
+    stream.add_argument(
+        '--event',
+        action='append',
+        choices=_EVENT_TYPES,
+        help='type of events to print, may be repeated, defaults to update'
+    )
+    stream.add_argument(
+        '--hold', type=float, default=10.0, help='seconds a transition must settle for, defaults to 10'
+    )
+    stream.set_defaults(handler=_stream, needs_token=True)
+
+    bench = commands.add_parser('bench', parents=[loop], help='measure throughput against a local stand-in server')
+    bench.add_argument(
+        '--scenario',
+        choices=tuple(_BENCH_SCENARIOS),
+        default='stream',
+        help=(
+            'what to measure: stream events end to end, state allocations, SSE parsing, '
+            'lane dispatch or the per-event and per-request cost of the compiled modules; defaults to stream'
+        )
+    )
+    bench.add_argument('--events', type=int, default=100_000, help='number of events, defaults to 100000')
+    bench.add_argument('--batch', type=int, default=1000, help='events per write of the server, defaults to 1000')
+    bench.add_argument('--timeout', type=float, default=120.0, help='seconds to wait at most, defaults to 120')
+    bench.set_defaults(handler=_bench, needs_token=False)
+    return parser
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """Run the command-line interface.
+
+    Parameters
+    ----------
+    argv : typing.Optional[typing.Sequence[builtins.str]]
+        Command-line arguments. Defaults to `sys.argv`.
+
+    Returns
+    -------
+    builtins.int
+        Exit status.
+    """
+    import aiohttp
+
+    from alertapi import errors
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.needs_token and not args.token:
+        parser.error('an access token is required, pass --token or set ALERTAPI_TOKEN')
+    if args.command == 'stream' and not args.event:
+        args.event = ['update']
+
+    if getattr(args, 'uvloop', False):
+        try:
+            import uvloop
+        except ImportError:
+            parser.error("uvloop is not installed, install it with 'pip install alertapi[uvloop]'")
+
+        # Restored below, so calling main() in a process does not change its event loops for good.
+        policy = asyncio.get_event_loop_policy()
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    else:
+        policy = None
+
+    try:
+        return asyncio.run(args.handler(args))
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        _silence_stdout()
+        return 1
+    except (errors.AlertAPIError, aiohttp.ClientError, OSError) as exc:
+        print(f'alertapi: {exc}', file=sys.stderr)
+        return 1
+    finally:
+        if policy is not None:
+            asyncio.set_event_loop_policy(policy)
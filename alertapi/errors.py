@@ -23,7 +23,7 @@
 
 from __future__ import annotations
 
-__all__: typing.Sequence[str] = ('StateNotFound',)
+__all__: typing.Sequence[str] = ('StateNotFound', 'TokensExhausted', 'StaleStream')
 
 import typing
 
@@ -44,3 +44,22 @@ class StateNotFound(AlertAPIError):
 
     message: str = attr.field()
     """The error message."""
+
+
+@attr.define(slots=True, frozen=True)
+class TokensExhausted(AlertAPIError):
+    """Exception throws when every access token of a token pool is ejected."""
+
+    message: str = attr.field()
+    """The error message."""
+
+    retry_after: float = attr.field()
+    """Seconds until the first token returns to the pool."""
+
+
+@attr.define(slots=True, frozen=True)
+class StaleStream(AlertAPIError):
+    """Exception throws when the event stream stops delivering events, even pings."""
+
+    message: str = attr.field()
+    """The error message."""
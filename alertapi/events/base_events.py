@@ -27,7 +27,8 @@ __all__: typing.Sequence[str] = (
     'Event',
     'ClientConnectedEvent',
     'PingEvent',
-    'StateUpdateEvent'
+    'StateUpdateEvent',
+    'StateTransitionEvent'
 )
 
 import typing
@@ -97,3 +98,21 @@ class StateUpdateEvent(Event):
 
     api: client.APIClient = attr.field()
     state: states.State = attr.field()
+
+
+@attr.define(kw_only=True, weakref_slot=False)
+class StateTransitionEvent(Event):
+    """Event fired when the alert of a state has settled after changing.
+
+    Dispatched by `alertapi.impl.debounce.TransitionDebouncer` instead of
+    every raw `StateUpdateEvent`, so alerts toggling on and off within
+    seconds do not reach listeners.
+    """
+
+    api: client.APIClient = attr.field()
+    state: states.State = attr.field()
+    previous_alert: typing.Optional[bool] = attr.field()
+    """Alert status before the transition, `builtins.None` if it was unknown."""
+
+    suppressed: int = attr.field(default=0)
+    """Number of alert changes of the state folded into this transition."""
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Streaming export of recorded state updates.
+
+Records are read lazily from any iterable, e.g.
+`alertapi.history.StateHistory.records`, so exporting takes constant
+memory however long the history is.
+"""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('ndjson_lines', 'csv_lines', 'write_archive', 'read_archive')
+
+import csv
+import datetime
+import io
+import json
+import typing
+import zlib
+
+from alertapi.internal import converters
+from alertapi import history
+
+_MAGIC: typing.Final[bytes] = b'AAR\x01'
+"""Magic bytes and format version of archives."""
+
+_COMPRESSED: typing.Final[int] = 0x01
+"""Flag of archives with a zlib-compressed body."""
+
+_CHUNK_SIZE: typing.Final[int] = 64 * 1024
+"""Bytes written or read at once."""
+
+_CSV_FIELDS: typing.Final[typing.Sequence[str]] = ('at', 'id', 'name', 'name_en', 'alert', 'changed')
+
+_NAMES_EN: typing.Final[typing.Mapping[int, str]] = {
+    int(state_id): name for name, state_id in converters.StateConverter.STATES.items()
+}
+_NAMES: typing.Final[typing.Mapping[int, str]] = {
+    int(state_id): name for state_id, name in converters.StateConverter.NAMES.items()
+}
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
+
+
+def _changed_isoformat(changed: int) -> typing.Optional[str]:
+    # `0` marks an unknown change, see `alertapi.history.AlertBoard.changed`.
+    return _isoformat(changed) if changed else None
+
+
+def ndjson_lines(records: typing.Iterable[history.StateRecord]) -> typing.Iterator[str]:
+    """Export records as newline-delimited JSON.
+
+    Every line has the shape of the records of `alertapi.impl.sinks.serialize_event`
+    with the time the update was received at added. An unknown last change
+    of a state is exported as `null`.
+
+    Parameters
+    ----------
+    records : typing.Iterable[alertapi.history.StateRecord]
+        The records.
+
+    Yields
+    ------
+    builtins.str
+        Newline-terminated JSON lines.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False).encode
+
+    for record in records:
+        yield dumps({
+            'type': 'update',
+            'at': _isoformat(record.at),
+            'state': {
+                'id': record.state_id,
+                'name': _NAMES.get(record.state_id),
+                'name_en': _NAMES_EN.get(record.state_id),
+                'alert': record.alert,
+                'changed': _changed_isoformat(record.changed)
+            }
+        }) + '\n'
+
+
+def csv_lines(records: typing.Iterable[history.StateRecord], *, header: bool = True) -> typing.Iterator[str]:
+    """Export records as CSV.
+
+    An unknown last change of a state is exported as an empty field.
+
+    Parameters
+    ----------
+    records : typing.Iterable[alertapi.history.StateRecord]
+        The records.
+    header : builtins.bool
+        Whether to start with a header line. Defaults to `builtins.True`.
+
+    Yields
+    ------
+    builtins.str
+        CSV lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    if header:
+        writer.writerow(_CSV_FIELDS)
+
+    for record in records:
+        writer.writerow((
+            _isoformat(record.at),
+            record.state_id,
+            _NAMES.get(record.state_id),
+            _NAMES_EN.get(record.state_id),
+            int(record.alert),
+            _changed_isoformat(record.changed)
+        ))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Only the header is left when there are no records.
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _put_varint(buffer: bytearray, value: int) -> None:
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def write_archive(
+    records: typing.Iterable[history.StateRecord],
+    fp: typing.BinaryIO,
+    *,
+    compress: bool = True
+) -> int:
+    """Write records into the compact binary archive format.
+
+    Receive times are stored with millisecond precision as the difference
+    from the previous record, changes of states as the difference from the
+    receive time, both as variable-length integers, so a record usually
+    takes 3 to 5 bytes before compression.
+
+    Parameters
+    ----------
+    records : typing.Iterable[alertapi.history.StateRecord]
+        The records.
+    fp : typing.BinaryIO
+        Binary file to write the archive to.
+    compress : builtins.bool
+        Whether to compress the archive with zlib. Defaults to `builtins.True`.
+
+    Returns
+    -------
+    builtins.int
+        Number of written records.
+    """
+    compressor = zlib.compressobj(9) if compress else None
+    fp.write(_MAGIC + bytes((_COMPRESSED if compress else 0,)))
+
+    buffer = bytearray()
+    previous = 0
+    count = 0
+
+    for record in records:
+        at = round(record.at * 1000)
+        _put_varint(buffer, _zigzag(at - previous))
+        _put_varint(buffer, record.state_id << 1 | record.alert)
+        _put_varint(buffer, _zigzag(record.changed - at // 1000))
+        previous = at
+        count += 1
+
+        if len(buffer) >= _CHUNK_SIZE:
+            fp.write(compressor.compress(buffer) if compressor else buffer)
+            buffer.clear()
+
+    if compressor is not None:
+        fp.write(compressor.compress(buffer) + compressor.flush())
+    else:
+        fp.write(buffer)
+    return count
+
+
+def read_archive(fp: typing.BinaryIO) -> typing.Iterator[history.StateRecord]:
+    """Read records from an archive written by `write_archive`.
+
+    Parameters
+    ----------
+    fp : typing.BinaryIO
+        Binary file to read the archive from.
+
+    Yields
+    ------
+    alertapi.history.StateRecord
+        The records, in the order they were written.
+
+    Raises
+    ------
+    builtins.ValueError
+        If the file is not an archive of a supported version or is truncated.
+    """
+    head = fp.read(len(_MAGIC) + 1)
+
+    if len(head) <= len(_MAGIC) or head[:len(_MAGIC)] != _MAGIC:
+        raise ValueError('Not a state archive or unsupported archive version')
+
+    decompressor = zlib.decompressobj() if head[-1] & _COMPRESSED else None
+    record = history.StateRecord
+    pending = b''
+    at = 0
+
+    while True:
+        chunk = fp.read(_CHUNK_SIZE)
+
+        if not chunk:
+            if decompressor is not None and not decompressor.eof:
+                raise ValueError('Truncated archive')
+            break
+
+        data = pending + (decompressor.decompress(chunk) if decompressor else chunk)
+        position = 0
+
+        # Varints are decoded inline, which is several times faster than a helper call per field.
+        while True:
+            start = position
+            fields = []
+
+            try:
+                for _ in range(3):
+                    byte = data[position]
+                    position += 1
+                    value = byte & 0x7F
+                    shift = 7
+
+                    while byte & 0x80:
+                        byte = data[position]
+                        position += 1
+                        value |= (byte & 0x7F) << shift
+                        shift += 7
+                    fields.append(value)
+            except IndexError:
+                position = start
+                break
+
+            delta, key, changed = fields
+            at += delta >> 1 if not delta & 1 else -(delta >> 1) - 1
+            changed = changed >> 1 if not changed & 1 else -(changed >> 1) - 1
+            yield record(at=at / 1000, state_id=key >> 1, alert=bool(key & 1), changed=at // 1000 + changed)
+
+        pending = data[position:]
+
+    if pending:
+        raise ValueError('Truncated archive')
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Columnar representation of states for analytics workloads.
+
+This module requires the optional `numpy` dependency, which can be
+installed with `pip install alertapi[numpy]`.
+"""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('StatesFrame',)
+
+import datetime
+import sys
+import typing
+
+import attr
+
+from alertapi.internal import time
+from alertapi import snowflakes
+from alertapi import states
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+if typing.TYPE_CHECKING:
+    from alertapi.internal import data_binding
+
+
+def _require_numpy() -> None:
+    if numpy is None:
+        raise ImportError('StatesFrame requires numpy, install it with `pip install alertapi[numpy]`')
+
+
+@attr.define(slots=True, frozen=True, eq=False)
+class StatesFrame:
+    """Columnar table of states backed by NumPy arrays.
+
+    Every column has one row per state, so filtering with a boolean array
+    filters all the columns at once without building per-row objects.
+
+    Attributes
+    ----------
+    id : numpy.ndarray
+        State identificators, as `numpy.int64`.
+    alert : numpy.ndarray
+        Alert status in states, as `numpy.bool_`.
+    changed : numpy.ndarray
+        Last changes of states in UTC, as `numpy.datetime64` with
+        second precision.
+    name : numpy.ndarray
+        Interned Ukrainian state names, as `builtins.object`.
+    name_en : numpy.ndarray
+        Interned English state names, as `builtins.object`.
+    """
+
+    id: numpy.ndarray = attr.field()
+    alert: numpy.ndarray = attr.field()
+    changed: numpy.ndarray = attr.field()
+    name: numpy.ndarray = attr.field()
+    name_en: numpy.ndarray = attr.field()
+
+    @classmethod
+    def from_payloads(cls, payloads: typing.Sequence[data_binding.JSONObject]) -> StatesFrame:
+        """Build a frame from raw state payloads.
+
+        Parameters
+        ----------
+        payloads : typing.Sequence[alertapi.internal.data_binding.JSONObject]
+            Raw state payloads from Alert API.
+
+        Returns
+        -------
+        StatesFrame
+            The built frame.
+        """
+        _require_numpy()
+        count = len(payloads)
+
+        return cls(
+            id=numpy.fromiter((payload['id'] for payload in payloads), dtype=numpy.int64, count=count),
+            alert=numpy.fromiter((payload['alert'] for payload in payloads), dtype=numpy.bool_, count=count),
+            changed=numpy.fromiter(
+                (time.iso8601_datetime_string_to_epoch(payload['changed']) for payload in payloads),
+                dtype=numpy.int64,
+                count=count
+            ).view('datetime64[s]'),
+            name=numpy.array([sys.intern(payload['name']) for payload in payloads], dtype=object),
+            name_en=numpy.array([sys.intern(payload['name_en']) for payload in payloads], dtype=object)
+        )
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def filter(self, mask: numpy.ndarray) -> StatesFrame:
+        """Select rows by a boolean mask or an array of row indices.
+
+        Parameters
+        ----------
+        mask : numpy.ndarray
+            Boolean array with one element per row, or integer row indices.
+
+        Returns
+        -------
+        StatesFrame
+            A new frame with the selected rows.
+
+        Example
+        -------
+        .. code-block:: python
+
+            recent = frame.filter(frame.changed > numpy.datetime64('2022-08-01'))
+        """
+        return StatesFrame(
+            id=self.id[mask],
+            alert=self.alert[mask],
+            changed=self.changed[mask],
+            name=self.name[mask],
+            name_en=self.name_en[mask]
+        )
+
+    def with_alert(self, alert: bool = True) -> StatesFrame:
+        """Select states with an active or inactive alert.
+
+        Parameters
+        ----------
+        alert : builtins.bool
+            Alert status to select. Defaults to `builtins.True`.
+
+        Returns
+        -------
+        StatesFrame
+            A new frame with the selected rows.
+        """
+        return self.filter(self.alert if alert else ~self.alert)
+
+    @property
+    def active_count(self) -> int:
+        """Number of states with an active alert."""
+        return int(numpy.count_nonzero(self.alert))
+
+    def buffers(self) -> dict[str, memoryview]:
+        """Export the numeric columns without copying.
+
+        The `changed` column is exported as `numpy.int64` seconds since
+        the Unix epoch, as `numpy.datetime64` does not support the buffer
+        protocol.
+
+        Returns
+        -------
+        builtins.dict[builtins.str, builtins.memoryview]
+            Memory views over the `id`, `alert` and `changed` columns.
+        """
+        return {
+            'id': memoryview(numpy.ascontiguousarray(self.id)),
+            'alert': memoryview(numpy.ascontiguousarray(self.alert)),
+            'changed': memoryview(numpy.ascontiguousarray(self.changed).view(numpy.int64))
+        }
+
+    def to_states(self) -> tuple[states.State, ...]:
+        """Build state objects from the rows of the frame.
+
+        Returns
+        -------
+        builtins.tuple[alertapi.states.State]
+            One state object per row.
+        """
+        return tuple(
+            states.State(
+                id=snowflakes.Snowflake(state_id),
+                name=name,
+                name_en=name_en,
+                alert=bool(alert),
+                changed=changed.item().replace(tzinfo=datetime.timezone.utc)
+            )
+            for state_id, alert, changed, name, name_en in zip(
+                self.id.tolist(), self.alert, self.changed, self.name, self.name_en
+            )
+        )
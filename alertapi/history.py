@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Recorded alert history with fast lookups of past boards."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('AlertBoard', 'StateRecord', 'StateHistory')
+
+import array
+import bisect
+import datetime
+import time
+import typing
+
+import attr
+
+from alertapi.internal import bitmask
+from alertapi import snowflakes
+
+if typing.TYPE_CHECKING:
+    from alertapi import states
+
+
+@attr.define(slots=True, frozen=True)
+class AlertBoard:
+    """Alert status of all states at a moment.
+
+    Attributes
+    ----------
+    at : builtins.float
+        Unix time of the board.
+    alert_mask : builtins.int
+        Alert mask of the states, see `alertapi.internal.bitmask`.
+    changed : typing.Sequence[builtins.int]
+        Last changes of every state in seconds since the Unix epoch,
+        indexed by state identificator minus one. `0` if unknown.
+    """
+
+    at: float = attr.field()
+    alert_mask: int = attr.field()
+    changed: typing.Sequence[int] = attr.field()
+
+    @property
+    def alerting(self) -> tuple[snowflakes.Snowflake, ...]:
+        """Identificators of the states with an active alert."""
+        return tuple(bitmask.mask_ids(self.alert_mask))
+
+    def is_alert(self, state_id: int) -> bool:
+        """Check whether an alert was active in a state.
+
+        Parameters
+        ----------
+        state_id : builtins.int
+            Identificator of the state.
+
+        Returns
+        -------
+        builtins.bool
+            The alert status.
+        """
+        return bool(self.alert_mask & bitmask.state_bit(state_id))
+
+    def changed_at(self, state_id: int) -> typing.Optional[datetime.datetime]:
+        """Return the last change of a state before the board.
+
+        Parameters
+        ----------
+        state_id : builtins.int
+            Identificator of the state.
+
+        Returns
+        -------
+        typing.Optional[datetime.datetime]
+            The last change or `builtins.None` if it is unknown.
+        """
+        changed = self.changed[state_id - 1]
+        return datetime.datetime.fromtimestamp(changed, datetime.timezone.utc) if changed else None
+
+
+@attr.define(slots=True, frozen=True)
+class StateRecord:
+    """Recorded update of a state.
+
+    Attributes
+    ----------
+    at : builtins.float
+        Unix time the update was received at.
+    state_id : builtins.int
+        Identificator of the state.
+    alert : builtins.bool
+        Alert status in the state.
+    changed : builtins.int
+        Last change of the state in seconds since the Unix epoch.
+    """
+
+    at: float = attr.field()
+    state_id: int = attr.field()
+    alert: bool = attr.field()
+    changed: int = attr.field()
+
+
+class StateHistory:
+    """Append-only history of state updates.
+
+    Updates are stored as compact delta records. Every `checkpoint_interval`
+    records a checkpoint of the whole board (alert mask and last changes of
+    all states) is kept, so the board at any moment is found with a bisect
+    and a replay of at most `checkpoint_interval` records.
+
+    Parameters
+    ----------
+    states_ : typing.Iterable[alertapi.states.State]
+        States at the start of the history.
+    started_at : typing.Optional[builtins.float]
+        Unix time the history starts at. Defaults to now.
+    checkpoint_interval : builtins.int
+        Number of records between checkpoints. Defaults to `256`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_checkpoint_interval',
+        '_times',
+        '_ids',
+        '_alerts',
+        '_changes',
+        '_checkpoint_times',
+        '_checkpoint_offsets',
+        '_checkpoint_masks',
+        '_checkpoint_changes',
+        '_mask',
+        '_changed'
+    )
+
+    def __init__(
+        self,
+        states_: typing.Iterable[states.State] = (),
+        *,
+        started_at: typing.Optional[float] = None,
+        checkpoint_interval: int = 256
+    ) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError('Checkpoint interval must be positive')
+
+        self._checkpoint_interval = checkpoint_interval
+        self._times = array.array('d')
+        self._ids = array.array('B')
+        self._alerts = array.array('B')
+        self._changes = array.array('q')
+        self._checkpoint_times = array.array('d')
+        self._checkpoint_offsets = array.array('Q')
+        self._checkpoint_masks = array.array('L')
+        self._checkpoint_changes = array.array('q')
+        self._mask = 0
+        self._changed = [0] * bitmask.STATES_COUNT
+
+        for state in states_:
+            self._apply(state.id, state.alert, state.changed_epoch)
+
+        self._checkpoint(time.time() if started_at is None else started_at)
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def started_at(self) -> float:
+        """Unix time the history starts at."""
+        return self._checkpoint_times[0]
+
+    @property
+    def checkpoints(self) -> int:
+        """Number of kept checkpoints."""
+        return len(self._checkpoint_offsets)
+
+    @property
+    def board(self) -> AlertBoard:
+        """The latest board."""
+        return AlertBoard(
+            at=self._last_time(),
+            alert_mask=self._mask,
+            changed=tuple(self._changed)
+        )
+
+    def record(self, state: states.State, at: typing.Optional[float] = None) -> None:
+        """Record an update of a state.
+
+        Parameters
+        ----------
+        state : alertapi.states.State
+            The updated state.
+        at : typing.Optional[builtins.float]
+            Unix time the update was received at. Defaults to now.
+            Times earlier than the last record are moved up to it,
+            so the history stays ordered.
+        """
+        at = time.time() if at is None else at
+        self._append(at, state.id, state.alert, state.changed_epoch)
+
+    def extend(self, records: typing.Iterable[StateRecord]) -> None:
+        """Record updates recorded before, e.g. read from an archive.
+
+        Parameters
+        ----------
+        records : typing.Iterable[StateRecord]
+            The records, in the order they were recorded.
+        """
+        for record in records:
+            self._append(record.at, record.state_id, record.alert, record.changed)
+
+    def records(
+        self,
+        start: typing.Union[float, datetime.datetime, None] = None,
+        end: typing.Union[float, datetime.datetime, None] = None
+    ) -> typing.Iterator[StateRecord]:
+        """Iterate over the recorded updates.
+
+        Parameters
+        ----------
+        start : typing.Union[builtins.float, datetime.datetime, builtins.None]
+            Earliest time of the updates. Defaults to the start of the history.
+        end : typing.Union[builtins.float, datetime.datetime, builtins.None]
+            Latest time of the updates. Defaults to the end of the history.
+
+        Yields
+        ------
+        StateRecord
+            The records, in the order they were recorded.
+        """
+        start = start.timestamp() if isinstance(start, datetime.datetime) else start
+        end = end.timestamp() if isinstance(end, datetime.datetime) else end
+        first = 0 if start is None else bisect.bisect_left(self._times, start)
+        last = len(self._times) if end is None else bisect.bisect_right(self._times, end)
+        times, ids, alerts, changes = self._times, self._ids, self._alerts, self._changes
+
+        for i in range(first, last):
+            yield StateRecord(at=times[i], state_id=ids[i], alert=bool(alerts[i]), changed=changes[i])
+
+    def reconcile(self, states_: typing.Iterable[states.State], at: typing.Optional[float] = None) -> int:
+        """Record the states which differ from the latest board.
+
+        Parameters
+        ----------
+        states_ : typing.Iterable[alertapi.states.State]
+            All states, e.g. fetched after reconnecting.
+        at : typing.Optional[builtins.float]
+            Unix time the states were received at. Defaults to now.
+
+        Returns
+        -------
+        builtins.int
+            Number of recorded states.
+        """
+        at = time.time() if at is None else at
+        recorded = 0
+
+        for state in states_:
+            alert = bool(self._mask & bitmask.state_bit(state.id))
+
+            if alert != state.alert or self._changed[state.id - 1] != state.changed_epoch:
+                self.record(state, at)
+                recorded += 1
+        return recorded
+
+    def state_at(self, at: typing.Union[float, datetime.datetime]) -> typing.Optional[AlertBoard]:
+        """Return the board at a moment.
+
+        Parameters
+        ----------
+        at : typing.Union[builtins.float, datetime.datetime]
+            The moment, as Unix time or a timezone-aware datetime.
+
+        Returns
+        -------
+        typing.Optional[AlertBoard]
+            The board or `builtins.None` if the moment precedes the history.
+        """
+        at = at.timestamp() if isinstance(at, datetime.datetime) else at
+
+        if at < self.started_at:
+            return None
+
+        end = bisect.bisect_right(self._times, at)
+        mask, changed, offset = self._checkpoint_before(end)
+        mask = self._replay(mask, changed, offset, end)
+        return AlertBoard(at=at, alert_mask=mask, changed=tuple(changed))
+
+    def boards_between(
+        self,
+        start: typing.Union[float, datetime.datetime],
+        end: typing.Union[float, datetime.datetime],
+        step: typing.Union[float, datetime.timedelta]
+    ) -> typing.Iterator[AlertBoard]:
+        """Iterate over the boards from `start` to `end` inclusive.
+
+        Only the first board is looked up, the following ones are replayed
+        from it, so the cost grows with the number of records in between.
+
+        Parameters
+        ----------
+        start : typing.Union[builtins.float, datetime.datetime]
+            The first moment.
+        end : typing.Union[builtins.float, datetime.datetime]
+            The last moment.
+        step : typing.Union[builtins.float, datetime.timedelta]
+            Time between boards.
+
+        Yields
+        ------
+        AlertBoard
+            Boards of moments not preceding the history.
+        """
+        start = start.timestamp() if isinstance(start, datetime.datetime) else start
+        end = end.timestamp() if isinstance(end, datetime.datetime) else end
+        step = step.total_seconds() if isinstance(step, datetime.timedelta) else step
+
+        if step <= 0:
+            raise ValueError('Step must be positive')
+
+        # Moments before the history have no board.
+        skipped = max(0, -int((start - self.started_at) // step))
+        at = start + skipped * step
+
+        if at > end:
+            return
+
+        offset = bisect.bisect_right(self._times, at)
+        mask, changed, checkpoint_offset = self._checkpoint_before(offset)
+        mask = self._replay(mask, changed, checkpoint_offset, offset)
+        count = len(self._times)
+        n = skipped
+
+        while at <= end:
+            limit = bisect.bisect_right(self._times, at, offset, count)
+            mask = self._replay(mask, changed, offset, limit)
+            offset = limit
+            yield AlertBoard(at=at, alert_mask=mask, changed=tuple(changed))
+            n += 1
+            at = start + n * step
+
+    def _last_time(self) -> float:
+        return self._times[-1] if self._times else self._checkpoint_times[-1]
+
+    def _append(self, at: float, state_id: int, alert: bool, changed: int) -> None:
+        at = max(at, self._last_time())
+
+        self._times.append(at)
+        self._ids.append(state_id)
+        self._alerts.append(alert)
+        self._changes.append(changed)
+        self._apply(state_id, alert, changed)
+
+        if len(self._times) - self._checkpoint_offsets[-1] >= self._checkpoint_interval:
+            self._checkpoint(at)
+
+    def _apply(self, state_id: int, alert: bool, changed: int) -> None:
+        bit = bitmask.state_bit(state_id)
+        self._mask = self._mask | bit if alert else self._mask & ~bit
+        self._changed[state_id - 1] = changed
+
+    def _checkpoint(self, at: float) -> None:
+        self._checkpoint_times.append(at)
+        self._checkpoint_offsets.append(len(self._times))
+        self._checkpoint_masks.append(self._mask)
+        self._checkpoint_changes.extend(self._changed)
+
+    def _checkpoint_before(self, offset: int) -> tuple[int, list[int], int]:
+        index = bisect.bisect_right(self._checkpoint_offsets, offset) - 1
+        start = index * bitmask.STATES_COUNT
+        changed = self._checkpoint_changes[start:start + bitmask.STATES_COUNT].tolist()
+        return self._checkpoint_masks[index], changed, self._checkpoint_offsets[index]
+
+    def _replay(self, mask: int, changed: list[int], start: int, end: int) -> int:
+        ids, alerts, changes = self._ids, self._alerts, self._changes
+
+        for i in range(start, end):
+            state_id = ids[i]
+            bit = 1 << (state_id - 1)
+            mask = mask | bit if alerts[i] else mask & ~bit
+            changed[state_id - 1] = changes[i]
+        return mask
@@ -23,12 +23,248 @@
 
 from __future__ import annotations
 
-__all__: typing.Sequence[str] = ('Image',)
+__all__: typing.Sequence[str] = ('Image', 'ImageCache')
 
+import asyncio
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+import time
 import typing
 
+import aiohttp
 import attr
 
+_DEFAULT_CHUNK_SIZE: typing.Final[int] = 64 * 1024
+"""Default size of chunks yielded by `Image.stream`."""
+
+_INDEX_FILE: typing.Final[str] = 'index.json'
+_BLOBS_DIRECTORY: typing.Final[str] = 'blobs'
+
+
+def _default_cache_directory() -> pathlib.Path:
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return pathlib.Path(base) / 'alertapi'
+
+
+@attr.define(slots=True)
+class _CacheEntry:
+    digest: str = attr.field()
+    """SHA-256 digest of the cached content."""
+
+    etag: typing.Optional[str] = attr.field(default=None)
+    """Value of the `ETag` header the content was served with."""
+
+    last_modified: typing.Optional[str] = attr.field(default=None)
+    """Value of the `Last-Modified` header the content was served with."""
+
+    validated_at: float = attr.field(default=0.0)
+    """Unix time of the last successful (re)validation against the server."""
+
+
+class ImageCache:
+    """Content-addressed on-disk cache for downloaded images.
+
+    Files are stored once per unique content under their SHA-256 digest, and
+    every URL is revalidated with a conditional request using the `ETag` and
+    `Last-Modified` validators the server sent, so an unchanged image is never
+    downloaded twice.
+
+    Parameters
+    ----------
+    directory : typing.Union[builtins.str, os.PathLike[builtins.str], builtins.None]
+        Directory to keep cached files in.
+        Defaults to `$XDG_CACHE_HOME/alertapi` (`~/.cache/alertapi`).
+    max_age : builtins.float
+        Number of seconds during which a cached image is served without
+        revalidation. Defaults to `0`, so every read sends a conditional request.
+
+    Files are read and written in the default executor of the event loop,
+    so a slow disk does not block it.
+    """
+
+    __slots__: typing.Sequence[str] = ('_directory', '_max_age', '_entries')
+
+    def __init__(
+        self,
+        directory: typing.Union[str, os.PathLike[str], None] = None,
+        *,
+        max_age: float = 0.0
+    ) -> None:
+        self._directory = pathlib.Path(directory) if directory is not None else _default_cache_directory()
+        self._max_age = max_age
+        self._entries: typing.Optional[dict[str, _CacheEntry]] = None
+
+    @property
+    def directory(self) -> pathlib.Path:
+        return self._directory
+
+    def _read_index(self) -> dict[str, _CacheEntry]:
+        try:
+            with open(self._directory / _INDEX_FILE, encoding='utf-8') as fp:
+                raw = json.load(fp)
+        except (OSError, ValueError):
+            raw = {}
+
+        return {url: _CacheEntry(**entry) for url, entry in raw.items()}
+
+    def _write_index(self, raw: dict[str, typing.Any]) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+            json.dump(raw, fp)
+        os.replace(tmp_path, self._directory / _INDEX_FILE)
+
+    def _load_entries(self) -> dict[str, _CacheEntry]:
+        if self._entries is None:
+            self._entries = self._read_index()
+        return self._entries
+
+    async def _load_entries_async(self) -> dict[str, _CacheEntry]:
+        if self._entries is None:
+            entries = await asyncio.get_running_loop().run_in_executor(None, self._read_index)
+
+            # Another stream may have loaded and changed the entries meanwhile.
+            if self._entries is None:
+                self._entries = entries
+        return self._entries
+
+    async def _store_entries(self) -> None:
+        # Serialized on the event loop, so the executor never sees the entries change.
+        raw = {url: attr.asdict(entry) for url, entry in (await self._load_entries_async()).items()}
+        await asyncio.get_running_loop().run_in_executor(None, self._write_index, raw)
+
+    def _create_part(self) -> tuple[int, str]:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkstemp(dir=self._directory, suffix='.part')
+
+    def _store_blob(self, tmp_path: str, digest: str) -> None:
+        blob_path = self._blob_path(digest)
+
+        if blob_path.is_file():
+            os.unlink(tmp_path)
+        else:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, blob_path)
+
+    def _blob_path(self, digest: str) -> pathlib.Path:
+        return self._directory / _BLOBS_DIRECTORY / digest[:2] / digest
+
+    def lookup(self, url: str) -> typing.Optional[pathlib.Path]:
+        """Return the path to the cached content of a URL, if any.
+
+        Parameters
+        ----------
+        url : builtins.str
+            The URL of the image.
+
+        Returns
+        -------
+        typing.Optional[pathlib.Path]
+            Path to the cached file or `builtins.None` if nothing is cached.
+        """
+        entry = self._load_entries().get(url)
+
+        if entry is None:
+            return None
+
+        path = self._blob_path(entry.digest)
+        return path if path.is_file() else None
+
+    async def stream(
+        self,
+        url: str,
+        headers: typing.Mapping[str, str],
+        chunk_size: int = _DEFAULT_CHUNK_SIZE
+    ) -> typing.AsyncIterator[bytes]:
+        """Stream an image, downloading it only if the cached copy is outdated.
+
+        Parameters
+        ----------
+        url : builtins.str
+            The URL of the image.
+        headers : typing.Mapping[builtins.str, builtins.str]
+            Headers to send with the request.
+        chunk_size : builtins.int
+            Maximum size of the yielded chunks.
+
+        Yields
+        ------
+        builtins.bytes
+            Chunks of the image content.
+        """
+        loop = asyncio.get_running_loop()
+        entry = (await self._load_entries_async()).get(url)
+        cached_path: typing.Optional[pathlib.Path] = None
+
+        if entry is not None:
+            blob_path = self._blob_path(entry.digest)
+
+            if await loop.run_in_executor(None, blob_path.is_file):
+                cached_path = blob_path
+
+        if entry is not None and cached_path is not None:
+            if time.time() - entry.validated_at < self._max_age:
+                async for chunk in _read_file(cached_path, chunk_size):
+                    yield chunk
+                return
+
+            headers = dict(headers)
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and entry is not None and cached_path is not None:
+                    entry.validated_at = time.time()
+                    await self._store_entries()
+
+                    async for chunk in _read_file(cached_path, chunk_size):
+                        yield chunk
+                    return
+
+                response.raise_for_status()
+
+                fd, tmp_path = await loop.run_in_executor(None, self._create_part)
+                hasher = hashlib.sha256()
+
+                try:
+                    with os.fdopen(fd, 'wb') as fp:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            hasher.update(chunk)
+                            await loop.run_in_executor(None, fp.write, chunk)
+                            yield chunk
+
+                    digest = hasher.hexdigest()
+                    await loop.run_in_executor(None, self._store_blob, tmp_path, digest)
+                except BaseException:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
+                    raise
+
+                (await self._load_entries_async())[url] = _CacheEntry(
+                    digest=digest,
+                    etag=response.headers.get('ETag'),
+                    last_modified=response.headers.get('Last-Modified'),
+                    validated_at=time.time()
+                )
+                await self._store_entries()
+
+
+async def _read_file(path: pathlib.Path, chunk_size: int) -> typing.AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    fp = await loop.run_in_executor(None, open, path, 'rb')
+
+    try:
+        while chunk := await loop.run_in_executor(None, fp.read, chunk_size):
+            yield chunk
+    finally:
+        fp.close()
+
 
 @attr.define(slots=True, frozen=True)
 class Image:
@@ -41,3 +277,61 @@ class Image:
     """
 
     url: str = attr.field()
+
+    _headers: typing.Mapping[str, str] = attr.field(factory=dict, repr=False, eq=False)
+    """Headers to send when downloading the image."""
+
+    _cache: typing.Optional[ImageCache] = attr.field(default=None, repr=False, eq=False)
+    """Cache to serve the image from, if any."""
+
+    async def stream(self, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> typing.AsyncIterator[bytes]:
+        """Stream the image content in chunks.
+
+        Parameters
+        ----------
+        chunk_size : builtins.int
+            Maximum size of the yielded chunks. Defaults to 64 KiB.
+
+        Yields
+        ------
+        builtins.bytes
+            Chunks of the image content.
+        """
+        if self._cache is not None:
+            async for chunk in self._cache.stream(self.url, self._headers, chunk_size):
+                yield chunk
+            return
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(self.url, headers=self._headers) as response:
+                response.raise_for_status()
+
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    yield chunk
+
+    async def read(self) -> bytes:
+        """Read the whole image content.
+
+        Returns
+        -------
+        builtins.bytes
+            The image content.
+        """
+        return b''.join([chunk async for chunk in self.stream()])
+
+    async def save(self, path: typing.Union[str, os.PathLike[str]]) -> None:
+        """Save the image content to a file.
+
+        Parameters
+        ----------
+        path : typing.Union[builtins.str, os.PathLike[builtins.str]]
+            Path of the file to write.
+        """
+        loop = asyncio.get_running_loop()
+        fp = await loop.run_in_executor(None, open, path, 'wb')
+
+        try:
+            async for chunk in self.stream():
+                await loop.run_in_executor(None, fp.write, chunk)
+        finally:
+            await loop.run_in_executor(None, fp.close)
@@ -30,3 +30,10 @@ from alertapi.impl.event_factory import *
 from alertapi.impl.event_manager import *
 from alertapi.impl.client import *
 from alertapi.impl.http import *
+from alertapi.impl.token_pool import *
+from alertapi.impl.endpoints import *
+from alertapi.impl.polling import *
+from alertapi.impl.sinks import *
+from alertapi.impl.watchdog import *
+from alertapi.impl.debounce import *
+from alertapi.impl.metrics import *
@@ -26,24 +26,57 @@ from __future__ import annotations
 __all__: typing.Sequence[str] = ('APIClient', 'GatewayClient')
 
 import asyncio
+import contextlib
+import datetime
+import os
 import typing
 
 import aiohttp
-from aiohttp_sse_client import client as sse_client
 
+from alertapi.impl import debounce
 from alertapi.impl import http
+from alertapi.impl import metrics
 from alertapi.impl import event_manager
 from alertapi.impl import event_factory
+from alertapi.impl import endpoints
+from alertapi.impl import polling
+from alertapi.impl import sinks
+from alertapi.impl import watchdog
 from alertapi.impl import entity_factory
+from alertapi.impl import token_pool
 from alertapi.internal import converters
 from alertapi.internal import routes
+from alertapi.internal import sse
+from alertapi.events import base_events
+from alertapi import errors
+from alertapi import history as history_
+from alertapi import queries
+from alertapi import snapshots
 
 if typing.TYPE_CHECKING:
     from alertapi.internal.converters import StateConverter
-    from alertapi.events import base_events
     from alertapi import snowflakes
     from alertapi import states
     from alertapi import images
+    from alertapi import frames
+    from alertapi.api import sink
+
+_RECONNECT_DELAY: typing.Final[float] = 5.0
+"""Seconds before reconnecting to an ended event stream, unless the server asks otherwise."""
+
+_CONNECT_RETRIES: typing.Final[int] = 5
+"""Rounds of connection attempts to all endpoints before giving up, each twice as late as the previous."""
+
+_REFUSING_STATUSES: typing.Final[typing.FrozenSet[int]] = frozenset((305, 401, 403, 407))
+"""Statuses of the event stream meaning that it should not be reconnected to."""
+
+_STREAM_ERRORS: typing.Final[typing.Tuple[typing.Type[BaseException], ...]] = (
+    ConnectionError,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError
+)
+"""Errors of an event stream failing to connect or dropping mid-read, which another endpoint may not have."""
 
 
 class APIClient:
@@ -53,9 +86,24 @@ class APIClient:
 
     Parameters
     ----------
-    access_token : builtins.str
+    access_token : typing.Union[builtins.str, typing.Sequence[builtins.str], alertapi.impl.token_pool.TokenPool]
         An access token to the Air Raid Alert API.
         Can be obtained `here <https://alerts.com.ua>`_
+        Several tokens or a token pool spread requests between the tokens.
+    image_cache : typing.Optional[alertapi.images.ImageCache]
+        Cache to serve downloaded static map images from.
+        If not specified, images are downloaded on every read.
+    flyweight_states : builtins.bool
+        Whether to deserialize states as shared flyweight objects.
+        See `alertapi.impl.entity_factory.EntityFactoryImpl`.
+    base_urls : typing.Union[typing.Sequence[builtins.str], alertapi.impl.endpoints.EndpointPool, builtins.None]
+        Base URLs of Alert API mirrors or caching proxies to send requests to.
+        Defaults to the official API only.
+    hedge_delay : typing.Optional[builtins.float]
+        Seconds to wait for a response before sending the same request to
+        the next endpoint as well. The first successful response is used
+        and the other request is cancelled. If not specified, the next
+        endpoint is tried only when the request fails.
 
     Example
     -------
@@ -82,16 +130,46 @@ class APIClient:
         '_state_converter'
     )
 
-    def __init__(self, access_token: str) -> None:
+    def __init__(
+        self,
+        access_token: typing.Union[str, typing.Sequence[str], token_pool.TokenPool],
+        *,
+        image_cache: typing.Optional[images.ImageCache] = None,
+        flyweight_states: bool = False,
+        base_urls: typing.Union[typing.Sequence[str], endpoints.EndpointPool, None] = None,
+        hedge_delay: typing.Optional[float] = None
+    ) -> None:
+        if not isinstance(access_token, token_pool.TokenPool):
+            access_token = token_pool.TokenPool((access_token,) if isinstance(access_token, str) else access_token)
+
         self._access_token = access_token
         self._session = aiohttp.ClientSession
-        self._http = http.HttpClientImpl(access_token, self._session)
+        self._http = http.HttpClientImpl(
+            access_token,
+            self._session,
+            image_cache=image_cache,
+            flyweight_states=flyweight_states,
+            base_urls=base_urls or (routes.BASE_URL,),
+            hedge_delay=hedge_delay
+        )
         self._state_converter = converters.StateConverter()
 
     @property
     def access_token(self) -> str:
+        return self._access_token.tokens[0]
+
+    @property
+    def token_pool(self) -> token_pool.TokenPool:
         return self._access_token
 
+    @property
+    def endpoints(self) -> endpoints.EndpointPool:
+        return self._http.endpoints
+
+    @property
+    def http(self) -> http.HttpClientImpl:
+        return self._http
+
     @typing.overload
     async def fetch_states(self, state: snowflakes.Snowflake) -> states.State:
         ...
@@ -104,12 +182,22 @@ class APIClient:
     async def fetch_states(self, limit: int) -> tuple[states.State]:
         ...
 
+    @typing.overload
+    async def fetch_states(self, query: queries.StateQuery) -> tuple[states.State]:
+        ...
+
     async def fetch_states(
         self,
         state: typing.Optional[snowflakes.Snowflake] = None,
         with_alert: typing.Optional[bool] = None,
-        limit: typing.Optional[int] = 25
-    ) -> tuple[states.State]:
+        limit: typing.Optional[int] = 25,
+        as_frame: bool = False,
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        changed_since: typing.Union[datetime.datetime, str, float, None] = None,
+        order: typing.Optional[str] = None,
+        query: typing.Optional[queries.StateQuery] = None
+    ) -> typing.Union[states.State, tuple[states.State], frames.StatesFrame]:
         """Fetch all state entities from Alert API.
 
         Parameters
@@ -121,6 +209,18 @@ class APIClient:
             Fetch states with active/inactive alert.
         limit : typing.Optional[builtins.int]
             Limit of states. Defaults to 25.
+        as_frame : builtins.bool
+            If `builtins.True`, returns the states as a columnar
+            `alertapi.frames.StatesFrame`. Requires `numpy`.
+        states : typing.Optional[typing.Iterable[typing.Union[alertapi.snowflakes.Snowflake, builtins.str]]]
+            Fetch only these states, by identificator or name.
+        changed_since : typing.Union[datetime.datetime, builtins.str, builtins.float, builtins.None]
+            Fetch only states changed after this moment.
+        order : typing.Optional[builtins.str]
+            `'changed'` or `'-changed'` to order states by their last change.
+        query : typing.Optional[alertapi.queries.StateQuery]
+            Prebuilt query to select states with. If specified, the other
+            filtering arguments are ignored.
 
         Returns
         -------
@@ -128,6 +228,8 @@ class APIClient:
             Deserialied state entity if state is specified.
         builtins.tuple[alertapi.states.State]
             Tuple of deserialised state entities.
+        alertapi.frames.StatesFrame
+            Columnar frame of states if `as_frame` is `builtins.True`.
 
         Raises
         ------
@@ -137,7 +239,12 @@ class APIClient:
         if state:
             return await self.fetch_state(state)
 
-        return await self._http.fetch_states(with_alert=with_alert, limit=limit)
+        if query is None:
+            query = queries.StateQuery(
+                states=states, with_alert=with_alert, changed_since=changed_since, order=order, limit=limit
+            )
+
+        return await self._http.fetch_states(query, as_frame=as_frame)
 
     async def fetch_state(
         self,
@@ -199,10 +306,19 @@ class APIClient:
     async def static_map(self) -> images.Image:
         """Fetch static map of states.
 
+        No request is made until the image content is read.
+
         Returns
         -------
         alertapi.images.Image
             Deserialized Image object.
+
+        Example
+        -------
+        .. code-block:: python
+
+            image = await client.static_map()
+            await image.save('map.png')
         """
         return await self._http.fetch_static_map()
 
@@ -212,9 +328,55 @@ class GatewayClient:
 
     Parameters
     ----------
-    access_token : builtins.str
+    access_token : typing.Union[builtins.str, typing.Sequence[builtins.str], alertapi.impl.token_pool.TokenPool]
         An access token to the Air Raid Alert API.
         Can be obtained `here <https://alerts.com.ua>`_
+        Several tokens or a token pool spread requests between the tokens.
+    flyweight_states : builtins.bool
+        Whether to deserialize states as shared flyweight objects, which
+        avoids allocating new objects for repeated updates in long-running
+        gateways. See `alertapi.impl.entity_factory.EntityFactoryImpl`.
+    base_urls : typing.Union[typing.Sequence[builtins.str], alertapi.impl.endpoints.EndpointPool, builtins.None]
+        Base URLs of Alert API mirrors or caching proxies. The event stream
+        connects to the healthiest one and fails over to the next.
+        Defaults to the official API only.
+    hedge_delay : typing.Optional[builtins.float]
+        Hedge delay of HTTP requests, see `APIClient`.
+    snapshot_path : typing.Union[builtins.str, os.PathLike[builtins.str], builtins.None]
+        File to persist the last known states to. If specified, the
+        snapshot is loaded from it immediately, marked as stale until the
+        states are fetched after connecting, and saved every
+        `snapshot_interval` seconds and on disconnect.
+    snapshot_interval : builtins.float
+        Seconds between snapshot saves. Defaults to `60`.
+    transport : builtins.str
+        How to receive state updates:
+
+        * `'sse'` - from the event stream, the default.
+        * `'polling'` - by polling states, see `alertapi.impl.polling.StatePoller`.
+        * `'auto'` - from the event stream, falling back to polling
+          if the stream cannot be connected to.
+
+        Listeners receive the same events with every transport.
+    poll_interval : builtins.tuple[builtins.float, builtins.float]
+        Shortest and longest interval between polls, in seconds.
+        Defaults to `(2, 30)`.
+    dispatch_lanes : typing.Sequence[alertapi.impl.event_manager.DispatchLane]
+        Priority lanes to dispatch received events from. By default state
+        updates are dispatched first and queued pings are coalesced.
+    ping_interval : builtins.float
+        Expected seconds between pings of the event stream. Defaults to `5`.
+    missed_pings : builtins.int
+        Number of ping intervals without any event after which the stream
+        is considered dead and is reconnected. Defaults to `3`.
+    history : typing.Optional[alertapi.history.StateHistory]
+        History to record every state update to, so past boards can be
+        looked up with `alertapi.history.StateHistory.state_at`.
+    metrics_port : typing.Optional[builtins.int]
+        Port to serve Prometheus metrics and health checks on while the
+        client runs, see `alertapi.impl.metrics.MetricsServer`. Disabled by default.
+    metrics_host : builtins.str
+        Host to serve metrics on. Defaults to `'127.0.0.1'`.
 
     Example
     -------
@@ -241,31 +403,125 @@ class GatewayClient:
 
     __slots__: typing.Sequence[str] = (
         '_access_token',
-        '_event_source',
         '_client',
         '_event_factory',
         '_entity_factory',
         '_event_manager',
-        '_loop'
+        '_loop',
+        '_task',
+        '_snapshot',
+        '_snapshot_path',
+        '_snapshot_interval',
+        '_transport',
+        '_poller',
+        '_sinks',
+        '_debouncer',
+        '_history',
+        '_metrics',
+        '_connected',
+        '_polling',
+        '_connections',
+        '_watchdog'
     )
 
-    def __init__(self, access_token: str) -> None:
-        self._access_token = access_token
-        self._event_source = sse_client.EventSource
-        self._client = APIClient(access_token=self._access_token)
+    def __init__(
+        self,
+        access_token: typing.Union[str, typing.Sequence[str], token_pool.TokenPool],
+        *,
+        flyweight_states: bool = False,
+        base_urls: typing.Union[typing.Sequence[str], endpoints.EndpointPool, None] = None,
+        hedge_delay: typing.Optional[float] = None,
+        snapshot_path: typing.Union[str, os.PathLike[str], None] = None,
+        snapshot_interval: float = 60.0,
+        transport: typing.Literal['sse', 'polling', 'auto'] = 'sse',
+        poll_interval: tuple[float, float] = (2.0, 30.0),
+        dispatch_lanes: typing.Sequence[event_manager.DispatchLane] = event_manager.DEFAULT_LANES,
+        ping_interval: float = 5.0,
+        missed_pings: int = 3,
+        history: typing.Optional[history_.StateHistory] = None,
+        metrics_port: typing.Optional[int] = None,
+        metrics_host: str = '127.0.0.1'
+    ) -> None:
+        if transport not in ('sse', 'polling', 'auto'):
+            raise ValueError(f'Unknown transport {transport!r}')
+
+        self._client = APIClient(
+            access_token=access_token,
+            flyweight_states=flyweight_states,
+            base_urls=base_urls,
+            hedge_delay=hedge_delay
+        )
+        self._access_token = self._client.token_pool
         self._event_factory = event_factory.EventFactoryImpl(self._client)
-        self._entity_factory = entity_factory.EntityFactoryImpl()
-        self._event_manager = event_manager.EventManagerImpl(self._event_factory, self._entity_factory)
-        self._loop = asyncio.get_event_loop()
+        self._entity_factory = entity_factory.EntityFactoryImpl(flyweight=flyweight_states)
+        self._event_manager = event_manager.EventManagerImpl(
+            self._event_factory, self._entity_factory, lanes=dispatch_lanes
+        )
+        self._transport = transport
+        self._sinks: list[sinks.SinkRunner] = []
+        self._debouncer: typing.Optional[debounce.TransitionDebouncer] = None
+        self._history = history
+        self._metrics: typing.Optional[metrics.MetricsServer] = None
+        self._connected = False
+        self._polling = False
+        self._connections = 0
+        self._watchdog = watchdog.HeartbeatWatchdog(ping_interval, missed_pings)
+        self._poller = polling.StatePoller(
+            self._client._http,
+            self._event_manager,
+            watchdog=self._watchdog,
+            min_interval=poll_interval[0],
+            max_interval=poll_interval[1]
+        )
+        self._loop: typing.Optional[asyncio.AbstractEventLoop] = None
+        self._task: typing.Optional[asyncio.Task[None]] = None
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = snapshot_interval
+        self._snapshot = (snapshot_path and snapshots.StateSnapshot.load(snapshot_path)) or snapshots.StateSnapshot(
+            received_at=0.0, stale=True
+        )
+
+        if metrics_port is not None:
+            self._metrics = metrics.MetricsServer(self, host=metrics_host, port=metrics_port)
+
+        self._event_manager.subscribe(base_events.ClientConnectedEvent, self._reconcile_snapshot)
+        self._event_manager.subscribe(base_events.StateUpdateEvent, self._update_snapshot)
+
+        if history is not None:
+            self._event_manager.subscribe(base_events.StateUpdateEvent, self._record_history)
 
     @property
     def access_token(self) -> str:
+        return self._access_token.tokens[0]
+
+    @property
+    def token_pool(self) -> token_pool.TokenPool:
         return self._access_token
 
     @property
-    def loop(self) -> str:
+    def loop(self) -> typing.Optional[asyncio.AbstractEventLoop]:
+        """Event loop the client runs in, if it is started."""
         return self._loop
 
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the event stream is connected."""
+        return self._connected
+
+    @property
+    def is_polling(self) -> bool:
+        """Whether states are polled instead of received from the event stream."""
+        return self._polling
+
+    @property
+    def reconnects(self) -> int:
+        """Number of times the event stream was connected again."""
+        return max(0, self._connections - 1)
+
     @property
     def entity_factory(self) -> entity_factory.EntityFactoryImpl:
         return self._entity_factory
@@ -274,40 +530,443 @@ class GatewayClient:
     def event_factory(self) -> event_factory.EventFactoryImpl:
         return self._event_factory
 
+    @property
+    def event_manager(self) -> event_manager.EventManagerImpl:
+        return self._event_manager
+
     @property
     def client(self) -> APIClient:
         return self._client
 
-    def connect(self) -> None:
-        """Connect client to Air Raid Alert API endpoint."""
+    @property
+    def watchdog(self) -> watchdog.HeartbeatWatchdog:
+        """Watchdog of the event stream, see `HeartbeatWatchdog.stats` for its health."""
+        return self._watchdog
 
-        compiled_route = routes.SSE_LIVE.compile()
-        url = compiled_route.create_url(routes.BASE_URL)
-        headers = {'X-API-Key': self._access_token}
+    @property
+    def snapshot(self) -> snapshots.StateSnapshot:
+        """Last known states, available before the client is connected.
+
+        Check `alertapi.snapshots.StateSnapshot.stale` to tell whether the
+        states were loaded from disk and not yet reconciled with Alert API.
+        """
+        return self._snapshot
+
+    @property
+    def sinks(self) -> typing.Sequence[sinks.SinkRunner]:
+        return tuple(self._sinks)
+
+    @property
+    def metrics(self) -> typing.Optional[metrics.MetricsServer]:
+        """Server of metrics and health checks, if it is enabled."""
+        return self._metrics
+
+    @property
+    def history(self) -> typing.Optional[history_.StateHistory]:
+        """Recorded history of state updates, if it is enabled."""
+        return self._history
+
+    @property
+    def debouncer(self) -> typing.Optional[debounce.TransitionDebouncer]:
+        """Debouncer of alert transitions, if it is enabled."""
+        return self._debouncer
+
+    def enable_debounce(self, **options: typing.Any) -> debounce.TransitionDebouncer:
+        """Dispatch `alertapi.events.base_events.StateTransitionEvent` once alerts settle.
+
+        Listeners of `alertapi.events.base_events.StateUpdateEvent` still
+        receive every update, while listeners of transitions are not
+        notified of alerts toggling on and off within the hold time.
+
+        Parameters
+        ----------
+        **options : typing.Any
+            Hold time and flap options of `alertapi.impl.debounce.TransitionDebouncer`.
+
+        Returns
+        -------
+        alertapi.impl.debounce.TransitionDebouncer
+            The debouncer, which provides its statistics.
+
+        Raises
+        ------
+        builtins.RuntimeError
+            If debouncing is already enabled.
+
+        Example
+        -------
+        .. code-block:: python
+
+            client.enable_debounce(hold=30, max_flaps=3, flap_window=600)
+
+
+            @client.listen(alertapi.StateTransitionEvent)
+            async def on_transition(event: alertapi.StateTransitionEvent) -> None:
+                print('Alert settled:', event.state)
+        """
+        if self._debouncer is not None:
+            raise RuntimeError('Debouncing is already enabled')
+
+        self._debouncer = debounce.TransitionDebouncer(self._event_manager, self._event_factory, **options)
+        self._debouncer.seed(self._snapshot.states.values())
+        self._event_manager.subscribe(base_events.StateUpdateEvent, self._debouncer.on_update)
+        return self._debouncer
+
+    def add_sink(
+        self,
+        sink: sink.Sink,
+        *event_types: typing.Type[base_events.Event],
+        **options: typing.Any
+    ) -> sinks.SinkRunner:
+        """Forward events to a sink in batches.
+
+        Parameters
+        ----------
+        sink : alertapi.api.sink.Sink
+            The sink, e.g. `alertapi.impl.sinks.FileSink`.
+        *event_types : typing.Type[alertapi.events.base_events.Event]
+            Types of events to forward.
+            Defaults to `alertapi.events.base_events.StateUpdateEvent`.
+        **options : typing.Any
+            Batching and retry options of `alertapi.impl.sinks.SinkRunner`.
+
+        Returns
+        -------
+        alertapi.impl.sinks.SinkRunner
+            The runner delivering events to the sink, which
+            provides its throughput statistics.
+
+        Example
+        -------
+        .. code-block:: python
+
+            client.add_sink(alertapi.impl.FileSink('updates.ndjson'), max_delay=5)
+        """
+        runner = sinks.SinkRunner(sink, **options)
 
-        self._loop.run_until_complete(self._listen_event_source(url, headers))
+        for event_type in event_types or (base_events.StateUpdateEvent,):
+            self._event_manager.subscribe(event_type, runner.on_event)
 
-    async def _listen_event_source(self, url: str, headers: dict[str, typing.Any]) -> None:
-        """Connect to SSE endpoint and listen events.
+        self._sinks.append(runner)
+        return runner
+
+    def connect(self, *, use_uvloop: bool = False) -> None:
+        """Connect client to Air Raid Alert API endpoint.
+
+        Blocks until the client stops. Use `GatewayClient.start` instead
+        to run the client in an already running event loop.
+
+        Parameters
+        ----------
+        use_uvloop : builtins.bool
+            Whether to run the client in an event loop of `uvloop`,
+            which has to be installed.
+
+        Raises
+        ------
+        builtins.ImportError
+            If `use_uvloop` is `builtins.True` but `uvloop` is not installed.
+        """
+        if use_uvloop:
+            try:
+                import uvloop
+            except ImportError:
+                raise ImportError("uvloop is not installed, install it with 'pip install alertapi[uvloop]'") from None
+
+            # A loop of its own leaves the event loop policy of the process untouched.
+            loop = uvloop.new_event_loop()
+        else:
+            loop = asyncio.new_event_loop()
+
+        asyncio.set_event_loop(loop)
+
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    async def _serve(self) -> None:
+        await self.start()
+
+        try:
+            await self.join()
+        finally:
+            await self.close()
+
+    async def join(self) -> None:
+        """Wait until the client stops receiving events.
+
+        The client stops when it is closed or cannot receive events anymore,
+        in which case `GatewayClient.close` raises the error.
+        """
+        if self._task is not None:
+            await asyncio.wait((self._task,))
+
+    async def start(self) -> None:
+        """Start receiving events in the background of the running event loop.
+
+        Raises
+        ------
+        builtins.RuntimeError
+            If the client is already running.
+
+        Example
+        -------
+        .. code-block:: python
+
+            async with alertapi.GatewayClient(access_token='...') as client:
+                ...
+        """
+        if self.is_running:
+            raise RuntimeError('The client is already running')
+
+        if self._metrics is not None:
+            await self._metrics.start()
+
+        self._loop = asyncio.get_running_loop()
+        self._task = self._loop.create_task(self._run(), name='alertapi gateway')
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop receiving events and shut the client down gracefully.
+
+        Events received before are still dispatched, and listeners being
+        run are waited for until the deadline. Sinks are flushed and the
+        snapshot is saved afterwards.
+
+        Parameters
+        ----------
+        timeout : builtins.float
+            Seconds to wait for listeners before cancelling them. Defaults to `10`.
+
+        Raises
+        ------
+        builtins.Exception
+            The error the client stopped receiving events with, if any.
+        """
+        task, self._task = self._task, None
+
+        if task is None:
+            return
+
+        task.cancel()
+
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.wait((task,))
+
+        try:
+            await self._event_manager.drain(timeout)
+
+            if self._debouncer is not None:
+                await self._debouncer.close()
+
+            for runner in self._sinks:
+                await runner.close(timeout)
+        finally:
+            if self._snapshot_path is not None:
+                self._snapshot.save(self._snapshot_path)
+            if self._metrics is not None:
+                await self._metrics.close()
+
+        if not task.cancelled() and (error := task.exception()) is not None:
+            raise error
+
+    async def __aenter__(self) -> GatewayClient:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: typing.Any) -> None:
+        await self.close()
+
+    async def _run(self) -> None:
+        saver = None
+
+        if self._snapshot_path is not None:
+            saver = asyncio.create_task(self._save_snapshot_periodically(), name='save snapshot')
+
+        try:
+            await self._listen()
+        finally:
+            if saver is not None:
+                saver.cancel()
+
+    async def _save_snapshot_periodically(self) -> None:
+        assert self._snapshot_path is not None
+
+        while True:
+            await asyncio.sleep(self._snapshot_interval)
+            self._snapshot.save(self._snapshot_path)
+
+    async def _reconcile_snapshot(self, _: base_events.ClientConnectedEvent) -> None:
+        states = await self._client.fetch_states(limit=None)
+        self._snapshot.reconcile(states)
+
+        if self._history is not None:
+            self._history.reconcile(states)
+        if self._debouncer is not None:
+            self._debouncer.seed(states)
+
+    async def _update_snapshot(self, event: base_events.StateUpdateEvent) -> None:
+        self._snapshot.update(event.state)
+
+    async def _record_history(self, event: base_events.StateUpdateEvent) -> None:
+        assert self._history is not None
+        self._history.record(event.state)
+
+    async def _listen(self) -> None:
+        if self._transport == 'polling':
+            await self._poll()
+            return
+        if self._transport == 'sse':
+            await self._listen_endpoints()
+            return
+
+        # Proxies may refuse or kill long-lived connections,
+        # so states are polled once the event stream is lost.
+        try:
+            await self._listen_endpoints()
+        except ConnectionRefusedError:
+            raise
+        except _STREAM_ERRORS:
+            pass
+
+        await self._poll()
+
+    async def _poll(self) -> None:
+        self._polling = True
+
+        try:
+            await self._poller.run()
+        finally:
+            self._polling = False
+
+    async def _listen_endpoints(self) -> None:
+        """Listen events from the healthiest endpoint, failing over to the next ones."""
+        compiled_route = routes.SSE_LIVE.compile()
+        endpoint_pool = self._client.endpoints
+        # In auto mode, falling back to polling beats waiting for reconnects.
+        retries = 0 if self._transport == 'auto' else _CONNECT_RETRIES
+        failed_rounds = 0
+
+        while True:
+            error: typing.Optional[BaseException] = None
+
+            for endpoint in endpoint_pool.ranked():
+                try:
+                    delay = await self._listen_event_source(compiled_route.create_url(endpoint.url))
+                except ConnectionRefusedError:
+                    raise
+                except errors.StaleStream:
+                    # Reconnect, to another endpoint if this one is ranked lower now.
+                    endpoint_pool.record_failure(endpoint)
+                    delay = 0.0
+                except errors.TokensExhausted as exc:
+                    # No endpoint is to blame, so listening resumes once a token returns.
+                    delay = exc.retry_after
+                    break
+                except _STREAM_ERRORS as exc:
+                    endpoint_pool.record_failure(endpoint)
+                    error = exc
+                    continue
+
+                failed_rounds = 0
+                break
+            else:
+                if failed_rounds >= retries:
+                    assert error is not None
+                    raise error
+
+                failed_rounds += 1
+                delay = _RECONNECT_DELAY * 2 ** failed_rounds
+
+            await asyncio.sleep(delay)
+
+    async def _listen_event_source(self, url: str) -> float:
+        """Connect to SSE endpoint and listen events until the stream ends.
 
         Parameters
         ----------
         url : builtins.str
             Url to endpoint.
-        headers : builtins.dict[builtins.str, typing.Any]
-            Headers for HTTP-request body.
-        """
-        async with self._event_source(url, timeout=None, headers=headers) as event_source:
-            async for event in event_source:
-                self._event_manager.consume_raw_event(event)
 
-    def listen(self, event_type: typing.Type[base_events.Event]) -> typing.Callable:
+        Returns
+        -------
+        builtins.float
+            Seconds to wait before reconnecting.
+        """
+        lease = self._access_token.acquire()
+        headers = {'X-API-Key': lease.token, 'Accept': 'text/event-stream', 'Cache-Control': 'no-cache'}
+        status: typing.Optional[int] = None
+        parser = sse.SSEParser()
+
+        if self._snapshot.last_event_id:
+            headers['Last-Event-ID'] = self._snapshot.last_event_id
+
+        try:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None)) as session:
+                async with session.get(url, headers=headers) as response:
+                    status = response.status
+
+                    if status in _REFUSING_STATUSES:
+                        raise ConnectionRefusedError(f'Fetch {url} failed: {status}')
+                    if status != 200:
+                        raise ConnectionError(f'Fetch {url} failed: {status}')
+                    if response.content_type != 'text/event-stream':
+                        raise ConnectionError(f'Fetch {url} failed with wrong Content-Type: {response.content_type}')
+
+                    self._watchdog.reset()
+                    self._connected = True
+                    self._connections += 1
+                    consuming = asyncio.create_task(self._consume_event_stream(response, parser))
+                    watching = asyncio.create_task(self._watchdog.wait_stale())
+
+                    try:
+                        done, _ = await asyncio.wait((consuming, watching), return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        consuming.cancel()
+                        watching.cancel()
+
+                    if consuming not in done:
+                        raise errors.StaleStream(f'No events received from {url} for {self._watchdog.timeout} seconds')
+                    consuming.result()
+        finally:
+            self._connected = False
+            lease.release(status)
+
+        return parser.retry / 1000 if parser.retry is not None else _RECONNECT_DELAY
+
+    async def _consume_event_stream(self, response: aiohttp.ClientResponse, parser: sse.SSEParser) -> None:
+        watchdog = self._watchdog
+        consume_raw_event = self._event_manager.consume_raw_event
+
+        async for chunk in response.content.iter_any():
+            for event_type, data in parser.feed(chunk):
+                if event_type == 'ping':
+                    watchdog.ping()
+                else:
+                    watchdog.feed()
+                consume_raw_event(event_type, data)
+
+            if parser.last_event_id:
+                self._snapshot.last_event_id = parser.last_event_id
+
+    def listen(
+        self,
+        event_type: typing.Type[base_events.Event],
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        predicate: typing.Optional[typing.Callable[[base_events.Event], bool]] = None
+    ) -> typing.Callable:
         """Generate a decorator to subscribe a callback to an event type.
 
         Parameters
         ----------
         event_type : typing.Type[alertapi.events.base_events.Event]
             The event type to subscribe to.
+        states : typing.Optional[typing.Iterable[typing.Union[alertapi.snowflakes.Snowflake, builtins.str]]]
+            States to invoke the callback for, see `GatewayClient.subscribe`.
+        predicate : typing.Optional[typing.Callable[[alertapi.events.base_events.Event], builtins.bool]]
+            Predicate events must satisfy, see `GatewayClient.subscribe`.
 
         Returns
         -------
@@ -316,9 +975,16 @@ class GatewayClient:
             `EventManager.subscribe` before returning the function
             reference.
         """
-        return self._event_manager.listen(event_type)
+        return self._event_manager.listen(event_type, states=states, predicate=predicate)
 
-    def subscribe(self, event_type: typing.Type[base_events.Event], callback: typing.Callable) -> None:
+    def subscribe(
+        self,
+        event_type: typing.Type[base_events.Event],
+        callback: typing.Callable,
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        predicate: typing.Optional[typing.Callable[[base_events.Event], bool]] = None
+    ) -> None:
         """Subscribe a given callback to a given event type.
 
         Parameters
@@ -329,6 +995,12 @@ class GatewayClient:
         callback : typing.Callable
             Must be a coroutine function to invoke. This should
             consume an instance of the given event.
+        states : typing.Optional[typing.Iterable[typing.Union[alertapi.snowflakes.Snowflake, builtins.str]]]
+            If specified, the callback is only invoked for events of
+            these states, given by identificator or name.
+        predicate : typing.Optional[typing.Callable[[alertapi.events.base_events.Event], builtins.bool]]
+            If specified, the callback is only invoked for events
+            the predicate returns `builtins.True` for.
 
         Example
         -------
@@ -342,5 +1014,6 @@ class GatewayClient:
                 ...
 
             client.subscribe(StateUpdateEvent, on_state_update)
+            client.subscribe(StateUpdateEvent, on_state_update, states=['Lviv', 'Kyiv city'])
         """
-        self._event_manager.subscribe(event_type, callback)
+        self._event_manager.subscribe(event_type, callback, states=states, predicate=predicate)
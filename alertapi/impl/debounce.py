@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Flap suppression of alert transitions of states."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('TransitionDebouncer', 'DebounceStats')
+
+import asyncio
+import collections
+import typing
+
+import attr
+
+if typing.TYPE_CHECKING:
+    from alertapi import states as states_
+    from alertapi.events import base_events
+    from alertapi.impl import event_factory
+    from alertapi.impl import event_manager
+
+
+@attr.define(slots=True, frozen=True)
+class DebounceStats:
+    """Statistics of a transition debouncer.
+
+    Attributes
+    ----------
+    received : builtins.int
+        Number of state updates observed.
+    changes : builtins.int
+        Number of alert changes among the observed updates.
+    emitted : builtins.int
+        Number of transitions dispatched.
+    suppressed : builtins.int
+        Number of alert changes which were not dispatched, because
+        they were reverted or folded into a later transition.
+    pending : builtins.int
+        Number of states waiting to settle.
+    flapping : builtins.int
+        Number of states changing too often to be dispatched.
+    """
+
+    received: int = attr.field()
+    changes: int = attr.field()
+    emitted: int = attr.field()
+    suppressed: int = attr.field()
+    pending: int = attr.field()
+    flapping: int = attr.field()
+
+
+@attr.define(slots=True, weakref_slot=False)
+class _Track:
+    stable: typing.Optional[bool] = attr.field(default=None)
+    state: typing.Optional[states_.State] = attr.field(default=None)
+    changes: typing.Deque[float] = attr.field(factory=collections.deque)
+    pending: int = attr.field(default=0)
+    timer: typing.Optional[asyncio.TimerHandle] = attr.field(default=None)
+
+
+class TransitionDebouncer:
+    """Dispatch alert transitions of states only once they settle.
+
+    Every `alertapi.events.base_events.StateUpdateEvent` changing the alert
+    of a state starts a hold time. If the alert is changed back before the
+    hold time elapses, nothing is dispatched; otherwise a single
+    `alertapi.events.base_events.StateTransitionEvent` is dispatched with
+    the latest status of the state. A state changing its alert more than
+    `max_flaps` times within `flap_window` seconds is flapping, and its
+    transition is held until the changes calm down.
+
+    Parameters
+    ----------
+    event_manager : alertapi.impl.event_manager.EventManagerImpl
+        Event manager to dispatch transitions through.
+    event_factory : alertapi.impl.event_factory.EventFactoryImpl
+        Event factory to build transitions with.
+    hold : builtins.float
+        Seconds an alert must stay on before it is dispatched. Defaults to `10`.
+    clear_hold : typing.Optional[builtins.float]
+        Seconds an alert must stay off before it is dispatched.
+        Defaults to `hold`.
+    max_flaps : builtins.int
+        Number of alert changes within `flap_window` above which
+        a state is flapping. Defaults to `4`.
+    flap_window : builtins.float
+        Seconds to count alert changes of a state over. Defaults to `300`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_event_manager',
+        '_event_factory',
+        '_hold',
+        '_clear_hold',
+        '_max_flaps',
+        '_flap_window',
+        '_tracks',
+        '_tasks',
+        '_received',
+        '_changes',
+        '_emitted',
+        '_suppressed'
+    )
+
+    def __init__(
+        self,
+        event_manager: event_manager.EventManagerImpl,
+        event_factory: event_factory.EventFactoryImpl,
+        *,
+        hold: float = 10.0,
+        clear_hold: typing.Optional[float] = None,
+        max_flaps: int = 4,
+        flap_window: float = 300.0
+    ) -> None:
+        clear_hold = hold if clear_hold is None else clear_hold
+
+        if hold < 0 or clear_hold < 0:
+            raise ValueError('Hold times must not be negative')
+        if max_flaps < 1 or flap_window <= 0:
+            raise ValueError('Number of flaps and flap window must be positive')
+
+        self._event_manager = event_manager
+        self._event_factory = event_factory
+        self._hold = hold
+        self._clear_hold = clear_hold
+        self._max_flaps = max_flaps
+        self._flap_window = flap_window
+        self._tracks: dict[int, _Track] = {}
+        self._tasks: typing.Set[asyncio.Task[None]] = set()
+        self._received = 0
+        self._changes = 0
+        self._emitted = 0
+        self._suppressed = 0
+
+    def seed(self, states: typing.Iterable[states_.State]) -> None:
+        """Set the settled status of states without dispatching transitions.
+
+        States which were observed before are compared with their last
+        update, so a change missed while disconnected is still dispatched.
+        Seeded states are not counted as received updates.
+
+        Parameters
+        ----------
+        states : typing.Iterable[alertapi.states.State]
+            The states, e.g. fetched after connecting.
+        """
+        for state in states:
+            track = self._tracks.get(state.id)
+
+            if track is None or track.state is None:
+                self._tracks[state.id] = _Track(stable=state.alert, state=state)
+            else:
+                self._apply(state)
+
+    def observe(self, state: states_.State) -> None:
+        """Observe an update of a state.
+
+        Parameters
+        ----------
+        state : alertapi.states.State
+            The updated state.
+        """
+        self._received += 1
+        self._apply(state)
+
+    def _apply(self, state: states_.State) -> None:
+        track = self._tracks.get(state.id)
+
+        if track is None:
+            track = self._tracks[state.id] = _Track()
+
+        previous, track.state = track.state, state
+
+        if previous is not None and previous.alert == state.alert:
+            return
+
+        now = asyncio.get_running_loop().time()
+        changes = track.changes
+        changes.append(now)
+
+        while changes[0] <= now - self._flap_window:
+            changes.popleft()
+
+        self._changes += 1
+        track.pending += 1
+
+        if state.alert == track.stable:
+            # Changed back before settling, so every change since is dropped.
+            self._cancel(track)
+            self._suppressed += track.pending
+            track.pending = 0
+        else:
+            self._schedule(track, self._hold if state.alert else self._clear_hold)
+
+    async def on_update(self, event: base_events.StateUpdateEvent) -> None:
+        """Event listener observing the updated state."""
+        self.observe(event.state)
+
+    def stats(self) -> DebounceStats:
+        """Return statistics of the debouncer.
+
+        Returns
+        -------
+        DebounceStats
+            Statistics of the debouncer.
+        """
+        # Without a running loop, no change is recent enough to be counted.
+        try:
+            since = asyncio.get_running_loop().time() - self._flap_window
+        except RuntimeError:
+            since = float('inf')
+
+        return DebounceStats(
+            received=self._received,
+            changes=self._changes,
+            emitted=self._emitted,
+            suppressed=self._suppressed,
+            pending=sum(track.timer is not None for track in self._tracks.values()),
+            flapping=sum(
+                sum(changed > since for changed in track.changes) > self._max_flaps
+                for track in self._tracks.values()
+            )
+        )
+
+    async def close(self) -> None:
+        """Drop the transitions waiting to settle and wait for the dispatched ones."""
+        for track in self._tracks.values():
+            self._cancel(track)
+
+        if self._tasks:
+            await asyncio.wait(tuple(self._tasks))
+
+    def _cancel(self, track: _Track) -> None:
+        if track.timer is not None:
+            track.timer.cancel()
+            track.timer = None
+
+    def _schedule(self, track: _Track, delay: float) -> None:
+        assert track.state is not None
+        self._cancel(track)
+        track.timer = asyncio.get_running_loop().call_later(delay, self._settle, track)
+
+    def _settle(self, track: _Track) -> None:
+        assert track.state is not None
+        track.timer = None
+        changes = track.changes
+        now = asyncio.get_running_loop().time()
+
+        while changes and changes[0] <= now - self._flap_window:
+            changes.popleft()
+
+        if len(changes) > self._max_flaps:
+            # Flapping, held until enough of the changes leave the window.
+            self._schedule(track, changes[-self._max_flaps - 1] + self._flap_window - now)
+            return
+
+        previous, track.stable = track.stable, track.state.alert
+        suppressed, track.pending = track.pending - 1, 0
+        self._suppressed += suppressed
+        self._emitted += 1
+
+        event = self._event_factory.deserialize_state_transition_event(track.state, previous, suppressed)
+        task = asyncio.get_running_loop().create_task(self._dispatch(event))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, event: base_events.StateTransitionEvent) -> None:
+        try:
+            await (await self._event_manager.dispatch(event))
+        except Exception as exc:
+            asyncio.get_running_loop().call_exception_handler({
+                'message': 'Exception in a listener of state transitions',
+                'exception': exc
+            })
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Implementation of health tracking for API endpoints."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('EndpointPool', 'EndpointStats')
+
+import time
+import typing
+
+import attr
+
+_LATENCY_WEIGHT: typing.Final[float] = 0.2
+"""Weight of the latest sample in the moving average of latency."""
+
+
+@attr.define(slots=True, frozen=True)
+class EndpointStats:
+    """Health statistics of a single API endpoint.
+
+    Attributes
+    ----------
+    url : builtins.str
+        Base URL of the endpoint.
+    requests : builtins.int
+        Number of requests sent to the endpoint.
+    failures : builtins.int
+        Number of requests which failed because of the endpoint.
+    consecutive_failures : builtins.int
+        Number of failures since the last success.
+    latency : typing.Optional[builtins.float]
+        Moving average of successful request latency in seconds.
+    down_for : builtins.float
+        Seconds until the endpoint is tried first again, `0` if it is healthy.
+    """
+
+    url: str = attr.field()
+    requests: int = attr.field()
+    failures: int = attr.field()
+    consecutive_failures: int = attr.field()
+    latency: typing.Optional[float] = attr.field()
+    down_for: float = attr.field()
+
+
+@attr.define(slots=True, eq=False)
+class Endpoint:
+    url: str = attr.field()
+    """Base URL of the endpoint."""
+
+    requests: int = attr.field(default=0)
+    failures: int = attr.field(default=0)
+    consecutive_failures: int = attr.field(default=0)
+    latency: typing.Optional[float] = attr.field(default=None)
+    down_until: float = attr.field(default=0.0)
+
+
+class EndpointPool:
+    """Pool of base URLs of Alert API mirrors ranked by their health.
+
+    Healthy endpoints are ranked by their average latency. Endpoints not
+    measured yet follow the measured ones, in the given order. An endpoint that fails `failure_threshold`
+    times in a row is marked down and ranked last for `down_cooldown`
+    seconds.
+
+    Parameters
+    ----------
+    urls : typing.Iterable[builtins.str]
+        Base URLs of the endpoints.
+    failure_threshold : builtins.int
+        Number of consecutive failures to mark an endpoint down after.
+        Defaults to 3.
+    down_cooldown : builtins.float
+        Seconds to rank a down endpoint last for. Defaults to 30.
+    """
+
+    __slots__: typing.Sequence[str] = ('_endpoints', '_failure_threshold', '_down_cooldown')
+
+    def __init__(
+        self,
+        urls: typing.Iterable[str],
+        *,
+        failure_threshold: int = 3,
+        down_cooldown: float = 30.0
+    ) -> None:
+        self._endpoints = [Endpoint(url.rstrip('/')) for url in dict.fromkeys(urls)]
+        self._failure_threshold = failure_threshold
+        self._down_cooldown = down_cooldown
+
+        if not self._endpoints:
+            raise ValueError('Endpoint pool requires at least one URL')
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    @property
+    def urls(self) -> typing.Sequence[str]:
+        return tuple(endpoint.url for endpoint in self._endpoints)
+
+    def ranked(self) -> typing.List[Endpoint]:
+        """Return the endpoints from the most to the least preferred.
+
+        Returns
+        -------
+        typing.List[Endpoint]
+            The ranked endpoints.
+        """
+        now = time.monotonic()
+
+        def key(item: typing.Tuple[int, Endpoint]) -> typing.Tuple[bool, bool, float, int]:
+            position, endpoint = item
+            return endpoint.down_until > now, endpoint.latency is None, endpoint.latency or 0.0, position
+
+        return [endpoint for _, endpoint in sorted(enumerate(self._endpoints), key=key)]
+
+    def record_success(self, endpoint: Endpoint, latency: float) -> None:
+        """Record a successful request to an endpoint.
+
+        Parameters
+        ----------
+        endpoint : Endpoint
+            The endpoint.
+        latency : builtins.float
+            Latency of the request in seconds.
+        """
+        endpoint.requests += 1
+        endpoint.consecutive_failures = 0
+        endpoint.down_until = 0.0
+        self._record_latency(endpoint, latency)
+
+    def record_cancelled(self, endpoint: Endpoint, elapsed: float) -> None:
+        """Record a request to an endpoint that lost a hedged race.
+
+        The time it had taken until it was cancelled is only a lower bound
+        of its latency, so it is recorded only if it exceeds the latency
+        estimated so far. An endpoint that keeps losing races is not ranked
+        first again, while one cancelled early keeps its estimate.
+
+        Parameters
+        ----------
+        endpoint : Endpoint
+            The endpoint.
+        elapsed : builtins.float
+            Seconds the request took until it was cancelled.
+        """
+        if endpoint.latency is None or elapsed > endpoint.latency:
+            self._record_latency(endpoint, elapsed)
+
+    @staticmethod
+    def _record_latency(endpoint: Endpoint, latency: float) -> None:
+        if endpoint.latency is None:
+            endpoint.latency = latency
+        else:
+            endpoint.latency += (latency - endpoint.latency) * _LATENCY_WEIGHT
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        """Record a request to an endpoint that failed because of it.
+
+        Parameters
+        ----------
+        endpoint : Endpoint
+            The endpoint.
+        """
+        endpoint.requests += 1
+        endpoint.failures += 1
+        endpoint.consecutive_failures += 1
+
+        if endpoint.consecutive_failures >= self._failure_threshold:
+            endpoint.down_until = time.monotonic() + self._down_cooldown
+
+    def stats(self) -> typing.Sequence[EndpointStats]:
+        """Return health statistics of every endpoint in the pool.
+
+        Returns
+        -------
+        typing.Sequence[EndpointStats]
+            Statistics of the endpoints, in the order they were given.
+        """
+        now = time.monotonic()
+
+        return tuple(
+            EndpointStats(
+                url=endpoint.url,
+                requests=endpoint.requests,
+                failures=endpoint.failures,
+                consecutive_failures=endpoint.consecutive_failures,
+                latency=endpoint.latency,
+                down_for=max(endpoint.down_until - now, 0.0)
+            )
+            for endpoint in self._endpoints
+        )
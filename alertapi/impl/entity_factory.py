@@ -25,19 +25,56 @@ from __future__ import annotations
 
 __all__: typing.Sequence[str] = ('EntityFactoryImpl',)
 
+import sys
 import typing
 
 from alertapi.api import entity_factory
+from alertapi.internal import converters
 from alertapi import snowflakes
 from alertapi import states
 from alertapi import images
 
 if typing.TYPE_CHECKING:
     from alertapi.internal import data_binding
+    from alertapi import frames
+
+_SNOWFLAKES: typing.Final[dict[int, snowflakes.Snowflake]] = {
+    int(state_id): state_id for state_id in converters.StateConverter.STATES.values()
+}
+"""Prebuilt snowflakes of all known states keyed by their raw identificator."""
 
 
 class EntityFactoryImpl(entity_factory.EntityFactory):
+    """Entity factory implementation.
+
+    Parameters
+    ----------
+    image_cache : typing.Optional[alertapi.images.ImageCache]
+        Cache to attach to deserialized images.
+    flyweight : builtins.bool
+        If `builtins.True`, states are deserialized as flyweights: the
+        identificator and names of each state are interned once, and a
+        payload identical to the previous one of the same state returns the
+        previously built `alertapi.states.State` instead of a new object.
+        Defaults to `builtins.False`.
+    """
+
+    __slots__: typing.Sequence[str] = ('_image_cache', '_flyweight', '_static', '_states')
+
+    def __init__(self, image_cache: typing.Optional[images.ImageCache] = None, *, flyweight: bool = False) -> None:
+        self._image_cache = image_cache
+        self._flyweight = flyweight
+        self._static: dict[int, tuple[snowflakes.Snowflake, str, str]] = {}
+        self._states: dict[int, states.State] = {}
+
+    @property
+    def flyweight(self) -> bool:
+        return self._flyweight
+
     def deserialize_state(self, payload: data_binding.JSONObject) -> states.State:
+        if self._flyweight:
+            return self._deserialize_flyweight_state(payload)
+
         return states.State(
             id=snowflakes.Snowflake(payload['id']),
             name=payload['name'],
@@ -46,10 +83,46 @@ class EntityFactoryImpl(entity_factory.EntityFactory):
             changed=payload['changed']
         )
 
+    def _deserialize_flyweight_state(self, payload: data_binding.JSONObject) -> states.State:
+        raw_id = payload['id']
+        state = self._states.get(raw_id)
+
+        if (
+            state is not None
+            and state.alert == payload['alert']
+            and state.raw_changed == payload['changed']
+            and state.name == payload['name']
+            and state.name_en == payload['name_en']
+        ):
+            return state
+
+        static = self._static.get(raw_id)
+
+        if static is None or static[1] != payload['name'] or static[2] != payload['name_en']:
+            state_id = _SNOWFLAKES.get(raw_id) or snowflakes.Snowflake(raw_id)
+            static = self._static[raw_id] = (state_id, sys.intern(payload['name']), sys.intern(payload['name_en']))
+
+        state_id, name, name_en = static
+        state = self._states[raw_id] = states.State(
+            id=state_id,
+            name=name,
+            name_en=name_en,
+            alert=payload['alert'],
+            changed=payload['changed']
+        )
+        return state
+
     def deserialize_states(
         self, payload: tuple[data_binding.JSONObject]
     ) -> tuple[states.State]:
         return tuple(map(self.deserialize_state, payload))
 
-    def deserialize_image(self, url: str) -> images.Image:
-        return images.Image(url)
+    def deserialize_states_frame(self, payload: typing.Sequence[data_binding.JSONObject]) -> frames.StatesFrame:
+        from alertapi import frames
+
+        return frames.StatesFrame.from_payloads(payload)
+
+    def deserialize_image(
+        self, url: str, headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> images.Image:
+        return images.Image(url, headers=headers or {}, cache=self._image_cache)
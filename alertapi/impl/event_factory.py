@@ -46,5 +46,15 @@ class EventFactoryImpl(event_factory.EventFactory):
     def deserialize_state_update_event(self, state: states.State) -> base_events.StateUpdateEvent:
         return base_events.StateUpdateEvent(api=self.api, state=state)
 
+    def deserialize_state_transition_event(
+        self,
+        state: states.State,
+        previous_alert: typing.Optional[bool],
+        suppressed: int = 0
+    ) -> base_events.StateTransitionEvent:
+        return base_events.StateTransitionEvent(
+            api=self.api, state=state, previous_alert=previous_alert, suppressed=suppressed
+        )
+
     def deserialize_ping_event(self) -> base_events.PingEvent:
         return base_events.PingEvent(api=self.api)
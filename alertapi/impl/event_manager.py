@@ -23,9 +23,11 @@
 
 from __future__ import annotations
 
-__all__: typing.Sequence[str] = ('EventManagerImpl',)
+__all__: typing.Sequence[str] = ('EventManagerImpl', 'DispatchLane', 'LaneStats', 'DEFAULT_LANES')
 
 import asyncio
+import collections
+import time
 import typing
 import inspect
 import json
@@ -35,11 +37,15 @@ import attr
 from alertapi.impl import event_factory
 from alertapi.impl import entity_factory
 from alertapi.internal import aio
+from alertapi.internal import converters
+from alertapi.internal import histogram
 from alertapi.events import base_events
 from alertapi.api import event_manager
 
 if typing.TYPE_CHECKING:
-    from aiohttp_sse_client import client as sse_client
+    from alertapi import snowflakes
+
+_FilteredListener = typing.Tuple[typing.Callable, typing.Optional[typing.Callable[[base_events.Event], bool]]]
 
 
 @attr.define(weakref_slot=False)
@@ -48,23 +54,117 @@ class _Consumer:
     """The callback function for this consumer."""
 
 
+@attr.define(slots=True, frozen=True)
+class DispatchLane:
+    """Queue that raw events of some types are dispatched from.
+
+    Lanes are drained in the order they are given in: an event of a lane
+    is only dispatched when the queues of all previous lanes are empty.
+
+    Attributes
+    ----------
+    name : builtins.str
+        Name of the lane.
+    event_types : typing.FrozenSet[builtins.str]
+        Types of raw events, such as `'update'`, queued in the lane.
+    workers : builtins.int
+        Maximum number of events of the lane dispatched at once.
+    max_pending : typing.Optional[builtins.int]
+        Maximum number of queued events. When the queue is full, the oldest
+        event is dropped, so `1` coalesces the queued events into the latest.
+        If `builtins.None`, events are never dropped.
+    """
+
+    name: str = attr.field()
+    event_types: typing.FrozenSet[str] = attr.field(converter=frozenset)
+    workers: int = attr.field(default=1)
+    max_pending: typing.Optional[int] = attr.field(default=None)
+
+
+DEFAULT_LANES: typing.Final[typing.Sequence[DispatchLane]] = (
+    DispatchLane('update', ('update',), workers=16),
+    DispatchLane('hello', ('hello',)),
+    DispatchLane('ping', ('ping',), max_pending=1)
+)
+"""State updates first, then connection events, then coalesced pings."""
+
+
+@attr.define(slots=True, frozen=True)
+class LaneStats:
+    """Statistics of a dispatch lane.
+
+    Attributes
+    ----------
+    name : builtins.str
+        Name of the lane.
+    pending : builtins.int
+        Number of queued events.
+    in_flight : builtins.int
+        Number of events being dispatched.
+    dispatched : builtins.int
+        Number of dispatched events.
+    dropped : builtins.int
+        Number of events dropped or coalesced because the queue was full.
+    mean_latency : builtins.float
+        Mean seconds from receiving an event to its listeners completing.
+    max_latency : builtins.float
+        Maximum seconds from receiving an event to its listeners completing.
+    """
+
+    name: str = attr.field()
+    pending: int = attr.field()
+    in_flight: int = attr.field()
+    dispatched: int = attr.field()
+    dropped: int = attr.field()
+    mean_latency: float = attr.field()
+    max_latency: float = attr.field()
+
+
+@attr.define(slots=True, weakref_slot=False)
+class _LaneState:
+    lane: DispatchLane = attr.field()
+    queue: typing.Deque[tuple[_Consumer, str, float]] = attr.field(factory=collections.deque)
+    in_flight: int = attr.field(default=0)
+    dispatched: int = attr.field(default=0)
+    dropped: int = attr.field(default=0)
+    total_latency: float = attr.field(default=0.0)
+    max_latency: float = attr.field(default=0.0)
+    latency: histogram.LatencyHistogram = attr.field(factory=histogram.LatencyHistogram)
+
+
 class EventManagerBase(event_manager.EventManager):
     __slots__: typing.Sequence[str] = (
         '_listeners',
+        '_filtered_listeners',
+        '_state_listeners',
+        '_state_converter',
         '_event_factory',
         '_entity_factory',
-        '_consumers'
+        '_consumers',
+        '_lanes',
+        '_lane_of',
+        '_tasks'
     )
 
     def __init__(
         self,
         event_factory: event_factory.EventFactoryImpl,
-        entity_factory: entity_factory.EntityFactoryImpl
+        entity_factory: entity_factory.EntityFactoryImpl,
+        lanes: typing.Sequence[DispatchLane] = DEFAULT_LANES
     ) -> None:
         self._listeners: dict[base_events.Event, typing.Callable] = {}
+        self._filtered_listeners: dict[typing.Type[base_events.Event], list[_FilteredListener]] = {}
+        self._state_listeners: dict[typing.Type[base_events.Event], dict[int, list[_FilteredListener]]] = {}
+        self._state_converter = converters.StateConverter()
         self._consumers: dict[str, _Consumer] = {}
         self._event_factory = event_factory
         self._entity_factory = entity_factory
+        self._lanes = [_LaneState(lane) for lane in lanes]
+        self._tasks: typing.Set[asyncio.Task[None]] = set()
+        self._lane_of = {event_type: state for state in reversed(self._lanes) for event_type in state.lane.event_types}
+
+        if not self._lanes:
+            raise ValueError('At least one dispatch lane is required')
 
         for name, member in inspect.getmembers(self):
             if name.startswith('on_'):
@@ -83,21 +183,42 @@ class EventManagerBase(event_manager.EventManager):
     def subscribe(
         self,
         event_type: typing.Type[base_events.Event],
-        callback: typing.Callable
+        callback: typing.Callable,
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        predicate: typing.Optional[typing.Callable[[base_events.Event], bool]] = None
     ) -> None:
         if not inspect.iscoroutinefunction(callback):
             raise TypeError('Cannot subscribe a non-coroutine function callback')
 
         self._check_event(event_type)
 
-        try:
-            self._listeners[event_type].append(callback)
-        except KeyError:
-            self._listeners[event_type] = [callback]
+        if states is not None:
+            by_state = self._state_listeners.setdefault(event_type, {})
+
+            state_ids = {
+                int(self._state_converter.convert(state) if isinstance(state, str) else state) for state in states
+            }
+
+            for state_id in state_ids:
+                by_state.setdefault(state_id, []).append((callback, predicate))
+        elif predicate is not None:
+            self._filtered_listeners.setdefault(event_type, []).append((callback, predicate))
+        else:
+            try:
+                self._listeners[event_type].append(callback)
+            except KeyError:
+                self._listeners[event_type] = [callback]
 
-    def listen(self, event_type: typing.Type[base_events.EventT]) -> typing.Callable:
+    def listen(
+        self,
+        event_type: typing.Type[base_events.EventT],
+        *,
+        states: typing.Optional[typing.Iterable[typing.Union[snowflakes.Snowflake, str]]] = None,
+        predicate: typing.Optional[typing.Callable[[base_events.EventT], bool]] = None
+    ) -> typing.Callable:
         def decorator(callback: typing.Callable) -> typing.Callable:
-            self.subscribe(event_type, callback)
+            self.subscribe(event_type, callback, states=states, predicate=predicate)
 
             return callback
 
@@ -105,29 +226,153 @@ class EventManagerBase(event_manager.EventManager):
 
     async def dispatch(self, event: base_events.Event) -> asyncio.Future[typing.Any]:
         tasks: typing.List[typing.Coroutine] = []
+        state = getattr(event, 'state', None)
 
         for cls in event.dispatches():
             if listeners := self._listeners.get(cls):
                 for callback in listeners:
                     tasks.append(self._invoke_callback(callback, event))
 
+            if filtered := self._filtered_listeners.get(cls):
+                for callback, predicate in filtered:
+                    if predicate(event):
+                        tasks.append(self._invoke_callback(callback, event))
+
+            # Only listeners of the updated state are looked at,
+            # however many listeners of other states there are.
+            if state is not None and (by_state := self._state_listeners.get(cls)):
+                for callback, predicate in by_state.get(state.id, ()):
+                    if predicate is None or predicate(event):
+                        tasks.append(self._invoke_callback(callback, event))
+
         return asyncio.gather(*tasks) if tasks else aio.completed_future()
 
-    def consume_raw_event(self, event: sse_client.MessageEvent) -> None:
-        consumer = self._consumers[event.type]
-        asyncio.create_task(
-            self._handle_dispatch(consumer, event.data),
-            name=f'dispatch {event}'
+    def consume_raw_event(self, event_type: str, data: str) -> None:
+        consumer = self._consumers[event_type]
+        # Events of types without a lane share the last, least urgent one.
+        lane = self._lane_of.get(event_type) or self._lanes[-1]
+
+        if lane.lane.max_pending is not None and len(lane.queue) >= lane.lane.max_pending:
+            lane.queue.popleft()
+            lane.dropped += 1
+
+        lane.queue.append((consumer, data, time.perf_counter()))
+        self._drain_lanes()
+
+    def lane_stats(self) -> typing.Sequence[LaneStats]:
+        """Return statistics of the dispatch lanes.
+
+        Returns
+        -------
+        typing.Sequence[LaneStats]
+            Statistics of every lane, in the order of priority.
+        """
+        return tuple(
+            LaneStats(
+                name=lane.lane.name,
+                pending=len(lane.queue),
+                in_flight=lane.in_flight,
+                dispatched=lane.dispatched,
+                dropped=lane.dropped,
+                mean_latency=lane.total_latency / lane.dispatched if lane.dispatched else 0.0,
+                max_latency=lane.max_latency
+            )
+            for lane in self._lanes
         )
 
+    def lane_latency(self) -> typing.Mapping[str, histogram.LatencyHistogram]:
+        """Return histograms of the seconds from receiving events to their listeners completing.
+
+        Returns
+        -------
+        typing.Mapping[builtins.str, alertapi.internal.histogram.LatencyHistogram]
+            Histograms of the lanes by their names.
+        """
+        return {lane.lane.name: lane.latency for lane in self._lanes}
+
+    async def drain(self, timeout: typing.Optional[float] = None) -> bool:
+        """Wait until every received event is dispatched and its listeners complete.
+
+        Parameters
+        ----------
+        timeout : typing.Optional[builtins.float]
+            Seconds to wait at most. When they elapse, the listeners
+            still running are cancelled and queued events are dropped.
+
+        Returns
+        -------
+        builtins.bool
+            `builtins.True` if every event was dispatched in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+
+        # Finishing tasks start the queued events, so the set is awaited until it stays empty.
+        while self._tasks:
+            remaining = deadline - loop.time() if deadline is not None else None
+
+            if remaining is not None and remaining <= 0:
+                break
+            await asyncio.wait(tuple(self._tasks), timeout=remaining)
+
+        if not self._tasks:
+            return True
+
+        for lane in self._lanes:
+            lane.dropped += len(lane.queue)
+            lane.queue.clear()
+        for task in tuple(self._tasks):
+            task.cancel()
+        return False
+
+    def _drain_lanes(self) -> None:
+        for lane in self._lanes:
+            while lane.queue and lane.in_flight < lane.lane.workers:
+                consumer, payload, received_at = lane.queue.popleft()
+                lane.in_flight += 1
+                task = asyncio.create_task(
+                    self._handle_lane_dispatch(lane, consumer, payload, received_at),
+                    name=f'dispatch {lane.lane.name}'
+                )
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            # Less urgent lanes wait until this one has been queued out.
+            if lane.queue:
+                return
+
+    async def _handle_lane_dispatch(
+        self, lane: _LaneState, consumer: _Consumer, payload: str, received_at: float
+    ) -> None:
+        try:
+            await self._handle_dispatch(consumer, payload)
+        except Exception as exc:
+            asyncio.get_running_loop().call_exception_handler({
+                'message': f'Exception in a listener of {lane.lane.name!r} lane',
+                'exception': exc
+            })
+        finally:
+            latency = time.perf_counter() - received_at
+            lane.in_flight -= 1
+            lane.dispatched += 1
+            lane.total_latency += latency
+            lane.max_latency = max(lane.max_latency, latency)
+            lane.latency.observe(latency)
+            self._drain_lanes()
+
     async def _invoke_callback(self, callback: typing.Callable, event: base_events.EventT):
         await callback(event)
 
     async def _handle_dispatch(self, consumer: _Consumer, payload: str) -> None:
         try:
-            await consumer.callback(payload)
+            dispatched = await consumer.callback(payload)
         except TypeError:
-            await consumer.callback()
+            dispatched = await consumer.callback()
+
+        # Consumers return the dispatch future, so the lane worker
+        # stays busy until the listeners of the event complete.
+        if dispatched is not None:
+            await dispatched
 
 
 class EventManagerImpl(EventManagerBase):
@@ -136,20 +381,21 @@ class EventManagerImpl(EventManagerBase):
     def __init__(
         self,
         event_factory: event_factory.EventFactoryImpl,
-        entity_factory: entity_factory.EntityFactoryImpl
+        entity_factory: entity_factory.EntityFactoryImpl,
+        lanes: typing.Sequence[DispatchLane] = DEFAULT_LANES
     ) -> None:
-        super().__init__(event_factory=event_factory, entity_factory=entity_factory)
+        super().__init__(event_factory=event_factory, entity_factory=entity_factory, lanes=lanes)
 
-    async def on_hello(self) -> None:
-        await self.dispatch(self._event_factory.deserialize_hello_event())
+    async def on_hello(self) -> asyncio.Future[typing.Any]:
+        return await self.dispatch(self._event_factory.deserialize_hello_event())
 
-    async def on_update(self, payload: str) -> None:
+    async def on_update(self, payload: str) -> asyncio.Future[typing.Any]:
         json_payload = json.loads(payload)
         state = self._entity_factory.deserialize_state(json_payload['state'])
 
-        await self.dispatch(
+        return await self.dispatch(
             self._event_factory.deserialize_state_update_event(state=state)
         )
 
-    async def on_ping(self) -> None:
-        await self.dispatch(self._event_factory.deserialize_ping_event())
+    async def on_ping(self) -> asyncio.Future[typing.Any]:
+        return await self.dispatch(self._event_factory.deserialize_ping_event())
@@ -25,12 +25,17 @@ from __future__ import annotations
 
 __all__: typing.Sequence[str] = ('HttpClientImpl',)
 
+import asyncio
+import time
 import typing
 
 import aiohttp
 
 from alertapi.api import http
+from alertapi.impl import endpoints
 from alertapi.impl import entity_factory
+from alertapi.impl import token_pool
+from alertapi.internal import histogram
 from alertapi.internal import routes
 from alertapi import errors
 
@@ -38,56 +43,221 @@ if typing.TYPE_CHECKING:
     from alertapi.internal import data_binding
     from alertapi import snowflakes
     from alertapi import states
+    from alertapi import frames
+    from alertapi import queries
     from alertapi import images
 
 
 class HttpClientImpl(http.HTTPClient):
     __slots__: typing.Sequence[str] = (
         '_session',
-        '_access_token',
+        '_token_pool',
         '_entity_factory',
-        '_api_url'
+        '_endpoints',
+        '_hedge_delay',
+        '_latency'
     )
 
-    def __init__(self, access_token: str, session: aiohttp.ClientSession) -> None:
-        self._access_token = access_token
+    def __init__(
+        self,
+        access_token: typing.Union[str, token_pool.TokenPool],
+        session: aiohttp.ClientSession,
+        image_cache: typing.Optional[images.ImageCache] = None,
+        *,
+        flyweight_states: bool = False,
+        base_urls: typing.Union[typing.Sequence[str], endpoints.EndpointPool] = (routes.BASE_URL,),
+        hedge_delay: typing.Optional[float] = None
+    ) -> None:
+        if isinstance(access_token, str):
+            access_token = token_pool.TokenPool((access_token,))
+        if not isinstance(base_urls, endpoints.EndpointPool):
+            base_urls = endpoints.EndpointPool(base_urls)
+
+        self._token_pool = access_token
         self._session = session
-        self._entity_factory = entity_factory.EntityFactoryImpl()
-        self._api_url = routes.BASE_URL
+        self._entity_factory = entity_factory.EntityFactoryImpl(image_cache=image_cache, flyweight=flyweight_states)
+        self._endpoints = base_urls
+        self._hedge_delay = hedge_delay
+        self._latency: dict[str, histogram.LatencyHistogram] = {}
+
+    @property
+    def token_pool(self) -> token_pool.TokenPool:
+        return self._token_pool
+
+    @property
+    def endpoints(self) -> endpoints.EndpointPool:
+        return self._endpoints
+
+    @property
+    def latency(self) -> typing.Mapping[str, histogram.LatencyHistogram]:
+        """Latency of completed request attempts by route path template."""
+        return self._latency
 
     async def _request(
         self, compiled_route: routes.CompiledRoute
-    ) -> typing.Optional[typing.Union[data_binding.JSONObject], str]:
-        headers = {'X-API-Key': self._access_token}
-        url = compiled_route.create_url(self._api_url)
+    ) -> data_binding.JSONObject:
+        json_payload, _ = await self._send(compiled_route)
 
+        if not json_payload or not (json_payload.get('state') or json_payload.get('states')):
+            raise errors.StateNotFound(f'Route with state {compiled_route.compiled_path} has not found.')
+        return json_payload
+
+    async def _send(
+        self,
+        compiled_route: routes.CompiledRoute,
+        headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> tuple[typing.Optional[data_binding.JSONObject], typing.Mapping[str, str]]:
         async with self._session() as session:
-            response = await session.request(
-                compiled_route.method,
-                url,
-                headers=headers
-            )
-            response.raise_for_status()
+            candidates = iter(self._endpoints.ranked())
+            remaining = len(self._endpoints)
+            pending: typing.Set[asyncio.Task[typing.Any]] = set()
+            error: typing.Optional[BaseException] = None
+
+            # The next endpoint is tried when an attempt fails, or
+            # alongside the current ones once the hedge delay elapses.
+            try:
+                while True:
+                    if remaining:
+                        endpoint = next(candidates)
+                        remaining -= 1
+                        pending.add(asyncio.create_task(self._attempt(session, endpoint, compiled_route, headers)))
+                    elif not pending:
+                        assert error is not None
+                        raise error
+
+                    timeout = self._hedge_delay if remaining else None
+                    done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                    # A success wins over errors of attempts that completed alongside it.
+                    for task in done:
+                        if task.exception() is None:
+                            return task.result()
+
+                    for task in done:
+                        exception = task.exception()
+                        assert exception is not None
+
+                        if not _is_endpoint_error(exception):
+                            raise exception
+                        error = exception
+            finally:
+                for task in pending:
+                    task.cancel()
+
+    async def _attempt(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: endpoints.Endpoint,
+        compiled_route: routes.CompiledRoute,
+        headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> tuple[typing.Optional[data_binding.JSONObject], typing.Mapping[str, str]]:
+        """Send a request to a single endpoint.
+
+        Returns the JSON payload, or `builtins.None` if the server replied
+        with `304 Not Modified`, along with the response headers.
+        """
+        url = compiled_route.create_url(endpoint.url)
+        attempts = len(self._token_pool)
+        started = time.perf_counter()
+
+        try:
+            # A throttled or rejected token is ejected from the pool,
+            # so the request is retried with the next one before giving up.
+            for attempt in range(attempts):
+                lease = self._token_pool.acquire()
+
+                try:
+                    response = await session.request(
+                        compiled_route.method,
+                        url,
+                        headers={**(headers or {}), 'X-API-Key': lease.token}
+                    )
+                except asyncio.CancelledError:
+                    lease.discard()
+                    raise
+                except BaseException:
+                    lease.release()
+                    raise
 
-            if compiled_route.compiled_path.endswith('.png'):
-                return response.url
-            json_payload = await response.json()
+                lease.release(response.status, response.headers)
 
-            if not (json_payload.get('state') or json_payload.get('states')):
-                raise errors.StateNotFound(f'Route with state {compiled_route.compiled_path} has not found.')
-            return json_payload
+                if response.status not in token_pool.EJECTING_STATUSES or attempt == attempts - 1:
+                    break
+                response.release()
+
+            # The connection goes back to the pool even if the status or the body is rejected.
+            try:
+                response.raise_for_status()
+                json_payload = None if response.status == 304 else await response.json()
+            finally:
+                response.release()
+        except asyncio.CancelledError:
+            self._endpoints.record_cancelled(endpoint, time.perf_counter() - started)
+            raise
+        except BaseException as exc:
+            if _is_endpoint_error(exc):
+                self._endpoints.record_failure(endpoint)
+                self._observe_latency(compiled_route, time.perf_counter() - started)
+            raise
+
+        latency = time.perf_counter() - started
+        self._endpoints.record_success(endpoint, latency)
+        self._observe_latency(compiled_route, latency)
+        return json_payload, response.headers
+
+    def _observe_latency(self, compiled_route: routes.CompiledRoute, latency: float) -> None:
+        path = compiled_route.route.path_template
+
+        try:
+            self._latency[path].observe(latency)
+        except KeyError:
+            self._latency[path] = latency_histogram = histogram.LatencyHistogram()
+            latency_histogram.observe(latency)
 
     async def fetch_states(
-        self, with_alert: typing.Union[bool, None], limit: int
-    ) -> tuple[states.State]:
+        self, query: queries.StateQuery, *, as_frame: bool = False
+    ) -> typing.Union[tuple[states.State], frames.StatesFrame]:
         route = routes.GET_STATES.compile()
-        response = (await self._request(route))['states']
+        response = query.apply((await self._request(route))['states'])
+
+        if as_frame:
+            return self._entity_factory.deserialize_states_frame(response)
+        return self._entity_factory.deserialize_states(response)
+
+    async def poll_states(
+        self, validators: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> tuple[typing.Optional[typing.Sequence[data_binding.JSONObject]], typing.Mapping[str, str]]:
+        """Fetch raw payloads of all states with a conditional request.
+
+        Parameters
+        ----------
+        validators : typing.Optional[typing.Mapping[builtins.str, builtins.str]]
+            Validators returned by the previous call.
 
-        if isinstance(with_alert, bool):
-            response = tuple(filter(
-                lambda state: state['alert'] is with_alert, response
-            ))
-        return self._entity_factory.deserialize_states(response[:limit])
+        Returns
+        -------
+        typing.Optional[typing.Sequence[alertapi.internal.data_binding.JSONObject]]
+            Payloads of the states or `builtins.None` if they have not
+            changed since the previous call.
+        typing.Mapping[builtins.str, builtins.str]
+            Validators to pass to the next call.
+        """
+        headers = {}
+
+        if validators:
+            if 'ETag' in validators:
+                headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                headers['If-Modified-Since'] = validators['Last-Modified']
+
+        json_payload, response_headers = await self._send(routes.GET_STATES.compile(), headers)
+
+        if json_payload is None:
+            return None, validators or {}
+
+        return json_payload['states'], {
+            name: response_headers[name] for name in ('ETag', 'Last-Modified') if name in response_headers
+        }
 
     async def fetch_state(self, state: snowflakes.Snowflake) -> states.State:
         route = routes.GET_STATE.compile(state=state)
@@ -103,6 +273,14 @@ class HttpClientImpl(http.HTTPClient):
 
     async def fetch_static_map(self) -> images.Image:
         route = routes.GET_STATIC_MAP.compile()
-        response = await self._request(route)
+        headers = {'X-API-Key': self._token_pool.select()}
+        url = route.create_url(self._endpoints.ranked()[0].url)
+
+        return self._entity_factory.deserialize_image(url, headers=headers)
+
 
-        return self._entity_factory.deserialize_image(response)
+def _is_endpoint_error(exception: BaseException) -> bool:
+    """Whether an exception is caused by the endpoint and another one may succeed."""
+    if isinstance(exception, aiohttp.ClientResponseError):
+        return exception.status >= 500
+    return isinstance(exception, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Prometheus metrics and health checks of a gateway client."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('MetricsServer',)
+
+import json
+import typing
+
+from aiohttp import web
+
+from alertapi.internal import converters
+
+if typing.TYPE_CHECKING:
+    from alertapi.impl import client as client_
+    from alertapi.internal import histogram
+
+_CONTENT_TYPE: typing.Final[str] = 'text/plain; version=0.0.4; charset=utf-8'
+"""Content type of the Prometheus text exposition format."""
+
+_NAMES_EN: typing.Final[typing.Mapping[int, str]] = {
+    int(state_id): name for name, state_id in converters.StateConverter.STATES.items()
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: typing.Any) -> str:
+    return '{' + ','.join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + '}'
+
+
+def _bound(value: float) -> str:
+    return '+Inf' if value == float('inf') else repr(value)
+
+
+class _Writer:
+    __slots__: typing.Sequence[str] = ('lines',)
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def family(self, name: str, kind: str, description: str) -> None:
+        self.lines.append(f'# HELP {name} {description}')
+        self.lines.append(f'# TYPE {name} {kind}')
+
+    def sample(self, name: str, value: float, labels: str = '') -> None:
+        self.lines.append(f'{name}{labels} {int(value) if isinstance(value, int) else float(value)!r}')
+
+    def metric(self, name: str, kind: str, description: str, value: float) -> None:
+        self.family(name, kind, description)
+        self.sample(name, value)
+
+    def latency(self, name: str, latency: histogram.LatencyHistogram, **labels: typing.Any) -> None:
+        for bound, count in latency.cumulative():
+            self.sample(f'{name}_bucket', count, _labels(**labels, le=_bound(bound)))
+
+        self.sample(f'{name}_sum', latency.sum, _labels(**labels) if labels else '')
+        self.sample(f'{name}_count', latency.count, _labels(**labels) if labels else '')
+
+
+class MetricsServer:
+    """Local HTTP server exposing metrics and health of a gateway client.
+
+    Serves:
+
+    * `/metrics` - metrics in the Prometheus text format;
+    * `/healthz` - `200` while the client runs and its event stream is not stale, `503` otherwise;
+    * `/readyz` - `200` once the client is healthy, receives state updates and
+      has reconciled its states with Alert API, `503` otherwise.
+
+    Parameters
+    ----------
+    client : alertapi.impl.client.GatewayClient
+        The client to report on.
+    host : builtins.str
+        Host to listen on. Defaults to `'127.0.0.1'`.
+    port : builtins.int
+        Port to listen on, `0` to pick a free one. Defaults to `9464`.
+    """
+
+    __slots__: typing.Sequence[str] = ('_client', '_host', '_port', '_runner')
+
+    def __init__(self, client: client_.GatewayClient, *, host: str = '127.0.0.1', port: int = 9464) -> None:
+        self._client = client
+        self._host = host
+        self._port = port
+        self._runner: typing.Optional[web.AppRunner] = None
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on."""
+        return self._port
+
+    def is_healthy(self) -> bool:
+        """Whether the client runs and its event stream is not stale."""
+        client = self._client
+        return client.is_running and not (client.is_connected and client.watchdog.is_stale())
+
+    def is_ready(self) -> bool:
+        """Whether the client is healthy, receives state updates and has reconciled its states."""
+        client = self._client
+        return self.is_healthy() and (client.is_connected or client.is_polling) and not client.snapshot.stale
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text format.
+
+        Returns
+        -------
+        builtins.str
+            The metrics.
+        """
+        client = self._client
+        snapshot = client.snapshot
+        heartbeat = client.watchdog.stats()
+        writer = _Writer()
+
+        writer.family('alertapi_state_alert', 'gauge', 'Whether an alert is active in the state.')
+        for state_id in sorted(snapshot.states):
+            writer.sample(
+                'alertapi_state_alert',
+                snapshot.is_alert(state_id),
+                _labels(state_id=int(state_id), state=_NAMES_EN.get(int(state_id), ''))
+            )
+
+        active = bin(snapshot.alert_mask).count('1')
+        writer.metric('alertapi_active_alerts', 'gauge', 'Number of states with an active alert.', active)
+        writer.metric('alertapi_states_stale', 'gauge', 'Whether the states are not reconciled yet.', snapshot.stale)
+        writer.metric('alertapi_stream_connected', 'gauge', 'Whether the stream is connected.', client.is_connected)
+        writer.metric('alertapi_polling', 'gauge', 'Whether states are polled instead.', client.is_polling)
+        writer.metric('alertapi_stream_reconnects_total', 'counter', 'Reconnects of the stream.', client.reconnects)
+        writer.metric('alertapi_stream_stale_total', 'counter', 'Event streams found stale.', heartbeat.stale_streams)
+        writer.metric(
+            'alertapi_last_event_age_seconds', 'gauge', 'Seconds since the last event or poll.', heartbeat.silence
+        )
+        writer.metric('alertapi_pings_total', 'counter', 'Pings received.', heartbeat.pings)
+
+        writer.family('alertapi_http_request_duration_seconds', 'histogram', 'Latency of HTTP requests to Alert API.')
+        for path, latency in sorted(client.client.http.latency.items()):
+            writer.latency('alertapi_http_request_duration_seconds', latency, route=path)
+
+        lanes = client.event_manager.lane_stats()
+        writer.family('alertapi_dispatch_pending', 'gauge', 'Events queued in the dispatch lane.')
+        for lane in lanes:
+            writer.sample('alertapi_dispatch_pending', lane.pending, _labels(lane=lane.name))
+
+        writer.family('alertapi_dispatch_in_flight', 'gauge', 'Events being dispatched from the lane.')
+        for lane in lanes:
+            writer.sample('alertapi_dispatch_in_flight', lane.in_flight, _labels(lane=lane.name))
+
+        writer.family('alertapi_dispatched_total', 'counter', 'Events dispatched from the lane.')
+        for lane in lanes:
+            writer.sample('alertapi_dispatched_total', lane.dispatched, _labels(lane=lane.name))
+
+        writer.family('alertapi_dispatch_dropped_total', 'counter', 'Events dropped or coalesced in the lane.')
+        for lane in lanes:
+            writer.sample('alertapi_dispatch_dropped_total', lane.dropped, _labels(lane=lane.name))
+
+        writer.family(
+            'alertapi_listener_duration_seconds',
+            'histogram',
+            'Seconds from receiving events to their listeners completing.'
+        )
+        for name, latency in client.event_manager.lane_latency().items():
+            writer.latency('alertapi_listener_duration_seconds', latency, lane=name)
+
+        if (debouncer := client.debouncer) is not None:
+            debounce = debouncer.stats()
+            writer.metric('alertapi_transitions_total', 'counter', 'Alert transitions dispatched.', debounce.emitted)
+            writer.metric(
+                'alertapi_transitions_suppressed_total', 'counter', 'Alert changes suppressed.', debounce.suppressed
+            )
+            writer.metric('alertapi_flapping_states', 'gauge', 'States changing too often.', debounce.flapping)
+
+        writer.lines.append('')
+        return '\n'.join(writer.lines)
+
+    def application(self) -> web.Application:
+        """Build the application serving the routes, e.g. to mount it in another one.
+
+        Returns
+        -------
+        aiohttp.web.Application
+            The application.
+        """
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_metrics)
+        app.router.add_get('/healthz', self._handle_health)
+        app.router.add_get('/readyz', self._handle_readiness)
+        return app
+
+    async def start(self) -> None:
+        """Start serving."""
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+
+        # The port is only known after binding when a free one is picked.
+        self._port = self._runner.addresses[0][1]
+
+    async def close(self) -> None:
+        """Stop serving."""
+        runner, self._runner = self._runner, None
+
+        if runner is not None:
+            await runner.cleanup()
+
+    async def _handle_metrics(self, _: web.Request) -> web.Response:
+        return web.Response(body=self.render().encode('utf-8'), headers={'Content-Type': _CONTENT_TYPE})
+
+    async def _handle_health(self, _: web.Request) -> web.Response:
+        return self._status_response(self.is_healthy())
+
+    async def _handle_readiness(self, _: web.Request) -> web.Response:
+        return self._status_response(self.is_ready())
+
+    def _status_response(self, ok: bool) -> web.Response:
+        client = self._client
+        body = {
+            'status': 'ok' if ok else 'unavailable',
+            'running': client.is_running,
+            'connected': client.is_connected,
+            'polling': client.is_polling,
+            'stale_stream': client.is_connected and client.watchdog.is_stale(),
+            'stale_states': client.snapshot.stale,
+            'last_event_age': client.watchdog.stats().silence
+        }
+        return web.Response(text=json.dumps(body), status=200 if ok else 503, content_type='application/json')
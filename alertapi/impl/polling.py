@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Polling transport that emulates the event stream of Alert API."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('StatePoller',)
+
+import asyncio
+import json
+import typing
+
+import aiohttp
+
+from alertapi import errors
+
+if typing.TYPE_CHECKING:
+    from alertapi.impl import event_manager
+    from alertapi.impl import http
+    from alertapi.impl import watchdog as watchdog_
+    from alertapi.internal import data_binding
+
+
+class StatePoller:
+    """Poll all states and dispatch the changes as events.
+
+    The first successful poll dispatches a
+    `alertapi.events.base_events.ClientConnectedEvent`, every following
+    change of a state dispatches a `alertapi.events.base_events.StateUpdateEvent`,
+    so listeners behave the same as with the event stream.
+
+    Changes are queued as raw events of the event stream, so they pass
+    through the same dispatch lanes, lane statistics and
+    `alertapi.impl.event_manager.EventManagerImpl.drain`.
+
+    The polling interval adapts to the activity: it drops to `min_interval`
+    as soon as a state changes and grows by `backoff` times after every
+    poll without changes, up to `max_interval`.
+
+    Parameters
+    ----------
+    http : alertapi.impl.http.HttpClientImpl
+        HTTP client to poll states with.
+    event_manager : alertapi.impl.event_manager.EventManagerImpl
+        Event manager to queue the events in.
+    watchdog : typing.Optional[alertapi.impl.watchdog.HeartbeatWatchdog]
+        Watchdog fed after every successful poll, so the age of the last
+        event it reports stays meaningful while polling.
+    min_interval : builtins.float
+        Shortest interval between polls, in seconds. Defaults to `2`.
+    max_interval : builtins.float
+        Longest interval between polls, in seconds. Defaults to `30`.
+    backoff : builtins.float
+        Factor the interval grows by after a poll without changes.
+        Defaults to `1.5`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_http',
+        '_event_manager',
+        '_watchdog',
+        '_min_interval',
+        '_max_interval',
+        '_backoff',
+        '_interval',
+        '_validators',
+        '_payloads'
+    )
+
+    def __init__(
+        self,
+        http: http.HttpClientImpl,
+        event_manager: event_manager.EventManagerImpl,
+        *,
+        watchdog: typing.Optional[watchdog_.HeartbeatWatchdog] = None,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError('Polling intervals must be positive and min_interval must not exceed max_interval')
+        if backoff < 1:
+            raise ValueError('Backoff must not be less than 1')
+
+        self._http = http
+        self._event_manager = event_manager
+        self._watchdog = watchdog
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._interval = min_interval
+        self._validators: typing.Mapping[str, str] = {}
+        self._payloads: typing.Optional[dict[int, data_binding.JSONObject]] = None
+
+    @property
+    def interval(self) -> float:
+        """Seconds until the next poll."""
+        return self._interval
+
+    async def poll(self) -> int:
+        """Poll states once and queue events for the changes.
+
+        Returns
+        -------
+        builtins.int
+            Number of changed states.
+        """
+        payloads, self._validators = await self._http.poll_states(self._validators)
+        changed = 0
+
+        if self._watchdog is not None:
+            self._watchdog.feed()
+
+        if payloads is not None:
+            previous = self._payloads
+            self._payloads = {payload['id']: payload for payload in payloads}
+
+            if previous is None:
+                self._event_manager.consume_raw_event('hello', '')
+            else:
+                for payload in payloads:
+                    old = previous.get(payload['id'])
+
+                    if old is None or old['alert'] != payload['alert'] or old['changed'] != payload['changed']:
+                        changed += 1
+                        self._event_manager.consume_raw_event('update', json.dumps({'state': payload}))
+
+        if changed:
+            self._interval = self._min_interval
+        else:
+            self._interval = min(self._interval * self._backoff, self._max_interval)
+        return changed
+
+    async def run(self) -> None:
+        """Poll states until cancelled.
+
+        Failed polls are retried after a growing interval, and polls
+        without an available token once the first token returns.
+        """
+        while True:
+            try:
+                await self.poll()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self._interval = min(self._interval * self._backoff, self._max_interval)
+            except errors.TokensExhausted as exc:
+                await asyncio.sleep(exc.retry_after)
+                continue
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,560 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Batched forwarding of events to files, sockets and webhooks."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = (
+    'serialize_event',
+    'SinkRunner',
+    'SinkStats',
+    'FileSink',
+    'SocketSink',
+    'WebhookSink'
+)
+
+import asyncio
+import collections
+import contextlib
+import json
+import os
+import pathlib
+import shutil
+import time
+import typing
+
+import aiohttp
+import attr
+
+from alertapi.api import sink
+from alertapi.events import base_events
+
+_EVENT_TYPES: typing.Final[typing.Mapping[typing.Type[base_events.Event], str]] = {
+    base_events.ClientConnectedEvent: 'hello',
+    base_events.PingEvent: 'ping',
+    base_events.StateUpdateEvent: 'update',
+    base_events.StateTransitionEvent: 'transition'
+}
+
+
+def serialize_event(event: base_events.Event) -> bytes:
+    """Serialize an event into a newline-terminated JSON record.
+
+    Parameters
+    ----------
+    event : alertapi.events.base_events.Event
+        The event to serialize.
+
+    Returns
+    -------
+    builtins.bytes
+        The record.
+    """
+    record: dict[str, typing.Any] = {'type': _EVENT_TYPES.get(type(event), type(event).__name__)}
+
+    if isinstance(event, (base_events.StateUpdateEvent, base_events.StateTransitionEvent)):
+        state = event.state
+        changed = state.raw_changed
+        record['state'] = {
+            'id': int(state.id),
+            'name': state.name,
+            'name_en': state.name_en,
+            'alert': state.alert,
+            'changed': changed if isinstance(changed, str) else changed.isoformat()
+        }
+    if isinstance(event, base_events.StateTransitionEvent):
+        record['previous_alert'] = event.previous_alert
+        record['suppressed'] = event.suppressed
+    return json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+@attr.define(slots=True, frozen=True)
+class SinkStats:
+    """Throughput statistics of a sink.
+
+    Attributes
+    ----------
+    name : builtins.str
+        Name of the sink.
+    written : builtins.int
+        Number of records delivered.
+    batches : builtins.int
+        Number of batches delivered.
+    failures : builtins.int
+        Number of failed delivery attempts.
+    spilled : builtins.int
+        Number of records written to the spill file.
+    dropped : builtins.int
+        Number of records which could neither be delivered nor spilled.
+    pending : builtins.int
+        Number of records waiting to be delivered.
+    throughput : builtins.float
+        Delivered records per second since the first delivery.
+    """
+
+    name: str = attr.field()
+    written: int = attr.field()
+    batches: int = attr.field()
+    failures: int = attr.field()
+    spilled: int = attr.field()
+    dropped: int = attr.field()
+    pending: int = attr.field()
+    throughput: float = attr.field()
+
+
+class SinkRunner:
+    """Deliver records to a sink in batches from a background task.
+
+    Records are submitted without waiting, so a slow sink never delays
+    other listeners. A batch is delivered once `max_batch_size` records
+    are pending or `max_delay` seconds after its first record. A failed
+    batch is retried `max_retries` times with exponential backoff and then
+    appended to the spill file, which is replayed before the next batch
+    once the sink recovers. When `max_pending` records are already waiting,
+    the oldest one is spilled to make room, so records are delivered in
+    the order they were submitted.
+
+    Parameters
+    ----------
+    sink : alertapi.api.sink.Sink
+        The sink to deliver records to.
+    max_batch_size : builtins.int
+        Maximum number of records in a batch. Defaults to `100`.
+    max_delay : builtins.float
+        Maximum seconds a record waits for its batch to fill. Defaults to `1`.
+    max_pending : builtins.int
+        Maximum number of records kept in memory. Defaults to `10000`.
+    max_retries : builtins.int
+        Number of retries of a failed batch. Defaults to `3`.
+    retry_delay : builtins.float
+        Seconds before the first retry, doubled for every next one.
+        Defaults to `0.5`.
+    spill_path : typing.Union[builtins.str, os.PathLike[builtins.str], builtins.None]
+        File to spill undelivered records to. If not specified,
+        undelivered records are dropped.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_sink',
+        '_max_batch_size',
+        '_max_delay',
+        '_max_pending',
+        '_max_retries',
+        '_retry_delay',
+        '_spill_path',
+        '_pending',
+        '_evicted',
+        '_delivering',
+        '_has_records',
+        '_batch_full',
+        '_task',
+        '_closing',
+        '_written',
+        '_batches',
+        '_failures',
+        '_spilled',
+        '_dropped',
+        '_started_at'
+    )
+
+    def __init__(
+        self,
+        sink: sink.Sink,
+        *,
+        max_batch_size: int = 100,
+        max_delay: float = 1.0,
+        max_pending: int = 10_000,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        spill_path: typing.Union[str, os.PathLike[str], None] = None
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError('Batch size must be positive')
+
+        self._sink = sink
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._max_retries = max_retries
+        self._retry_delay = retry_delay
+        self._spill_path = pathlib.Path(spill_path) if spill_path is not None else None
+        self._pending: typing.Deque[bytes] = collections.deque()
+        # Records evicted while a batch is delivered are newer, so they are spilled after it.
+        self._evicted: list[bytes] = []
+        self._delivering = False
+        # Events are created in the running loop, as the runner may be made before it exists.
+        self._has_records: typing.Optional[asyncio.Event] = None
+        self._batch_full: typing.Optional[asyncio.Event] = None
+        self._task: typing.Optional[asyncio.Task[None]] = None
+        self._closing = False
+        self._written = 0
+        self._batches = 0
+        self._failures = 0
+        self._spilled = 0
+        self._dropped = 0
+        self._started_at: typing.Optional[float] = None
+
+    @property
+    def sink(self) -> sink.Sink:
+        return self._sink
+
+    def submit(self, record: bytes) -> None:
+        """Queue a record for delivery without waiting for it.
+
+        Parameters
+        ----------
+        record : builtins.bytes
+            Serialized record, terminated by a newline.
+        """
+        if self._task is None:
+            self._closing = False
+            self._has_records = asyncio.Event()
+            self._batch_full = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(), name=f'sink {self._sink.name}')
+
+        if len(self._pending) >= self._max_pending:
+            evicted = self._pending.popleft()
+
+            if self._delivering:
+                self._evicted.append(evicted)
+            else:
+                self._spill((evicted,))
+
+        self._pending.append(record)
+        self._has_records.set()
+
+        if len(self._pending) >= self._max_batch_size:
+            self._batch_full.set()
+
+    async def on_event(self, event: base_events.Event) -> None:
+        """Event listener submitting the serialized event."""
+        self.submit(serialize_event(event))
+
+    def stats(self) -> SinkStats:
+        """Return the throughput statistics of the sink.
+
+        Returns
+        -------
+        SinkStats
+            Statistics of the sink.
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at is not None else 0.0
+
+        return SinkStats(
+            name=self._sink.name,
+            written=self._written,
+            batches=self._batches,
+            failures=self._failures,
+            spilled=self._spilled,
+            dropped=self._dropped,
+            pending=len(self._pending),
+            throughput=self._written / elapsed if elapsed > 0 else 0.0
+        )
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Deliver the pending records, stop the background task and close the sink.
+
+        Parameters
+        ----------
+        timeout : builtins.float
+            Seconds to wait for the delivery. When they elapse, the delivery
+            is cancelled and the undelivered records are spilled. Defaults to `10`.
+        """
+        task, self._task = self._task, None
+
+        if task is not None:
+            assert self._has_records is not None and self._batch_full is not None
+            # The worker delivers everything pending and returns, instead of
+            # being cancelled in the middle of a write.
+            self._closing = True
+            self._has_records.set()
+            self._batch_full.set()
+
+            done, _ = await asyncio.wait((task,), timeout=timeout)
+
+            if not done:
+                task.cancel()
+                await asyncio.wait((task,))
+
+        self._spill(tuple(self._pending))
+        self._pending.clear()
+        await self._sink.close()
+
+    async def _run(self) -> None:
+        assert self._has_records is not None and self._batch_full is not None
+
+        while True:
+            await self._has_records.wait()
+
+            if not self._closing and len(self._pending) < self._max_batch_size:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._batch_full.wait(), self._max_delay)
+
+            if self._pending or not self._closing:
+                await self._deliver(self._take_batch())
+            if self._closing and not self._pending:
+                return
+
+    def _take_batch(self) -> list[bytes]:
+        pending = self._pending
+        batch = [pending.popleft() for _ in range(min(len(pending), self._max_batch_size))]
+
+        if self._batch_full is not None and len(pending) < self._max_batch_size:
+            self._batch_full.clear()
+        if self._has_records is not None and not pending:
+            self._has_records.clear()
+        return batch
+
+    async def _deliver(self, batch: typing.Sequence[bytes]) -> None:
+        self._delivering = True
+
+        try:
+            # Spilled records are older, so they are replayed first.
+            if self._spill_path is not None and self._spill_path.exists() and not await self._replay():
+                return
+            if await self._write(batch):
+                batch = ()
+        finally:
+            # Whatever was not written, because of a failure or cancellation,
+            # is appended to the spill file in order and replayed by the next delivery.
+            self._delivering = False
+            self._spill(batch)
+            self._spill(self._evicted)
+            self._evicted.clear()
+
+    async def _replay(self) -> bool:
+        assert self._spill_path is not None
+        offset = 0
+
+        try:
+            while True:
+                chunk, end = self._read_spill(offset)
+
+                if not chunk:
+                    self._spill_path.unlink()
+                    offset = 0
+                    return True
+                if not await self._write(chunk):
+                    return False
+                offset = end
+        finally:
+            # The file is only rewritten once a replay got through some of it.
+            if offset:
+                self._truncate_spill(offset)
+
+    async def _write(self, batch: typing.Sequence[bytes]) -> bool:
+        if not batch:
+            return True
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._sink.write(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._failures += 1
+
+                if attempt < self._max_retries:
+                    await asyncio.sleep(self._retry_delay * 2 ** attempt)
+                continue
+
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+
+            self._written += len(batch)
+            self._batches += 1
+            return True
+        return False
+
+    def _read_spill(self, offset: int) -> tuple[list[bytes], int]:
+        assert self._spill_path is not None
+        records = []
+
+        with open(self._spill_path, 'rb') as fp:
+            fp.seek(offset)
+
+            for _ in range(self._max_batch_size):
+                record = fp.readline()
+
+                if not record:
+                    break
+                records.append(record)
+            return records, fp.tell()
+
+    def _truncate_spill(self, offset: int) -> None:
+        assert self._spill_path is not None
+        path = self._spill_path.with_suffix(self._spill_path.suffix + '.tmp')
+
+        with open(self._spill_path, 'rb') as source, open(path, 'wb') as target:
+            source.seek(offset)
+            shutil.copyfileobj(source, target)
+        os.replace(path, self._spill_path)
+
+    def _spill(self, records: typing.Sequence[bytes]) -> None:
+        if not records:
+            return
+
+        if self._spill_path is None:
+            self._dropped += len(records)
+            return
+
+        try:
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._spill_path, 'ab') as fp:
+                fp.write(b''.join(records))
+        except OSError:
+            self._dropped += len(records)
+            return
+
+        self._spilled += len(records)
+
+
+class FileSink(sink.Sink):
+    """Sink appending records to a file, such as an NDJSON log.
+
+    Parameters
+    ----------
+    path : typing.Union[builtins.str, os.PathLike[builtins.str]]
+        Path to the file.
+    """
+
+    __slots__: typing.Sequence[str] = ('_path',)
+
+    def __init__(self, path: typing.Union[str, os.PathLike[str]]) -> None:
+        self._path = pathlib.Path(path)
+
+    @property
+    def name(self) -> str:
+        return f'file:{self._path}'
+
+    async def write(self, records: typing.Sequence[bytes]) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._append, b''.join(records))
+
+    def _append(self, data: bytes) -> None:
+        with open(self._path, 'ab') as fp:
+            fp.write(data)
+
+
+class SocketSink(sink.Sink):
+    """Sink streaming records to a TCP or Unix socket.
+
+    The connection is opened on the first write and reopened
+    on the next write after it fails.
+
+    Parameters
+    ----------
+    host : typing.Optional[builtins.str]
+        Host to connect to over TCP.
+    port : typing.Optional[builtins.int]
+        Port to connect to over TCP.
+    path : typing.Union[builtins.str, os.PathLike[builtins.str], builtins.None]
+        Path to a Unix socket to connect to instead.
+    """
+
+    __slots__: typing.Sequence[str] = ('_host', '_port', '_path', '_writer')
+
+    def __init__(
+        self,
+        host: typing.Optional[str] = None,
+        port: typing.Optional[int] = None,
+        *,
+        path: typing.Union[str, os.PathLike[str], None] = None
+    ) -> None:
+        if (path is None) == (host is None or port is None):
+            raise ValueError('Either host and port or path must be specified')
+
+        self._host = host
+        self._port = port
+        self._path = path
+        self._writer: typing.Optional[asyncio.StreamWriter] = None
+
+    @property
+    def name(self) -> str:
+        return f'unix:{self._path}' if self._path is not None else f'tcp:{self._host}:{self._port}'
+
+    async def write(self, records: typing.Sequence[bytes]) -> None:
+        if self._writer is None:
+            if self._path is not None:
+                _, self._writer = await asyncio.open_unix_connection(os.fspath(self._path))
+            else:
+                _, self._writer = await asyncio.open_connection(self._host, self._port)
+
+        try:
+            self._writer.write(b''.join(records))
+            await self._writer.drain()
+        except BaseException:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        writer, self._writer = self._writer, None
+
+        if writer is not None:
+            writer.close()
+
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+
+class WebhookSink(sink.Sink):
+    """Sink posting batches of records to an HTTP webhook as NDJSON.
+
+    Parameters
+    ----------
+    url : builtins.str
+        URL of the webhook.
+    headers : typing.Optional[typing.Mapping[builtins.str, builtins.str]]
+        Additional headers to send, e.g. for authorization.
+    timeout : builtins.float
+        Seconds to wait for the webhook to respond. Defaults to `10`.
+    """
+
+    __slots__: typing.Sequence[str] = ('_url', '_headers', '_timeout', '_session')
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        headers: typing.Optional[typing.Mapping[str, str]] = None,
+        timeout: float = 10.0
+    ) -> None:
+        self._url = url
+        self._headers = {'Content-Type': 'application/x-ndjson', **(headers or {})}
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session: typing.Optional[aiohttp.ClientSession] = None
+
+    @property
+    def name(self) -> str:
+        return f'webhook:{self._url}'
+
+    async def write(self, records: typing.Sequence[bytes]) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(timeout=self._timeout)
+
+        async with self._session.post(self._url, data=b''.join(records), headers=self._headers) as response:
+            response.raise_for_status()
+
+    async def close(self) -> None:
+        session, self._session = self._session, None
+
+        if session is not None:
+            await session.close()
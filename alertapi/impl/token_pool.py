@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Implementation of a pool of access tokens shared between requests."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('TokenPool', 'TokenLease', 'TokenStats')
+
+import time
+import typing
+
+import attr
+
+from alertapi import errors
+
+_UNAUTHORIZED_STATUSES: typing.Final[typing.FrozenSet[int]] = frozenset((401, 403))
+_TOO_MANY_REQUESTS: typing.Final[int] = 429
+
+EJECTING_STATUSES: typing.Final[typing.FrozenSet[int]] = _UNAUTHORIZED_STATUSES | {_TOO_MANY_REQUESTS}
+"""Response statuses which eject the token from the pool."""
+
+
+def _mask_token(token: str) -> str:
+    return token[:4] + '*' * max(len(token) - 4, 0)
+
+
+def _parse_number(value: typing.Optional[str]) -> typing.Optional[float]:
+    if value is None:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+@attr.define(slots=True, frozen=True)
+class TokenStats:
+    """Usage statistics of a single access token.
+
+    Attributes
+    ----------
+    token : builtins.str
+        The access token with all but the first 4 characters masked.
+    requests : builtins.int
+        Number of requests made with the token.
+    in_flight : builtins.int
+        Number of requests currently using the token.
+    throttled : builtins.int
+        Number of responses with 429 status code.
+    failures : builtins.int
+        Number of requests which failed without a response.
+    remaining : typing.Optional[builtins.int]
+        Remaining request quota reported by the API, if it was reported.
+    ejected_for : builtins.float
+        Seconds until the token returns to the pool, `0` if it is available.
+    invalid : builtins.bool
+        Whether the token was rejected as unauthorized.
+    utilization : builtins.float
+        Share of all requests of the pool made with the token.
+    """
+
+    token: str = attr.field()
+    requests: int = attr.field()
+    in_flight: int = attr.field()
+    throttled: int = attr.field()
+    failures: int = attr.field()
+    remaining: typing.Optional[int] = attr.field()
+    ejected_for: float = attr.field()
+    invalid: bool = attr.field()
+    utilization: float = attr.field()
+
+
+@attr.define(slots=True, eq=False)
+class _TokenState:
+    token: str = attr.field()
+    requests: int = attr.field(default=0)
+    in_flight: int = attr.field(default=0)
+    throttled: int = attr.field(default=0)
+    failures: int = attr.field(default=0)
+    remaining: typing.Optional[int] = attr.field(default=None)
+    ejected_until: float = attr.field(default=0.0)
+    invalid: bool = attr.field(default=False)
+    auth_failures: int = attr.field(default=0)
+
+
+class TokenLease:
+    """A token acquired from a `TokenPool` for a single request.
+
+    The lease must be released with the outcome of the request, either
+    explicitly or by using it as a context manager.
+    """
+
+    __slots__: typing.Sequence[str] = ('_pool', '_state', '_released')
+
+    def __init__(self, pool: TokenPool, state: _TokenState) -> None:
+        self._pool = pool
+        self._state = state
+        self._released = False
+
+    @property
+    def token(self) -> str:
+        return self._state.token
+
+    def release(
+        self,
+        status: typing.Optional[int] = None,
+        headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> None:
+        """Release the token and record the outcome of the request.
+
+        Parameters
+        ----------
+        status : typing.Optional[builtins.int]
+            HTTP status code of the response.
+            `builtins.None` if the request failed without a response.
+        headers : typing.Optional[typing.Mapping[builtins.str, builtins.str]]
+            Headers of the response.
+        """
+        if self._released:
+            return
+
+        self._released = True
+        self._pool._release(self._state, status, headers or {})
+
+    def discard(self) -> None:
+        """Release the token without recording any outcome.
+
+        Used for requests that were cancelled before they finished.
+        """
+        if self._released:
+            return
+
+        self._released = True
+        self._state.in_flight -= 1
+        self._state.requests -= 1
+
+    def __enter__(self) -> TokenLease:
+        return self
+
+    def __exit__(self, *_: typing.Any) -> None:
+        self.release()
+
+
+class TokenPool:
+    """Pool of access tokens that spreads requests between them.
+
+    Each request takes the available token with the fewest requests in
+    flight, preferring tokens with more remaining quota. Tokens answered
+    with 429 are ejected for the `Retry-After` period. A token rejected as
+    unauthorized `invalid_threshold` times in a row is ejected for
+    `invalid_cooldown` seconds, unless no other token is available, since
+    a single mirror may reject a valid token.
+
+    Parameters
+    ----------
+    tokens : typing.Iterable[builtins.str]
+        Access tokens to the Air Raid Alert API.
+    throttle_cooldown : builtins.float
+        Seconds to eject a throttled token for if the API did not send
+        a `Retry-After` header. Defaults to 60.
+    invalid_threshold : builtins.int
+        Number of unauthorized responses in a row to eject a token after.
+        Defaults to 3.
+    invalid_cooldown : builtins.float
+        Seconds to eject an unauthorized token for. Defaults to 5 minutes.
+
+    Example
+    -------
+    .. code-block:: python
+
+        pool = alertapi.impl.TokenPool(['key-1', 'key-2', 'key-3'])
+        client = alertapi.APIClient(access_token=pool)
+        ...
+        for stats in pool.stats():
+            print(stats.token, stats.utilization)
+    """
+
+    __slots__: typing.Sequence[str] = ('_tokens', '_throttle_cooldown', '_invalid_threshold', '_invalid_cooldown')
+
+    def __init__(
+        self,
+        tokens: typing.Iterable[str],
+        *,
+        throttle_cooldown: float = 60.0,
+        invalid_threshold: int = 3,
+        invalid_cooldown: float = 300.0
+    ) -> None:
+        self._tokens = [_TokenState(token) for token in dict.fromkeys(tokens)]
+        self._throttle_cooldown = throttle_cooldown
+        self._invalid_threshold = invalid_threshold
+        self._invalid_cooldown = invalid_cooldown
+
+        if not self._tokens:
+            raise ValueError('Token pool requires at least one token')
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    @property
+    def tokens(self) -> typing.Sequence[str]:
+        return tuple(state.token for state in self._tokens)
+
+    def _select(self) -> _TokenState:
+        now = time.monotonic()
+        best: typing.Optional[_TokenState] = None
+        best_key: typing.Optional[typing.Tuple[float, ...]] = None
+
+        for state in self._tokens:
+            if state.ejected_until > now:
+                continue
+
+            remaining = state.remaining if state.remaining is not None else float('inf')
+            key = (state.in_flight, -remaining, state.requests)
+
+            if best_key is None or key < best_key:
+                best, best_key = state, key
+
+        if best is None:
+            retry_after = min(state.ejected_until for state in self._tokens) - now
+            raise errors.TokensExhausted(f'All {len(self._tokens)} tokens are ejected from the pool.', retry_after)
+        return best
+
+    def select(self) -> str:
+        """Return the token the next request would use, without acquiring it.
+
+        Returns
+        -------
+        builtins.str
+            The access token.
+
+        Raises
+        ------
+        alertapi.errors.TokensExhausted
+            If every token is ejected.
+        """
+        return self._select().token
+
+    def acquire(self) -> TokenLease:
+        """Acquire a token for a request.
+
+        Returns
+        -------
+        TokenLease
+            The lease of the token, which must be released once the request
+            is finished.
+
+        Raises
+        ------
+        alertapi.errors.TokensExhausted
+            If every token is ejected.
+        """
+        state = self._select()
+        state.in_flight += 1
+        state.requests += 1
+        return TokenLease(self, state)
+
+    def _release(self, state: _TokenState, status: typing.Optional[int], headers: typing.Mapping[str, str]) -> None:
+        state.in_flight -= 1
+
+        if status is None:
+            state.failures += 1
+            return
+
+        remaining = _parse_number(headers.get('X-RateLimit-Remaining'))
+        if remaining is not None:
+            state.remaining = int(remaining)
+
+        if status == _TOO_MANY_REQUESTS:
+            state.throttled += 1
+            retry_after = _parse_number(headers.get('Retry-After'))
+            cooldown = retry_after if retry_after is not None else self._throttle_cooldown
+            state.ejected_until = time.monotonic() + cooldown
+        elif status in _UNAUTHORIZED_STATUSES:
+            state.invalid = True
+            state.auth_failures += 1
+            now = time.monotonic()
+
+            # The last available token is kept, so requests fail with the API error instead of TokensExhausted.
+            if state.auth_failures >= self._invalid_threshold and any(
+                other is not state and other.ejected_until <= now for other in self._tokens
+            ):
+                state.ejected_until = now + self._invalid_cooldown
+                state.auth_failures = 0
+        else:
+            state.invalid = False
+            state.auth_failures = 0
+
+    def stats(self) -> typing.Sequence[TokenStats]:
+        """Return usage statistics of every token in the pool.
+
+        Returns
+        -------
+        typing.Sequence[TokenStats]
+            Statistics of the tokens, in the order they were given.
+        """
+        now = time.monotonic()
+        total = sum(state.requests for state in self._tokens) or 1
+
+        return tuple(
+            TokenStats(
+                token=_mask_token(state.token),
+                requests=state.requests,
+                in_flight=state.in_flight,
+                throttled=state.throttled,
+                failures=state.failures,
+                remaining=state.remaining,
+                ejected_for=max(state.ejected_until - now, 0.0),
+                invalid=state.invalid,
+                utilization=state.requests / total
+            )
+            for state in self._tokens
+        )
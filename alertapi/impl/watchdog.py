@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Detection of silently dead event streams from the pings of Alert API."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('HeartbeatWatchdog', 'HeartbeatStats')
+
+import asyncio
+import time
+import typing
+
+import attr
+
+_JITTER_GAIN: typing.Final[float] = 1 / 16
+"""Gain of the interarrival jitter estimate, as in RFC 3550."""
+
+
+@attr.define(slots=True, frozen=True)
+class HeartbeatStats:
+    """Health statistics of an event stream.
+
+    Attributes
+    ----------
+    pings : builtins.int
+        Number of pings received.
+    mean_interval : builtins.float
+        Mean seconds between consecutive pings.
+    max_interval : builtins.float
+        Longest seconds between consecutive pings.
+    jitter : builtins.float
+        Smoothed variation of the seconds between consecutive pings,
+        a measure of how unsteady the link delay is.
+    silence : builtins.float
+        Seconds since the last event of any type.
+    stale : builtins.bool
+        Whether the stream is considered dead.
+    stale_streams : builtins.int
+        Number of streams which were declared stale.
+    """
+
+    pings: int = attr.field()
+    mean_interval: float = attr.field()
+    max_interval: float = attr.field()
+    jitter: float = attr.field()
+    silence: float = attr.field()
+    stale: bool = attr.field()
+    stale_streams: int = attr.field()
+
+
+class HeartbeatWatchdog:
+    """Track pings of an event stream and tell when the stream has died.
+
+    Alert API sends a ping about every 5 seconds. When no event arrives for
+    `missed_pings` ping intervals, the stream is considered stale, e.g.
+    because a half-open connection will never deliver anything again.
+
+    Parameters
+    ----------
+    interval : builtins.float
+        Expected seconds between pings. Defaults to `5`.
+    missed_pings : builtins.int
+        Number of missed pings after which the stream is stale. Defaults to `3`.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_interval',
+        '_missed_pings',
+        '_last_seen',
+        '_last_ping',
+        '_last_ping_interval',
+        '_pings',
+        '_intervals',
+        '_total_interval',
+        '_max_interval',
+        '_jitter',
+        '_stale_streams'
+    )
+
+    def __init__(self, interval: float = 5.0, missed_pings: int = 3) -> None:
+        if interval <= 0 or missed_pings < 1:
+            raise ValueError('Ping interval and number of missed pings must be positive')
+
+        self._interval = interval
+        self._missed_pings = missed_pings
+        self._last_seen = time.monotonic()
+        self._last_ping: typing.Optional[float] = None
+        self._last_ping_interval: typing.Optional[float] = None
+        self._pings = 0
+        self._intervals = 0
+        self._total_interval = 0.0
+        self._max_interval = 0.0
+        self._jitter = 0.0
+        self._stale_streams = 0
+
+    @property
+    def timeout(self) -> float:
+        """Seconds without events after which the stream is stale."""
+        return self._interval * self._missed_pings
+
+    def reset(self) -> None:
+        """Start watching a new stream."""
+        self._last_seen = time.monotonic()
+        self._last_ping = None
+        self._last_ping_interval = None
+
+    def feed(self) -> None:
+        """Record that an event arrived."""
+        self._last_seen = time.monotonic()
+
+    def ping(self) -> None:
+        """Record that a ping arrived."""
+        now = self._last_seen = time.monotonic()
+
+        if self._last_ping is not None:
+            interval = now - self._last_ping
+            self._intervals += 1
+            self._total_interval += interval
+            self._max_interval = max(self._max_interval, interval)
+
+            if self._last_ping_interval is not None:
+                self._jitter += (abs(interval - self._last_ping_interval) - self._jitter) * _JITTER_GAIN
+            self._last_ping_interval = interval
+
+        self._last_ping = now
+        self._pings += 1
+
+    def is_stale(self) -> bool:
+        """Whether no event arrived for too long."""
+        return time.monotonic() - self._last_seen >= self.timeout
+
+    async def wait_stale(self) -> None:
+        """Wait until the stream becomes stale."""
+        while (remaining := self._last_seen + self.timeout - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+
+        self._stale_streams += 1
+
+    def stats(self) -> HeartbeatStats:
+        """Return health statistics of the stream.
+
+        Returns
+        -------
+        HeartbeatStats
+            Statistics of the stream.
+        """
+        return HeartbeatStats(
+            pings=self._pings,
+            mean_interval=self._total_interval / self._intervals if self._intervals else 0.0,
+            max_interval=self._max_interval,
+            jitter=self._jitter,
+            silence=time.monotonic() - self._last_seen,
+            stale=self.is_stale(),
+            stale_streams=self._stale_streams
+        )
@@ -19,9 +19,60 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-"""Package containing internal utilities used within this API."""
+"""Package containing internal utilities used within this API.
 
-from alertapi.internal.data_binding import *
-from alertapi.internal.routes import *
-from alertapi.internal.converters import *
-from alertapi.internal.aio import *
+Utilities are imported lazily on first attribute access.
+"""
+
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from alertapi.internal.data_binding import *
+    from alertapi.internal.routes import *
+    from alertapi.internal.converters import *
+    from alertapi.internal.aio import *
+    from alertapi.internal.bitmask import *
+    from alertapi.internal.time import *
+    from alertapi.internal.sse import *
+    from alertapi.internal.histogram import *
+    from alertapi.internal.geometry import *
+
+_LAZY_ATTRIBUTES: typing.Final[typing.Mapping[str, str]] = {
+    'JSONObject': 'alertapi.internal.data_binding',
+    'CompiledRoute': 'alertapi.internal.routes',
+    'Route': 'alertapi.internal.routes',
+    'StateConverter': 'alertapi.internal.converters',
+    'normalize_name': 'alertapi.internal.converters',
+    'completed_future': 'alertapi.internal.aio',
+    'state_bit': 'alertapi.internal.bitmask',
+    'alert_mask': 'alertapi.internal.bitmask',
+    'mask_ids': 'alertapi.internal.bitmask',
+    'iso8601_datetime_string_to_datetime': 'alertapi.internal.time',
+    'iso8601_datetime_string_to_epoch': 'alertapi.internal.time',
+    'SSEParser': 'alertapi.internal.sse',
+    'LatencyHistogram': 'alertapi.internal.histogram',
+    'DEFAULT_BUCKETS': 'alertapi.internal.histogram',
+    'WIDTH': 'alertapi.internal.geometry',
+    'HEIGHT': 'alertapi.internal.geometry',
+    'POLYGONS': 'alertapi.internal.geometry',
+    'KYIV_CENTER': 'alertapi.internal.geometry',
+    'KYIV_RADIUS': 'alertapi.internal.geometry',
+}
+"""Attributes imported on first access mapped to the module they live in."""
+
+__all__: typing.Sequence[str] = tuple(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        module = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+
+    value = globals()[name] = getattr(importlib.import_module(module), name)
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *_LAZY_ATTRIBUTES})
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Helpers for packing the alert status of all states into a single integer."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('state_bit', 'alert_mask', 'mask_ids')
+
+import typing
+
+from alertapi import snowflakes
+
+if typing.TYPE_CHECKING:
+    from alertapi import states
+
+STATES_COUNT: typing.Final[int] = 25
+"""Number of states tracked by Air Raid Alert API."""
+
+FULL_MASK: typing.Final[int] = (1 << STATES_COUNT) - 1
+"""Mask with every state bit set."""
+
+
+def state_bit(state_id: int, /) -> int:
+    """Return the bit representing a state in an alert mask.
+
+    Parameters
+    ----------
+    state_id : builtins.int
+        Identificator of the state.
+
+    Returns
+    -------
+    builtins.int
+        The state bit.
+    """
+    return 1 << (state_id - 1)
+
+
+def alert_mask(states_: typing.Iterable[states.State], /) -> int:
+    """Pack the alert status of states into an alert mask.
+
+    Parameters
+    ----------
+    states_ : typing.Iterable[alertapi.states.State]
+        States to pack.
+
+    Returns
+    -------
+    builtins.int
+        Mask with the bit of every state with an active alert set.
+    """
+    mask = 0
+
+    for state in states_:
+        if state.alert:
+            mask |= 1 << (state.id - 1)
+    return mask
+
+
+def mask_ids(mask: int, /) -> typing.Iterator[snowflakes.Snowflake]:
+    """Iterate over identificators of states set in an alert mask.
+
+    Parameters
+    ----------
+    mask : builtins.int
+        The alert mask.
+
+    Yields
+    ------
+    alertapi.snowflakes.Snowflake
+        Identificators of states, in ascending order.
+    """
+    while mask:
+        low = mask & -mask
+        yield snowflakes.Snowflake(low.bit_length())
+        mask ^= low
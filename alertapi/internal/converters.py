@@ -23,9 +23,12 @@
 
 from __future__ import annotations
 
-__all__: typing.Sequence[str] = ('StateConverter',)
+__all__: typing.Sequence[str] = ('StateConverter', 'normalize_name')
 
+import bisect
+import re
 import typing
+import unicodedata
 
 from alertapi import snowflakes
 from alertapi import errors
@@ -64,6 +67,66 @@ class StateConverter:
         'Kyiv': snowflakes.Snowflake(25)
     }
 
+    NAMES: typing.Final[dict[snowflakes.Snowflake, str]] = {
+        snowflakes.Snowflake(1): 'Вінницька область',
+        snowflakes.Snowflake(2): 'Волинська область',
+        snowflakes.Snowflake(3): 'Дніпропетровська область',
+        snowflakes.Snowflake(4): 'Донецька область',
+        snowflakes.Snowflake(5): 'Житомирська область',
+        snowflakes.Snowflake(6): 'Закарпатська область',
+        snowflakes.Snowflake(7): 'Запорізька область',
+        snowflakes.Snowflake(8): 'Івано-Франківська область',
+        snowflakes.Snowflake(9): 'Київська область',
+        snowflakes.Snowflake(10): 'Кіровоградська область',
+        snowflakes.Snowflake(11): 'Луганська область',
+        snowflakes.Snowflake(12): 'Львівська область',
+        snowflakes.Snowflake(13): 'Миколаївська область',
+        snowflakes.Snowflake(14): 'Одеська область',
+        snowflakes.Snowflake(15): 'Полтавська область',
+        snowflakes.Snowflake(16): 'Рівненська область',
+        snowflakes.Snowflake(17): 'Сумська область',
+        snowflakes.Snowflake(18): 'Тернопільська область',
+        snowflakes.Snowflake(19): 'Харківська область',
+        snowflakes.Snowflake(20): 'Херсонська область',
+        snowflakes.Snowflake(21): 'Хмельницька область',
+        snowflakes.Snowflake(22): 'Черкаська область',
+        snowflakes.Snowflake(23): 'Чернівецька область',
+        snowflakes.Snowflake(24): 'Чернігівська область',
+        snowflakes.Snowflake(25): 'м. Київ'
+    }
+    """Ukrainian state names as returned in the `name` field by Alert API."""
+
+    ALIASES: typing.Final[dict[snowflakes.Snowflake, tuple[str, ...]]] = {
+        snowflakes.Snowflake(1): ('Vinnytsya', 'Vinnitsa', 'Вінниця', 'Вінниччина'),
+        snowflakes.Snowflake(2): ('Volhynia', 'Волинь'),
+        snowflakes.Snowflake(3): ('Dnipro', 'Dnepropetrovsk', 'Дніпро', 'Дніпропетровськ', 'Дніпропетровщина'),
+        snowflakes.Snowflake(4): ('Донецьк', 'Донеччина'),
+        snowflakes.Snowflake(5): ('Zhitomir', 'Житомир', 'Житомирщина'),
+        snowflakes.Snowflake(6): ('Zakarpattya', 'Transcarpathia', 'Закарпаття'),
+        snowflakes.Snowflake(7): ('Zaporizhia', 'Zaporozhye', 'Zaporizhzhya', 'Запоріжжя', 'Запоріжчина'),
+        snowflakes.Snowflake(8): ('Ivano-Frankovsk', 'Івано-Франківськ', 'Прикарпаття'),
+        snowflakes.Snowflake(9): ('Kiev oblast', 'Kyiv region', 'Київщина'),
+        snowflakes.Snowflake(10): (
+            'Kirovograd', 'Kropyvnytskyi', 'Kropyvnytskyy', 'Кропивницький', 'Кіровоград', 'Кіровоградщина'
+        ),
+        snowflakes.Snowflake(11): ('Lugansk', 'Луганськ', 'Луганщина'),
+        snowflakes.Snowflake(12): ('Lvov', 'Lwow', 'Львів', 'Львівщина'),
+        snowflakes.Snowflake(13): ('Nikolaev', 'Nikolayev', 'Миколаїв', 'Миколаївщина'),
+        snowflakes.Snowflake(14): ('Odessa', 'Одеса', 'Одещина'),
+        snowflakes.Snowflake(15): ('Полтава', 'Полтавщина'),
+        snowflakes.Snowflake(16): ('Rovno', 'Рівне', 'Рівненщина'),
+        snowflakes.Snowflake(17): ('Суми', 'Сумщина'),
+        snowflakes.Snowflake(18): ('Ternopol', 'Тернопіль', 'Тернопільщина'),
+        snowflakes.Snowflake(19): ('Kharkov', 'Харків', 'Харківщина'),
+        snowflakes.Snowflake(20): ('Херсон', 'Херсонщина'),
+        snowflakes.Snowflake(21): ('Khmelnytskyy', 'Khmelnitsky', 'Khmelnytsky', 'Хмельницький', 'Хмельниччина'),
+        snowflakes.Snowflake(22): ('Cherkassy', 'Черкаси', 'Черкащина'),
+        snowflakes.Snowflake(23): ('Chernovtsy', 'Bukovina', 'Чернівці', 'Буковина'),
+        snowflakes.Snowflake(24): ('Chernigov', 'Чернігів', 'Чернігівщина'),
+        snowflakes.Snowflake(25): ('Kiev', 'Kyiv city', 'Kiev city', 'Київ', 'місто Київ')
+    }
+    """Common transliterations and short forms of state names."""
+
     def convert(self, state: str) -> snowflakes.Snowflake:
         """Convert name variation of state to his identificator.
 
@@ -72,12 +135,144 @@ class StateConverter:
         state : builtins.str
             Name of state.
 
+        The name is matched case-insensitively in English or Ukrainian,
+        with or without the "oblast" suffix and in common transliterations,
+        e.g. `'Lviv oblast'`, `'lviv'`, `'Lvov'`, `'Lvivska'` or `'Львівська'`.
+
         Returns
         -------
         alertapi.snowflakes.Snowflake
             Snowflake representation of state.
+
+        Raises
+        ------
+        alertapi.errors.StateNotFound
+            * If specified state does not exists.
         """
         try:
             return StateConverter.STATES[state]
         except KeyError:
-            raise errors.StateNotFound(f'State with name {state!r} does not exists.')
+            pass
+
+        key = normalize_name(state)
+
+        try:
+            return _INDEX[key]
+        except KeyError:
+            pass
+
+        try:
+            return _INDEX[_strip_suffix(key)]
+        except KeyError:
+            raise errors.StateNotFound(f'State with name {state!r} does not exists.') from None
+
+    def search(self, prefix: str, limit: typing.Optional[int] = None) -> tuple[str, ...]:
+        """Search states which have a name variation starting with the prefix.
+
+        Parameters
+        ----------
+        prefix : builtins.str
+            Beginning of the state name in any supported variation.
+        limit : typing.Optional[builtins.int]
+            Maximum number of results. Unlimited by default.
+
+        Returns
+        -------
+        builtins.tuple[builtins.str]
+            Canonical English names of matched states, as accepted by
+            `StateConverter.convert`, in alphabetical order of the matched
+            variations.
+        """
+        key = normalize_name(prefix)
+        found: typing.Dict[str, None] = {}
+
+        for position in range(bisect.bisect_left(_SORTED_KEYS, key), len(_SORTED_KEYS)):
+            if not _SORTED_KEYS[position].startswith(key) or len(found) == limit:
+                break
+
+            found.setdefault(_CANONICAL_NAMES[_INDEX[_SORTED_KEYS[position]]])
+        return tuple(found)
+
+
+_APOSTROPHES: typing.Final[dict[int, None]] = str.maketrans('', '', "'`\u2019\u02bc")
+_SEPARATORS: typing.Final[typing.Pattern[str]] = re.compile(r'[\s.,_-]+')
+_SUFFIXES: typing.Final[typing.Pattern[str]] = re.compile(r' (oblast|obl|region|область|обл)$')
+# The official Ukrainian transliteration, where the letters in `_INITIAL_LETTERS`
+# are spelled differently at the beginning of a word.
+_LETTERS: typing.Final[dict[str, str]] = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'h', 'ґ': 'g', 'д': 'd', 'е': 'e', 'є': 'ie', 'ж': 'zh', 'з': 'z',
+    'и': 'y', 'і': 'i', 'ї': 'i', 'й': 'i', 'к': 'k', 'л': 'l', 'м': 'm', 'н': 'n', 'о': 'o', 'п': 'p',
+    'р': 'r', 'с': 's', 'т': 't', 'у': 'u', 'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh',
+    'щ': 'shch', 'ь': '', 'ю': 'iu', 'я': 'ia', "'": '', '\u2019': '', '\u02bc': ''
+}
+_INITIAL_LETTERS: typing.Final[dict[str, str]] = {'є': 'ye', 'ї': 'yi', 'й': 'y', 'ю': 'yu', 'я': 'ya'}
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a state name variation for lookups.
+
+    Parameters
+    ----------
+    name : builtins.str
+        The state name.
+
+    Returns
+    -------
+    builtins.str
+        Case-folded name with apostrophes removed and hyphens, dots
+        and repeated whitespace collapsed into single spaces.
+    """
+    name = unicodedata.normalize('NFKC', name).casefold().translate(_APOSTROPHES)
+    return _SEPARATORS.sub(' ', name).strip()
+
+
+def _strip_suffix(key: str) -> str:
+    return _SUFFIXES.sub('', key)
+
+
+def _transliterate(name: str) -> str:
+    letters: list[str] = []
+    previous = ' '
+
+    for letter in name.casefold():
+        if letter in _INITIAL_LETTERS and not (previous.isalpha() or previous in _LETTERS):
+            letters.append(_INITIAL_LETTERS[letter])
+        elif letter == 'г' and previous == 'з':
+            # "зг" is spelled "zgh", to tell it apart from "ж".
+            letters.append('gh')
+        else:
+            letters.append(_LETTERS.get(letter, letter))
+        previous = letter
+    return ''.join(letters)
+
+
+def _build_index() -> dict[str, snowflakes.Snowflake]:
+    variations: dict[snowflakes.Snowflake, list[str]] = {state_id: [] for state_id in StateConverter.STATES.values()}
+
+    for name, state_id in StateConverter.STATES.items():
+        variations[state_id].append(name)
+    for state_id, name in StateConverter.NAMES.items():
+        # Transliterated adjectives, e.g. 'Kyivska oblast' for 'Київська область'.
+        variations[state_id].extend((name, _transliterate(name)))
+    for state_id, aliases in StateConverter.ALIASES.items():
+        variations[state_id].extend(aliases)
+
+    index: dict[str, snowflakes.Snowflake] = {}
+
+    for state_id, names in variations.items():
+        for name in names:
+            index[normalize_name(name)] = state_id
+
+    # Short forms never shadow a full name, so 'Kyiv' stays the city
+    # rather than 'Kyiv oblast' with its suffix dropped.
+    for state_id, names in variations.items():
+        for name in names:
+            index.setdefault(_strip_suffix(normalize_name(name)), state_id)
+    return index
+
+
+_INDEX: typing.Final[dict[str, snowflakes.Snowflake]] = _build_index()
+_SORTED_KEYS: typing.Final[list[str]] = sorted(_INDEX)
+_CANONICAL_NAMES: typing.Final[dict[snowflakes.Snowflake, str]] = {
+    state_id: name for name, state_id in StateConverter.STATES.items()
+}
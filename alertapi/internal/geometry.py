@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Bundled simplified geometry of the states used for local map rendering.
+
+Coordinates are equirectangular projections of longitude and latitude
+scaled to a `WIDTH` x `HEIGHT` canvas with the origin in the top-left corner.
+"""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('WIDTH', 'HEIGHT', 'POLYGONS', 'KYIV_CENTER', 'KYIV_RADIUS')
+
+import typing
+
+
+Point = typing.Tuple[int, int]
+"""Type hint for a point on the canvas."""
+
+WIDTH: typing.Final[int] = 1193
+"""Width of the canvas the geometry is defined on."""
+
+HEIGHT: typing.Final[int] = 721
+"""Height of the canvas the geometry is defined on."""
+
+KYIV_CENTER: typing.Final[Point] = (561, 205)
+"""Center of Kyiv, which is drawn as a circle on top of Kyiv oblast."""
+
+KYIV_RADIUS: typing.Final[int] = 14
+"""Radius of the circle Kyiv is drawn as."""
+
+POLYGONS: typing.Final[typing.Mapping[int, typing.Tuple[typing.Tuple[Point, ...], ...]]] = {
+    1: (
+        ((388, 401), (374, 335), (388, 299), (467, 285), (504, 334), (502, 347), (523, 411), (462, 445),
+         (435, 430), (395, 420), (385, 416)),
+    ),
+    2: (
+        ((112, 102), (109, 95), (158, 60), (222, 58), (243, 144), (227, 178), (227, 226), (194, 242), (105, 203),
+         (138, 165)),
+    ),
+    3: (
+        ((767, 395), (767, 362), (773, 356), (845, 330), (870, 330), (886, 341), (889, 344), (955, 378),
+         (958, 383), (958, 454), (949, 469), (838, 484), (826, 504), (804, 518), (727, 506), (709, 472)),
+    ),
+    4: (
+        ((1092, 485), (1089, 486), (1074, 490), (1067, 540), (1021, 545), (996, 562), (950, 480), (949, 469),
+         (958, 454), (958, 383), (1020, 376), (1069, 338), (1114, 390), (1089, 444)),
+    ),
+    5: (
+        ((373, 89), (428, 94), (479, 110), (488, 212), (484, 217), (467, 285), (388, 299), (372, 275), (372, 196),
+         (356, 172), (356, 132)),
+    ),
+    6: (
+        ((154, 462), (132, 455), (72, 440), (59, 455), (43, 440), (10, 410), (40, 345), (40, 332), (78, 364),
+         (121, 376)),
+    ),
+    7: (
+        ((826, 504), (838, 484), (949, 469), (950, 480), (996, 562), (975, 575), (916, 585), (906, 590),
+         (870, 610), (862, 618), (806, 544), (804, 518)),
+    ),
+    8: (
+        ((174, 469), (154, 462), (121, 376), (151, 321), (176, 309), (205, 339), (217, 386)),
+    ),
+    9: (
+        ((479, 110), (481, 110), (540, 105), (563, 125), (566, 115), (616, 166), (621, 166), (640, 178),
+         (673, 225), (626, 282), (582, 288), (563, 313), (504, 334), (467, 285), (484, 217), (488, 212)),
+    ),
+    10: (
+        ((629, 372), (661, 352), (680, 354), (690, 351), (767, 362), (767, 395), (709, 472), (691, 462),
+         (669, 461), (635, 432), (555, 442), (544, 424), (606, 370)),
+    ),
+    11: (
+        ((1093, 260), (1133, 260), (1192, 290), (1172, 370), (1173, 373), (1179, 420), (1166, 465), (1092, 485),
+         (1089, 444), (1114, 390), (1069, 338)),
+    ),
+    12: (
+        ((56, 276), (99, 210), (105, 203), (194, 242), (176, 309), (151, 321), (121, 376), (78, 364), (40, 332),
+         (43, 295)),
+    ),
+    13: (
+        ((632, 585), (595, 539), (596, 514), (556, 455), (555, 442), (635, 432), (669, 461), (691, 462),
+         (709, 472), (727, 506), (715, 527)),
+    ),
+    14: (
+        ((516, 558), (501, 520), (497, 513), (474, 470), (474, 452), (462, 445), (523, 411), (544, 424),
+         (555, 442), (556, 455), (596, 514), (595, 539), (632, 585), (632, 600), (626, 590), (576, 605),
+         (549, 651), (540, 665), (507, 720), (454, 720), (408, 705), (428, 650), (454, 600), (507, 608),
+         (520, 610), (534, 605), (520, 570)),
+    ),
+    15: (
+        ((845, 330), (773, 356), (767, 362), (690, 351), (711, 236), (732, 234), (759, 219), (761, 219),
+         (768, 216), (870, 239), (870, 330)),
+    ),
+    16: (
+        ((356, 132), (356, 172), (258, 237), (227, 226), (227, 178), (243, 144), (222, 58), (230, 58), (296, 72),
+         (362, 88), (373, 89)),
+    ),
+    17: (
+        ((808, 106), (817, 125), (841, 149), (883, 190), (901, 197), (870, 239), (768, 216), (761, 219),
+         (759, 219), (748, 133), (725, 115), (697, 19), (738, 14), (797, 80)),
+    ),
+    18: (
+        ((194, 242), (227, 226), (258, 237), (278, 265), (281, 317), (293, 335), (281, 380), (217, 386),
+         (205, 339), (176, 309)),
+    ),
+    19: (
+        ((985, 210), (1014, 210), (1025, 224), (1054, 260), (1093, 260), (1069, 338), (1020, 376), (958, 383),
+         (955, 378), (889, 344), (886, 341), (870, 330), (870, 239), (901, 197), (935, 210)),
+    ),
+    20: (
+        ((765, 640), (764, 640), (748, 640), (718, 640), (692, 645), (646, 620), (632, 600), (632, 585),
+         (715, 527), (727, 506), (804, 518), (806, 544), (862, 618), (850, 630), (790, 640)),
+    ),
+    21: (
+        ((372, 275), (388, 299), (374, 335), (388, 401), (385, 416), (362, 405), (311, 423), (281, 380),
+         (293, 335), (281, 317), (278, 265), (258, 237), (356, 172), (372, 196)),
+    ),
+    22: (
+        ((661, 352), (629, 372), (606, 370), (544, 424), (523, 411), (502, 347), (504, 334), (563, 313),
+         (582, 288), (626, 282), (673, 225), (711, 236), (690, 351), (680, 354)),
+    ),
+    23: (
+        ((311, 423), (306, 425), (257, 455), (191, 475), (174, 469), (217, 386), (281, 380)),
+    ),
+    24: (
+        ((675, 25), (685, 20), (697, 19), (725, 115), (748, 133), (759, 219), (732, 234), (711, 236), (673, 225),
+         (640, 178), (621, 166), (616, 166), (566, 115), (590, 45), (646, 40)),
+    ),
+}
+"""Polygons of every oblast keyed by the state id. Kyiv is described by `KYIV_CENTER`."""
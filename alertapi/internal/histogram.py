@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Fixed-bucket histograms of latencies."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('LatencyHistogram', 'DEFAULT_BUCKETS')
+
+import bisect
+import typing
+
+DEFAULT_BUCKETS: typing.Final[typing.Sequence[float]] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+"""Upper bounds of buckets in seconds, as the defaults of Prometheus clients."""
+
+
+class LatencyHistogram:
+    """Count of observed latencies per bucket.
+
+    Observing takes a bisect and an increment, so histograms can be
+    updated on every request or event.
+
+    Parameters
+    ----------
+    buckets : typing.Sequence[builtins.float]
+        Ascending upper bounds of the buckets in seconds.
+        Defaults to `DEFAULT_BUCKETS`.
+    """
+
+    __slots__: typing.Sequence[str] = ('_bounds', '_counts', '_sum')
+
+    def __init__(self, buckets: typing.Sequence[float] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(set(buckets)):
+            raise ValueError('Buckets must be unique and ascending')
+
+        self._bounds = tuple(buckets)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+
+    @property
+    def count(self) -> int:
+        """Number of observed latencies."""
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        """Sum of observed latencies in seconds."""
+        return self._sum
+
+    def observe(self, latency: float) -> None:
+        """Add a latency.
+
+        Parameters
+        ----------
+        latency : builtins.float
+            The latency in seconds.
+        """
+        self._counts[bisect.bisect_left(self._bounds, latency)] += 1
+        self._sum += latency
+
+    def cumulative(self) -> typing.Sequence[tuple[float, int]]:
+        """Return the number of latencies up to every bucket bound.
+
+        Returns
+        -------
+        typing.Sequence[builtins.tuple[builtins.float, builtins.int]]
+            Upper bounds with the cumulative counts, ending with infinity.
+        """
+        total = 0
+        result = []
+
+        for bound, count in zip((*self._bounds, float('inf')), self._counts):
+            total += count
+            result.append((bound, total))
+        return tuple(result)
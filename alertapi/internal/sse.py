@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Incremental parser of server-sent event streams."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('SSEParser',)
+
+import typing
+
+_DEFAULT_EVENT_TYPE: typing.Final[str] = 'message'
+"""Type of events without an `event` field."""
+
+
+class SSEParser:
+    """Parse a `text/event-stream` body from chunks of bytes.
+
+    Lines are split from the chunks without decoding them, and only the
+    type and data of complete events are decoded. Line endings may be
+    `\\n`, `\\r\\n` or `\\r`, also when a chunk ends between `\\r` and `\\n`.
+    Invalid UTF-8 is decoded to replacement characters rather than raised.
+    """
+
+    __slots__: typing.Sequence[str] = ('_pending', '_event_type', '_data', '_event_id', '_last_event_id', '_retry')
+
+    def __init__(self) -> None:
+        self._pending = b''
+        self._event_type: typing.Optional[bytes] = None
+        self._data: list[bytes] = []
+        self._event_id = ''
+        self._last_event_id = ''
+        self._retry: typing.Optional[int] = None
+
+    @property
+    def last_event_id(self) -> str:
+        """Identificator of the last dispatched event, to resume the stream from.
+
+        An `id` field takes effect once its event is complete, so a
+        stream cut in the middle of an event resumes from that event.
+        """
+        return self._last_event_id
+
+    @property
+    def retry(self) -> typing.Optional[int]:
+        """Reconnection time in milliseconds requested by the server, if any."""
+        return self._retry
+
+    def feed(self, chunk: bytes) -> list[tuple[str, str]]:
+        """Parse the next chunk of the stream.
+
+        Parameters
+        ----------
+        chunk : builtins.bytes
+            The chunk.
+
+        Returns
+        -------
+        builtins.list[builtins.tuple[builtins.str, builtins.str]]
+            Type and data of every event completed by the chunk.
+        """
+        if self._pending:
+            chunk = self._pending + chunk
+
+        carry = b''
+
+        if b'\r' in chunk:
+            # A trailing CR may be the first half of CRLF, so it waits for the next chunk.
+            if chunk.endswith(b'\r'):
+                chunk, carry = chunk[:-1], b'\r'
+            chunk = chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+        lines = chunk.split(b'\n')
+        # The last element is an incomplete line, or empty after a line ending.
+        self._pending = lines.pop() + carry
+        events: list[tuple[str, str]] = []
+
+        for line in lines:
+            if not line:
+                self._last_event_id = self._event_id
+
+                if self._data:
+                    event_type = self._event_type
+                    events.append((
+                        event_type.decode('utf-8', 'replace') if event_type else _DEFAULT_EVENT_TYPE,
+                        b'\n'.join(self._data).decode('utf-8', 'replace')
+                    ))
+                    self._data = []
+                self._event_type = None
+                continue
+
+            if line[0] == 0x3A:  # ':' starts a comment
+                continue
+
+            field, _, value = line.partition(b':')
+
+            if value[:1] == b' ':
+                value = value[1:]
+
+            if field == b'data':
+                self._data.append(value)
+            elif field == b'event':
+                self._event_type = value
+            elif field == b'id':
+                if b'\0' not in value:
+                    self._event_id = value.decode('utf-8', 'replace')
+            elif field == b'retry':
+                if value.isdigit():
+                    self._retry = int(value)
+        return events
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Utility methods used for parsing timestamps.
+
+Alert API sends timestamps in the fixed `YYYY-MM-DDTHH:MM:SS+HH:MM` format,
+which is exactly the format `datetime.datetime.fromisoformat` parses in C,
+so it is used directly rather than a general ISO 8601 parser.
+"""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('iso8601_datetime_string_to_datetime', 'iso8601_datetime_string_to_epoch')
+
+import datetime
+import typing
+
+_UTC: typing.Final[datetime.timezone] = datetime.timezone.utc
+_fromisoformat: typing.Final = datetime.datetime.fromisoformat
+
+
+def iso8601_datetime_string_to_datetime(date_string: str, /) -> datetime.datetime:
+    """Parse an ISO 8601 date string into a timezone-aware datetime.
+
+    Timestamps without an offset are treated as UTC.
+
+    Parameters
+    ----------
+    date_string : builtins.str
+        The ISO 8601 date string.
+
+    Returns
+    -------
+    datetime.datetime
+        The parsed datetime.
+    """
+    if date_string[-1:] == 'Z':
+        date_string = date_string[:-1] + '+00:00'
+
+    value = _fromisoformat(date_string)
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=_UTC)
+    return value
+
+
+def iso8601_datetime_string_to_epoch(date_string: str, /) -> int:
+    """Parse an ISO 8601 date string into whole seconds since the Unix epoch.
+
+    Parameters
+    ----------
+    date_string : builtins.str
+        The ISO 8601 date string.
+
+    Returns
+    -------
+    builtins.int
+        Seconds since the Unix epoch.
+    """
+    return int(iso8601_datetime_string_to_datetime(date_string).timestamp())
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Local rendering of the alert map from state snapshots."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('MapRenderer',)
+
+import collections
+import math
+import struct
+import typing
+import zlib
+
+from alertapi.internal import bitmask
+from alertapi.internal import converters
+from alertapi.internal import geometry
+
+if typing.TYPE_CHECKING:
+    from alertapi import states
+
+_BACKGROUND: typing.Final[int] = 0
+_CALM: typing.Final[int] = 1
+_ALERT: typing.Final[int] = 2
+_BORDER: typing.Final[int] = 3
+
+_KYIV: typing.Final[int] = 25
+_CIRCLE_SEGMENTS: typing.Final[int] = 24
+
+_Edge = typing.Tuple[float, float, float, float]
+
+_PNG_SIGNATURE: typing.Final[bytes] = b'\x89PNG\r\n\x1a\n'
+
+
+def _parse_color(color: str) -> bytes:
+    value = color.lstrip('#')
+
+    if len(value) != 6:
+        raise ValueError(f'Color must be in #rrggbb format, not {color!r}')
+    return bytes.fromhex(value)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+def _kyiv_ring() -> typing.Tuple[geometry.Point, ...]:
+    x, y = geometry.KYIV_CENTER
+    step = 2 * math.pi / _CIRCLE_SEGMENTS
+
+    return tuple(
+        (x + geometry.KYIV_RADIUS * math.cos(i * step), y + geometry.KYIV_RADIUS * math.sin(i * step))
+        for i in range(_CIRCLE_SEGMENTS)
+    )
+
+
+class MapRenderer:
+    """Alert map renderer.
+
+    Renders the map of states from bundled simplified geometry, so it never
+    touches the network. Rendered images are memoized by the alert mask, so
+    every combination of alerts is rendered only once.
+
+    Parameters
+    ----------
+    width : builtins.int
+        Width of rendered images in pixels. The height is derived from it.
+    alert_color : builtins.str
+        Color of states with an active alert, in `#rrggbb` format.
+    calm_color : builtins.str
+        Color of states without an alert, in `#rrggbb` format.
+    border_color : builtins.str
+        Color of borders between states, in `#rrggbb` format.
+    cache_size : builtins.int
+        Maximum number of rendered images of each format kept in memory.
+
+    Example
+    -------
+    .. code-block:: python
+
+        renderer = alertapi.maps.MapRenderer(width=800)
+        states = await client.fetch_states()
+
+        with open('map.png', 'wb') as fp:
+            fp.write(renderer.render_png(states))
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_width',
+        '_height',
+        '_scale',
+        '_colors',
+        '_edges',
+        '_cache_size',
+        '_svg_cache',
+        '_png_cache'
+    )
+
+    def __init__(
+        self,
+        *,
+        width: int = geometry.WIDTH,
+        alert_color: str = '#d9534f',
+        calm_color: str = '#5cb85c',
+        border_color: str = '#ffffff',
+        cache_size: int = 128
+    ) -> None:
+        self._width = width
+        self._scale = width / geometry.WIDTH
+        self._height = round(geometry.HEIGHT * self._scale)
+        self._colors = {_CALM: calm_color, _ALERT: alert_color, _BORDER: border_color}
+        self._cache_size = cache_size
+        self._svg_cache: collections.OrderedDict[int, str] = collections.OrderedDict()
+        self._png_cache: collections.OrderedDict[int, bytes] = collections.OrderedDict()
+
+        for color in self._colors.values():
+            _parse_color(color)
+
+        self._edges: dict[int, tuple[_Edge, ...]] = {
+            state_id: self._scaled_edges(rings) for state_id, rings in self._rings().items()
+        }
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @staticmethod
+    def _rings() -> dict[int, typing.Sequence[typing.Sequence[typing.Tuple[float, float]]]]:
+        rings: dict[int, typing.Sequence[typing.Sequence[typing.Tuple[float, float]]]] = dict(geometry.POLYGONS)
+        rings[_KYIV] = (_kyiv_ring(),)
+        return rings
+
+    def _scaled_edges(self, rings: typing.Sequence[typing.Sequence[typing.Tuple[float, float]]]) -> tuple[_Edge, ...]:
+        scale = self._scale
+        edges = []
+
+        for ring in rings:
+            for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]):
+                edges.append((x0 * scale, y0 * scale, x1 * scale, y1 * scale))
+        return tuple(edges)
+
+    def clear_cache(self) -> None:
+        """Drop all memoized images."""
+        self._svg_cache.clear()
+        self._png_cache.clear()
+
+    def _memoize(
+        self,
+        cache: collections.OrderedDict[int, typing.Any],
+        mask: int,
+        render: typing.Callable[[int], typing.Any]
+    ) -> typing.Any:
+        try:
+            cache.move_to_end(mask)
+            return cache[mask]
+        except KeyError:
+            pass
+
+        image = cache[mask] = render(mask)
+
+        if len(cache) > self._cache_size:
+            cache.popitem(last=False)
+        return image
+
+    @staticmethod
+    def _as_mask(states_: typing.Union[int, typing.Iterable[states.State]]) -> int:
+        if isinstance(states_, int):
+            return states_
+        return bitmask.alert_mask(states_)
+
+    def render_svg(self, states_: typing.Union[int, typing.Iterable[states.State]]) -> str:
+        """Render the alert map as an SVG document.
+
+        Parameters
+        ----------
+        states_ : typing.Union[builtins.int, typing.Iterable[alertapi.states.State]]
+            States to render or an alert mask of them.
+
+        Returns
+        -------
+        builtins.str
+            The SVG document.
+        """
+        return self._memoize(self._svg_cache, self._as_mask(states_), self._render_svg)
+
+    def render_png(self, states_: typing.Union[int, typing.Iterable[states.State]]) -> bytes:
+        """Render the alert map as a PNG image.
+
+        Parameters
+        ----------
+        states_ : typing.Union[builtins.int, typing.Iterable[alertapi.states.State]]
+            States to render or an alert mask of them.
+
+        Returns
+        -------
+        builtins.bytes
+            The PNG image.
+        """
+        return self._memoize(self._png_cache, self._as_mask(states_), self._render_png)
+
+    def _render_svg(self, mask: int) -> str:
+        names = {state_id: name for name, state_id in converters.StateConverter.STATES.items()}
+        colors = self._colors
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{self._width}" height="{self._height}" '
+            f'viewBox="0 0 {geometry.WIDTH} {geometry.HEIGHT}">',
+            f'<g stroke="{colors[_BORDER]}" stroke-width="2" stroke-linejoin="round">'
+        ]
+
+        for state_id, rings in geometry.POLYGONS.items():
+            fill = colors[_ALERT] if mask & bitmask.state_bit(state_id) else colors[_CALM]
+            path = ''.join('M' + 'L'.join(f'{x} {y}' for x, y in ring) + 'Z' for ring in rings)
+            parts.append(
+                f'<path id="state-{state_id}" fill="{fill}" d="{path}"><title>{names[state_id]}</title></path>'
+            )
+
+        x, y = geometry.KYIV_CENTER
+        fill = colors[_ALERT] if mask & bitmask.state_bit(_KYIV) else colors[_CALM]
+        parts.append(
+            f'<circle id="state-{_KYIV}" fill="{fill}" cx="{x}" cy="{y}" r="{geometry.KYIV_RADIUS}">'
+            f'<title>{names[_KYIV]}</title></circle>'
+        )
+        parts.append('</g></svg>')
+        return ''.join(parts)
+
+    def _render_png(self, mask: int) -> bytes:
+        width, height = self._width, self._height
+        rows = [bytearray(width) for _ in range(height)]
+
+        # Kyiv is the last key, so it is painted on top of Kyiv oblast.
+        for state_id, edges in self._edges.items():
+            index = _ALERT if mask & bitmask.state_bit(state_id) else _CALM
+            _fill_polygon(rows, edges, index, width)
+
+        for edges in self._edges.values():
+            _stroke_polygon(rows, edges, _BORDER, width, height)
+
+        palette = b''.join(_parse_color(self._colors[i]) for i in (_CALM, _CALM, _ALERT, _BORDER))
+        raw = b''.join(b'\x00' + bytes(row) for row in rows)
+
+        return b''.join((
+            _PNG_SIGNATURE,
+            _png_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)),
+            _png_chunk(b'PLTE', palette),
+            _png_chunk(b'tRNS', b'\x00'),
+            _png_chunk(b'IDAT', zlib.compress(raw, 9)),
+            _png_chunk(b'IEND', b''),
+        ))
+
+
+def _fill_polygon(rows: list[bytearray], edges: typing.Sequence[_Edge], index: int, width: int) -> None:
+    min_y = min(min(edge[1], edge[3]) for edge in edges)
+    max_y = max(max(edge[1], edge[3]) for edge in edges)
+    value = bytes((index,))
+
+    for y in range(max(0, math.floor(min_y)), min(len(rows), math.ceil(max_y))):
+        center = y + 0.5
+        crossings = []
+
+        for x0, y0, x1, y1 in edges:
+            if (y0 <= center < y1) or (y1 <= center < y0):
+                crossings.append(x0 + (center - y0) * (x1 - x0) / (y1 - y0))
+
+        crossings.sort()
+        row = rows[y]
+
+        for start, end in zip(crossings[::2], crossings[1::2]):
+            left = max(0, math.ceil(start - 0.5))
+            right = min(width, math.ceil(end - 0.5))
+
+            if right > left:
+                row[left:right] = value * (right - left)
+
+
+def _stroke_polygon(
+    rows: list[bytearray], edges: typing.Sequence[_Edge], index: int, width: int, height: int
+) -> None:
+    for x0, y0, x1, y1 in edges:
+        steps = max(1, math.ceil(max(abs(x1 - x0), abs(y1 - y0))))
+        dx = (x1 - x0) / steps
+        dy = (y1 - y0) / steps
+
+        for step in range(steps + 1):
+            x = int(x0 + dx * step)
+            y = int(y0 + dy * step)
+
+            if 0 <= x < width and 0 <= y < height:
+                rows[y][x] = index
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Queries used to select states on Air Raid Alert API."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('StateQuery',)
+
+import datetime
+import typing
+
+import attr
+
+from alertapi.internal import converters
+from alertapi.internal import time
+from alertapi import snowflakes
+
+if typing.TYPE_CHECKING:
+    from alertapi.internal import data_binding
+
+_ORDERS: typing.Final[typing.FrozenSet[str]] = frozenset(('changed', '-changed'))
+
+_state_converter: typing.Final[converters.StateConverter] = converters.StateConverter()
+
+
+def _convert_states(
+    value: typing.Optional[typing.Iterable[typing.Union[int, str]]]
+) -> typing.Optional[typing.FrozenSet[snowflakes.Snowflake]]:
+    if value is None:
+        return None
+    if isinstance(value, (int, str)):
+        value = (value,)
+
+    return frozenset(
+        _state_converter.convert(state) if isinstance(state, str) else snowflakes.Snowflake(state)
+        for state in value
+    )
+
+
+def _convert_timestamp(value: typing.Union[datetime.datetime, str, float, None]) -> typing.Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = time.iso8601_datetime_string_to_datetime(value)
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return float(value)
+
+
+def _changed_timestamp(payload: data_binding.JSONObject) -> float:
+    return time.iso8601_datetime_string_to_datetime(payload['changed']).timestamp()
+
+
+def _validate_order(_: StateQuery, __: attr.Attribute[typing.Optional[str]], value: typing.Optional[str]) -> None:
+    if value is not None and value not in _ORDERS:
+        raise ValueError(f"'order' must be one of {sorted(_ORDERS)}, not {value!r}")
+
+
+@attr.define(slots=True, frozen=True, kw_only=True)
+class StateQuery:
+    """Query selecting states by their raw payloads.
+
+    Queries are evaluated against raw JSON payloads before any state object
+    is built, so they can be answered from a fresh response or from any
+    cached snapshot of one alike.
+
+    Attributes
+    ----------
+    states : typing.Optional[typing.FrozenSet[alertapi.snowflakes.Snowflake]]
+        States to select. Accepts identificators and any name variation
+        supported by `alertapi.internal.converters.StateConverter`.
+    with_alert : typing.Optional[builtins.bool]
+        * If `builtins.True`, selects states with active alarms.
+        * If `builtins.False`, selects states with inactive alarms.
+    changed_since : typing.Optional[builtins.float]
+        Selects only states changed strictly after this moment. Accepts a
+        `datetime.datetime`, an ISO 8601 string or seconds since the Unix
+        epoch, and is stored as the latter without dropping fractions of
+        a second.
+    order : typing.Optional[builtins.str]
+        `'changed'` to order states from the oldest change to the newest,
+        `'-changed'` for the reverse order. Keeps the API order if not set.
+    limit : typing.Optional[builtins.int]
+        Maximum number of selected states.
+
+    Example
+    -------
+    .. code-block:: python
+
+        query = alertapi.queries.StateQuery(
+            states=('Kyiv', 'Kyiv oblast'), changed_since=last_sync, order='changed'
+        )
+        changed = await client.fetch_states(query=query)
+    """
+
+    states: typing.Optional[typing.FrozenSet[snowflakes.Snowflake]] = attr.field(
+        default=None, converter=_convert_states
+    )
+    with_alert: typing.Optional[bool] = attr.field(default=None)
+    changed_since: typing.Optional[float] = attr.field(default=None, converter=_convert_timestamp)
+    order: typing.Optional[str] = attr.field(default=None, validator=_validate_order)
+    limit: typing.Optional[int] = attr.field(default=None)
+
+    def matches(self, payload: data_binding.JSONObject) -> bool:
+        """Check whether a raw state payload is selected by the query.
+
+        The `order` and `limit` of the query are not taken into account.
+
+        Parameters
+        ----------
+        payload : alertapi.internal.data_binding.JSONObject
+            The raw state payload.
+
+        Returns
+        -------
+        builtins.bool
+            Whether the payload is selected.
+        """
+        if self.states is not None and payload['id'] not in self.states:
+            return False
+        if self.with_alert is not None and payload['alert'] is not self.with_alert:
+            return False
+        if self.changed_since is not None:
+            return _changed_timestamp(payload) > self.changed_since
+        return True
+
+    def apply(self, payloads: typing.Iterable[data_binding.JSONObject]) -> tuple[data_binding.JSONObject, ...]:
+        """Select raw state payloads.
+
+        Parameters
+        ----------
+        payloads : typing.Iterable[alertapi.internal.data_binding.JSONObject]
+            The raw state payloads.
+
+        Returns
+        -------
+        builtins.tuple[alertapi.internal.data_binding.JSONObject]
+            The selected payloads, ordered and limited as requested.
+        """
+        selected: typing.Iterable[data_binding.JSONObject] = payloads
+
+        if self.states is not None:
+            ids = self.states
+            selected = [payload for payload in selected if payload['id'] in ids]
+        if self.with_alert is not None:
+            alert = self.with_alert
+            selected = [payload for payload in selected if payload['alert'] is alert]
+
+        if self.changed_since is not None or self.order is not None:
+            since = self.changed_since
+            keyed = [(_changed_timestamp(payload), payload) for payload in selected]
+
+            if since is not None:
+                keyed = [item for item in keyed if item[0] > since]
+            if self.order is not None:
+                keyed.sort(key=lambda item: item[0], reverse=self.order == '-changed')
+
+            selected = [payload for _, payload in keyed]
+
+        return tuple(selected)[:self.limit]
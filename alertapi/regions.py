@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Adjacency of states and their grouping into macro-regions, as alert mask bitsets.
+
+Every question is answered with a single bitwise operation against the alert
+mask of a `alertapi.snapshots.StateSnapshot`, or against an alert mask such as
+the result of `alertapi.internal.bitmask.alert_mask`.
+
+Example
+-------
+.. code-block:: python
+
+    from alertapi import regions
+
+    if regions.neighbors_alerting(9, client.snapshot):
+        print('Alert next to Kyiv oblast')
+
+    print(regions.region_active_count('east', client.snapshot))
+"""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = (
+    'NEIGHBORS',
+    'REGIONS',
+    'neighbors',
+    'neighbors_mask',
+    'neighbors_alerting',
+    'region_of',
+    'region_mask',
+    'region_active_count'
+)
+
+import typing
+
+from alertapi.internal import bitmask
+from alertapi import snowflakes
+
+if typing.TYPE_CHECKING:
+    from alertapi import snapshots
+
+_ADJACENCY: typing.Final[typing.Mapping[int, typing.Sequence[int]]] = {
+    1: (5, 9, 22, 10, 14, 23, 21),          # Vinnytsia
+    2: (16, 12),                            # Volyn
+    3: (15, 19, 4, 7, 20, 13, 10),          # Dnipropetrovsk
+    4: (3, 19, 11, 7),                      # Donetsk
+    5: (16, 21, 1, 9),                      # Zhytomyr
+    6: (12, 8),                             # Zakarpattia
+    7: (3, 4, 20),                          # Zaporizhzhia
+    8: (12, 6, 23, 18),                     # Ivano-Frankivsk
+    9: (5, 1, 22, 15, 24, 25),              # Kyiv oblast
+    10: (1, 22, 15, 3, 13, 14),             # Kirovohrad
+    11: (4, 19),                            # Luhansk
+    12: (2, 16, 18, 8, 6),                  # Lviv
+    13: (14, 10, 3, 20),                    # Mykolaiv
+    14: (1, 10, 13),                        # Odesa
+    15: (9, 24, 17, 19, 3, 10, 22),         # Poltava
+    16: (2, 12, 18, 21, 5),                 # Rivne
+    17: (24, 15, 19),                       # Sumy
+    18: (16, 12, 8, 23, 21),                # Ternopil
+    19: (17, 15, 3, 4, 11),                 # Kharkiv
+    20: (13, 3, 7),                         # Kherson
+    21: (16, 5, 1, 23, 18),                 # Khmelnytskyi
+    22: (9, 15, 10, 1),                     # Cherkasy
+    23: (8, 18, 21, 1),                     # Chernivtsi
+    24: (9, 15, 17),                        # Chernihiv
+    25: (9,)                                # Kyiv city
+}
+"""States sharing a land border, by state identificator."""
+
+_REGIONS: typing.Final[typing.Mapping[str, typing.Sequence[int]]] = {
+    'west': (2, 6, 8, 12, 16, 18, 21, 23),
+    'north': (5, 9, 17, 24, 25),
+    'center': (1, 3, 10, 15, 22),
+    'east': (4, 11, 19),
+    'south': (7, 13, 14, 20)
+}
+"""Macro-regions of Ukraine and the identificators of their states."""
+
+
+def _to_mask(state_ids: typing.Iterable[int]) -> int:
+    mask = 0
+
+    for state_id in state_ids:
+        mask |= bitmask.state_bit(state_id)
+    return mask
+
+
+NEIGHBORS: typing.Final[typing.Mapping[snowflakes.Snowflake, int]] = {
+    snowflakes.Snowflake(state_id): _to_mask(adjacent) for state_id, adjacent in _ADJACENCY.items()
+}
+"""Precomputed masks of the neighbors of every state."""
+
+REGIONS: typing.Final[typing.Mapping[str, int]] = {name: _to_mask(members) for name, members in _REGIONS.items()}
+"""Precomputed masks of the states of every macro-region."""
+
+_REGION_OF: typing.Final[typing.Mapping[int, str]] = {
+    state_id: name for name, members in _REGIONS.items() for state_id in members
+}
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+def _as_mask(alerts: typing.Union[int, snapshots.StateSnapshot]) -> int:
+    if isinstance(alerts, int):
+        return alerts
+    return alerts.alert_mask
+
+
+def neighbors_mask(state_id: int, /) -> int:
+    """Return the mask of the states bordering a state.
+
+    Parameters
+    ----------
+    state_id : builtins.int
+        Identificator of the state.
+
+    Returns
+    -------
+    builtins.int
+        Mask with the bits of the neighbors set.
+
+    Raises
+    ------
+    builtins.KeyError
+        If the state does not exist.
+    """
+    return NEIGHBORS[state_id]
+
+
+def neighbors(state_id: int, /) -> tuple[snowflakes.Snowflake, ...]:
+    """Return the identificators of the states bordering a state.
+
+    Parameters
+    ----------
+    state_id : builtins.int
+        Identificator of the state.
+
+    Returns
+    -------
+    builtins.tuple[alertapi.snowflakes.Snowflake, ...]
+        Identificators of the neighbors, in ascending order.
+    """
+    return tuple(bitmask.mask_ids(NEIGHBORS[state_id]))
+
+
+def neighbors_alerting(state_id: int, alerts: typing.Union[int, snapshots.StateSnapshot], /) -> int:
+    """Return the mask of the neighbors of a state with an active alert.
+
+    Parameters
+    ----------
+    state_id : builtins.int
+        Identificator of the state.
+    alerts : typing.Union[builtins.int, alertapi.snapshots.StateSnapshot]
+        Snapshot of the states or an alert mask of them.
+
+    Returns
+    -------
+    builtins.int
+        Mask of alerting neighbors, `0` (falsy) if there are none.
+        `alertapi.internal.bitmask.mask_ids` lists their identificators.
+    """
+    return NEIGHBORS[state_id] & _as_mask(alerts)
+
+
+def region_of(state_id: int, /) -> str:
+    """Return the name of the macro-region of a state.
+
+    Parameters
+    ----------
+    state_id : builtins.int
+        Identificator of the state.
+
+    Returns
+    -------
+    builtins.str
+        Name of the macro-region, one of `REGIONS`.
+    """
+    return _REGION_OF[state_id]
+
+
+def region_mask(name: str, /) -> int:
+    """Return the mask of the states of a macro-region.
+
+    Parameters
+    ----------
+    name : builtins.str
+        Name of the macro-region: `'west'`, `'north'`, `'center'`, `'east'` or `'south'`.
+
+    Returns
+    -------
+    builtins.int
+        Mask with the bits of the states of the macro-region set.
+
+    Raises
+    ------
+    builtins.ValueError
+        If the macro-region does not exist.
+    """
+    try:
+        return REGIONS[name]
+    except KeyError:
+        raise ValueError(f'Unknown region {name!r}, expected one of {", ".join(REGIONS)}') from None
+
+
+def region_active_count(name: str, alerts: typing.Union[int, snapshots.StateSnapshot], /) -> int:
+    """Count the states of a macro-region with an active alert.
+
+    Parameters
+    ----------
+    name : builtins.str
+        Name of the macro-region.
+    alerts : typing.Union[builtins.int, alertapi.snapshots.StateSnapshot]
+        Snapshot of the states or an alert mask of them.
+
+    Returns
+    -------
+    builtins.int
+        Number of alerting states in the macro-region.
+    """
+    return _popcount(region_mask(name) & _as_mask(alerts))
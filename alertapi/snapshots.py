@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+# cython: language_level=3
+# Copyright (c) 2022 Crisp Crow
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Last known view of all states, persisted for fast process startup."""
+
+from __future__ import annotations
+
+__all__: typing.Sequence[str] = ('StateSnapshot',)
+
+import os
+import pathlib
+import struct
+import tempfile
+import time
+import typing
+
+from alertapi.internal import bitmask
+from alertapi import snowflakes
+from alertapi import states
+
+_MAGIC: typing.Final[bytes] = b'AAS\x01'
+"""Magic bytes and format version of snapshot files."""
+
+_HEADER: typing.Final[struct.Struct] = struct.Struct('<4sIddB')
+"""Magic, alert mask, receive time, update time and number of states."""
+
+_STATE: typing.Final[struct.Struct] = struct.Struct('<B?')
+"""Identificator and alert status of a state."""
+
+_LENGTH: typing.Final[struct.Struct] = struct.Struct('<H')
+"""Length of an UTF-8 encoded string."""
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode('utf-8')
+    return _LENGTH.pack(len(encoded)) + encoded
+
+
+def _unpack_string(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+class StateSnapshot:
+    """Last known states along with their alert mask.
+
+    A snapshot loaded from a file is marked as stale until it is reconciled
+    with states fetched from Alert API, so callers can tell a possibly
+    outdated answer from a live one.
+
+    Parameters
+    ----------
+    states_ : typing.Iterable[alertapi.states.State]
+        Initial states of the snapshot.
+    last_event_id : typing.Optional[builtins.str]
+        Identificator of the last event received from the event stream.
+    received_at : typing.Optional[builtins.float]
+        Unix time all states were received at. Defaults to now.
+    updated_at : typing.Optional[builtins.float]
+        Unix time a state was last updated at. Defaults to `received_at`.
+    stale : builtins.bool
+        Whether the states may be outdated.
+    """
+
+    __slots__: typing.Sequence[str] = (
+        '_states', '_alert_mask', '_last_event_id', '_received_at', '_updated_at', '_stale'
+    )
+
+    def __init__(
+        self,
+        states_: typing.Iterable[states.State] = (),
+        *,
+        last_event_id: typing.Optional[str] = None,
+        received_at: typing.Optional[float] = None,
+        updated_at: typing.Optional[float] = None,
+        stale: bool = False
+    ) -> None:
+        self._states: dict[snowflakes.Snowflake, states.State] = {state.id: state for state in states_}
+        self._alert_mask = bitmask.alert_mask(self._states.values())
+        self._last_event_id = last_event_id
+        self._received_at = time.time() if received_at is None else received_at
+        self._updated_at = self._received_at if updated_at is None else updated_at
+        self._stale = stale
+
+    @property
+    def states(self) -> typing.Mapping[snowflakes.Snowflake, states.State]:
+        return self._states
+
+    @property
+    def alert_mask(self) -> int:
+        return self._alert_mask
+
+    @property
+    def last_event_id(self) -> typing.Optional[str]:
+        return self._last_event_id
+
+    @last_event_id.setter
+    def last_event_id(self, value: typing.Optional[str]) -> None:
+        self._last_event_id = value
+
+    @property
+    def received_at(self) -> float:
+        """Unix time all states were last received at, by a full fetch."""
+        return self._received_at
+
+    @property
+    def updated_at(self) -> float:
+        """Unix time any state was last received at, by a full fetch or an update."""
+        return self._updated_at
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    @property
+    def age(self) -> float:
+        """Seconds since all states were last received.
+
+        Single state updates do not reset it, see `StateSnapshot.updated_at`.
+        """
+        return time.time() - self._received_at
+
+    def is_alert(self, state_id: int) -> typing.Optional[bool]:
+        """Check whether an alert is active in a state.
+
+        Parameters
+        ----------
+        state_id : builtins.int
+            Identificator of the state.
+
+        Returns
+        -------
+        typing.Optional[builtins.bool]
+            The alert status or `builtins.None` if the state is unknown.
+        """
+        if state_id not in self._states:
+            return None
+
+        return bool(self._alert_mask & bitmask.state_bit(state_id))
+
+    def update(self, state: states.State) -> None:
+        """Replace a single state, as received from the event stream.
+
+        Only `StateSnapshot.updated_at` is advanced, since the other
+        states are as old as they were.
+
+        Parameters
+        ----------
+        state : alertapi.states.State
+            The updated state.
+        """
+        self._states[state.id] = state
+        bit = bitmask.state_bit(state.id)
+        self._alert_mask = self._alert_mask | bit if state.alert else self._alert_mask & ~bit
+        self._updated_at = time.time()
+
+    def reconcile(self, states_: typing.Iterable[states.State]) -> None:
+        """Replace all states with freshly fetched ones and clear the stale mark.
+
+        Parameters
+        ----------
+        states_ : typing.Iterable[alertapi.states.State]
+            All states, as fetched from Alert API.
+        """
+        self._states = {state.id: state for state in states_}
+        self._alert_mask = bitmask.alert_mask(self._states.values())
+        self._received_at = self._updated_at = time.time()
+        self._stale = False
+
+    def to_bytes(self) -> bytes:
+        """Serialize the snapshot into its compact binary form.
+
+        Returns
+        -------
+        builtins.bytes
+            The serialized snapshot.
+        """
+        chunks = [
+            _HEADER.pack(_MAGIC, self._alert_mask, self._received_at, self._updated_at, len(self._states)),
+            _pack_string(self._last_event_id or '')
+        ]
+
+        for state in self._states.values():
+            changed = state.raw_changed
+            chunks.append(_STATE.pack(state.id, state.alert))
+            chunks.append(_pack_string(state.name))
+            chunks.append(_pack_string(state.name_en))
+            chunks.append(_pack_string(changed if isinstance(changed, str) else changed.isoformat()))
+        return b''.join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> StateSnapshot:
+        """Deserialize a snapshot from its binary form.
+
+        The returned snapshot is marked as stale.
+
+        Parameters
+        ----------
+        data : builtins.bytes
+            Data returned by `StateSnapshot.to_bytes`.
+
+        Returns
+        -------
+        StateSnapshot
+            The deserialized snapshot.
+
+        Raises
+        ------
+        builtins.ValueError
+            If the data is not a snapshot of a supported version.
+        """
+        try:
+            magic, _, received_at, updated_at, count = _HEADER.unpack_from(data)
+        except struct.error as exc:
+            raise ValueError('Truncated snapshot') from exc
+
+        if magic != _MAGIC:
+            raise ValueError('Not a state snapshot or unsupported snapshot version')
+
+        try:
+            last_event_id, offset = _unpack_string(data, _HEADER.size)
+            loaded = []
+
+            for _ in range(count):
+                state_id, alert = _STATE.unpack_from(data, offset)
+                name, offset = _unpack_string(data, offset + _STATE.size)
+                name_en, offset = _unpack_string(data, offset)
+                changed, offset = _unpack_string(data, offset)
+                loaded.append(states.State(
+                    id=snowflakes.Snowflake(state_id), name=name, name_en=name_en, alert=alert, changed=changed
+                ))
+        except (struct.error, UnicodeDecodeError) as exc:
+            raise ValueError('Truncated snapshot') from exc
+
+        return cls(
+            loaded, last_event_id=last_event_id or None, received_at=received_at, updated_at=updated_at, stale=True
+        )
+
+    def save(self, path: typing.Union[str, os.PathLike[str]]) -> None:
+        """Atomically write the snapshot to a file.
+
+        Parameters
+        ----------
+        path : typing.Union[builtins.str, os.PathLike[builtins.str]]
+            Path to the snapshot file.
+        """
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(self.to_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: typing.Union[str, os.PathLike[str]]) -> typing.Optional[StateSnapshot]:
+        """Read a snapshot from a file.
+
+        Parameters
+        ----------
+        path : typing.Union[builtins.str, os.PathLike[builtins.str]]
+            Path to the snapshot file.
+
+        Returns
+        -------
+        typing.Optional[StateSnapshot]
+            The stale snapshot or `builtins.None` if the file is missing
+            or cannot be read.
+        """
+        try:
+            with open(path, 'rb') as fp:
+                return cls.from_bytes(fp.read())
+        except (OSError, ValueError):
+            return None
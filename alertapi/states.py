@@ -25,17 +25,18 @@ from __future__ import annotations
 
 __all__: typing.Sequence[str] = ('State',)
 
+import datetime
 import typing
 
 import attr
 
-if typing.TYPE_CHECKING:
-    import datetime
+from alertapi.internal import time
 
+if typing.TYPE_CHECKING:
     from alertapi import snowflakes
 
 
-@attr.define(slots=True, frozen=True)
+@attr.define(slots=True, frozen=True, repr=False)
 class State:
     """Interface of state information.
 
@@ -49,12 +50,60 @@ class State:
         English state name.
     alert : builtins.bool
         Alert status in state.
-    changed : typing.Literal[datetime.datetime]
-        Last changes of state.
+    changed : datetime.datetime
+        Last changes of state, as a timezone-aware datetime.
+        The raw timestamp is parsed on first access and cached.
     """
 
     id: snowflakes.Snowflake = attr.field()
     name: str = attr.field()
     name_en: str = attr.field()
     alert: bool = attr.field()
-    changed: typing.Literal[datetime.datetime] = attr.field()
+    _changed: typing.Union[str, datetime.datetime] = attr.field()
+    """Last changes of state, as received from Alert API."""
+
+    _changed_datetime: typing.Optional[datetime.datetime] = attr.field(init=False, default=None, eq=False)
+    _changed_epoch: typing.Optional[int] = attr.field(init=False, default=None, eq=False)
+
+    @property
+    def changed(self) -> datetime.datetime:
+        value = self._changed_datetime
+
+        if value is None:
+            raw = self._changed
+
+            if isinstance(raw, str):
+                value = time.iso8601_datetime_string_to_datetime(raw)
+            else:
+                value = raw if raw.tzinfo is not None else raw.replace(tzinfo=datetime.timezone.utc)
+            object.__setattr__(self, '_changed_datetime', value)
+        return value
+
+    @property
+    def changed_epoch(self) -> int:
+        """Last changes of state, in whole seconds since the Unix epoch.
+
+        Cheaper than `State.changed` for sorting and comparisons.
+        """
+        value = self._changed_epoch
+
+        if value is None:
+            raw = self._changed
+
+            if isinstance(raw, str):
+                value = time.iso8601_datetime_string_to_epoch(raw)
+            else:
+                value = int(self.changed.timestamp())
+            object.__setattr__(self, '_changed_epoch', value)
+        return value
+
+    @property
+    def raw_changed(self) -> typing.Union[str, datetime.datetime]:
+        """Last changes of state, exactly as the state was created with."""
+        return self._changed
+
+    def __repr__(self) -> str:
+        return (
+            f'State(id={self.id!r}, name={self.name!r}, name_en={self.name_en!r}, '
+            f'alert={self.alert!r}, changed={self._changed!r})'
+        )
@@ -23,8 +23,18 @@
 import os
 import re
 import types
+import warnings
 
 import setuptools
+from setuptools.command import build_ext
+
+COMPILED_MODULES = (
+    'alertapi/impl/entity_factory.py',
+    'alertapi/impl/event_manager.py',
+    'alertapi/internal/routes.py',
+    'alertapi/internal/converters.py',
+)
+"""Hot modules compiled with Cython when `ALERTAPI_COMPILE=1` is set."""
 
 
 def long_description():
@@ -53,6 +63,43 @@ def parse_requirements_file(path):
         return [d for d in dependencies if not d.startswith('#')]
 
 
+def compiled_extensions():
+    if os.environ.get('ALERTAPI_COMPILE') != '1':
+        return []
+
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        warnings.warn('Cython is not installed, building pure Python alertapi')
+        return []
+
+    try:
+        return cythonize(
+            list(COMPILED_MODULES),
+            compiler_directives={'language_level': 3, 'binding': True},
+            quiet=True,
+        )
+    except Exception as exc:
+        warnings.warn(f'Failed to cythonize alertapi, building pure Python alertapi: {exc}')
+        return []
+
+
+class OptionalBuildExt(build_ext.build_ext):
+    """Build extensions, falling back to pure Python modules if compiling fails."""
+
+    def run(self):
+        try:
+            super().run()
+        except Exception as exc:
+            warnings.warn(f'Failed to compile alertapi, building pure Python alertapi: {exc}')
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as exc:
+            warnings.warn(f'Failed to compile {ext.name}, keeping its pure Python module: {exc}')
+
+
 metadata = parse_meta()
 
 setuptools.setup(
@@ -68,7 +115,16 @@ setuptools.setup(
     python_requires='>=3.8',
     packages=setuptools.find_namespace_packages(include=['alertapi*']),
     install_requires=parse_requirements_file('requirements.txt'),
+    extras_require={
+        'numpy': ['numpy>=1.20'],
+        'uvloop': ['uvloop>=0.16; sys_platform != "win32"'],
+    },
+    entry_points={
+        'console_scripts': ['alertapi = alertapi.cli:main'],
+    },
     include_package_data=True,
+    ext_modules=compiled_extensions(),
+    cmdclass={'build_ext': OptionalBuildExt},
     zip_safe=False,
     project_urls={
         'Source (GitHub)': metadata.url,
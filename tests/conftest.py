@@ -0,0 +1,46 @@
+"""Shared helpers of the test suite.
+
+Tests run their coroutines with `asyncio.run` and talk to stand-in Alert API
+servers listening on free local ports.
+"""
+
+import json
+import typing
+
+from aiohttp import web
+
+from alertapi.internal import converters
+
+STATES: typing.Final[typing.List[typing.Dict[str, typing.Any]]] = [
+    {
+        'id': int(state_id),
+        'name': converters.StateConverter.NAMES[state_id],
+        'name_en': name,
+        'alert': bool(state_id % 2),
+        'changed': '2022-04-04T16:00:00+03:00'
+    }
+    for name, state_id in converters.StateConverter.STATES.items()
+]
+
+
+def sse(event_type: str, data: typing.Any = '') -> bytes:
+    """Encode an event of the event stream."""
+    return f'event: {event_type}\ndata: {data if isinstance(data, str) else json.dumps(data)}\n\n'.encode()
+
+
+async def fetch_states(_: web.Request) -> web.Response:
+    return web.json_response({'states': STATES})
+
+
+async def start_server(
+    *routes: web.RouteDef, states: typing.Callable[[web.Request], typing.Awaitable[web.StreamResponse]] = fetch_states
+) -> typing.Tuple[web.AppRunner, str]:
+    """Start a stand-in server with the states route and the given ones."""
+    app = web.Application()
+    app.router.add_get('/api/states', states)
+    app.router.add_routes(routes)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f'http://{host}:{port}'
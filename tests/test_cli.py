@@ -0,0 +1,19 @@
+import asyncio
+
+import pytest
+
+from alertapi import cli
+
+
+@pytest.mark.parametrize('scenario', ['stream', 'allocation', 'parser', 'dispatch', 'compiled'])
+def test_bench_scenario_runs(scenario, capsys):
+    assert cli.main(['bench', '--scenario', scenario, '--events', '1000', '--batch', '100']) == 0
+    assert capsys.readouterr().out
+
+
+def test_uvloop_policy_is_restored(capsys):
+    pytest.importorskip('uvloop')
+    policy = asyncio.get_event_loop_policy()
+
+    assert cli.main(['bench', '--uvloop', '--scenario', 'parser', '--events', '1000', '--batch', '100']) == 0
+    assert asyncio.get_event_loop_policy() is policy
@@ -0,0 +1,59 @@
+import pytest
+
+from alertapi import errors
+from alertapi.internal import converters
+
+
+@pytest.mark.parametrize(
+    ('name', 'state_id'),
+    [
+        ('Lviv oblast', 12),
+        ('Kyiv', 25),
+        ('Kyiv oblast', 9),
+        ('Харківська область', 19),
+        ('м. Київ', 25),
+    ]
+)
+def test_convert_exact(name, state_id):
+    assert converters.StateConverter().convert(name) == state_id
+
+
+@pytest.mark.parametrize(
+    ('name', 'state_id'),
+    [
+        ('Kyivska', 9),
+        ('Kyivska oblast', 9),
+        ('Lvivska', 12),
+        ('Kharkivska oblast', 19),
+        ('Zaporizka obl.', 7),
+        ('ivano-frankivska', 8),
+        ('Lvov', 12),
+        ('lviv', 12),
+        ('Київська', 9),
+        ('Kiev', 25),
+    ]
+)
+def test_convert_alias(name, state_id):
+    assert converters.StateConverter().convert(name) == state_id
+
+
+@pytest.mark.parametrize('name', ['Kyivskyi', 'Crimea', '', 'oblast'])
+def test_convert_miss(name):
+    with pytest.raises(errors.StateNotFound):
+        converters.StateConverter().convert(name)
+
+
+def test_search_prefix():
+    converter = converters.StateConverter()
+
+    assert converter.search('Kharkivs') == ('Kharkiv oblast',)
+    assert converter.search('cher') == ('Cherkasy oblast', 'Chernihiv oblast', 'Chernivtsi oblast')
+    assert converter.search('Kyiv', limit=1) == ('Kyiv',)
+    assert converter.search('Crimea') == ()
+
+
+def test_transliterate():
+    assert converters._transliterate('Київська область') == 'kyivska oblast'
+    assert converters._transliterate('Згурівка') == 'zghurivka'
+    assert converters._transliterate("Знам'янка") == 'znamianka'
+    assert converters._transliterate('Яготин') == 'yahotyn'
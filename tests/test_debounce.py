@@ -0,0 +1,25 @@
+import asyncio
+
+import alertapi
+from alertapi.impl import entity_factory
+from tests import conftest
+
+
+def test_seed_does_not_count_received_updates():
+    async def main():
+        factory = entity_factory.EntityFactoryImpl()
+        states = [factory.deserialize_state(payload) for payload in conftest.STATES]
+        gateway = alertapi.GatewayClient('token')
+        debouncer = gateway.enable_debounce(hold=60)
+
+        debouncer.seed(states)
+        debouncer.observe(states[0])
+        # Seeding again compares with the last update without counting it.
+        debouncer.seed(states)
+
+        stats = debouncer.stats()
+        assert stats.received == 1
+        assert stats.changes == 0
+        await debouncer.close()
+
+    asyncio.run(main())
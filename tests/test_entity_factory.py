@@ -0,0 +1,68 @@
+import json
+import sys
+
+from alertapi.impl import entity_factory
+from tests import conftest
+
+# Decoded from JSON, so the strings are fresh objects rather than interned literals.
+RAW_PAYLOADS = json.dumps(conftest.STATES)
+
+
+def _payloads(**changes):
+    return [{**payload, **changes} for payload in json.loads(RAW_PAYLOADS)]
+
+
+def test_unchanged_states_are_reused():
+    factory = entity_factory.EntityFactoryImpl(flyweight=True)
+    first = factory.deserialize_states(_payloads())
+    second = factory.deserialize_states(_payloads())
+
+    assert all(a is b for a, b in zip(first, second))
+
+
+def test_changed_states_share_interned_fields():
+    factory = entity_factory.EntityFactoryImpl(flyweight=True)
+    first = factory.deserialize_states(_payloads())
+    second = factory.deserialize_states(_payloads(changed='2022-04-05T10:00:00+03:00'))
+    third = factory.deserialize_states(_payloads(alert=True))
+
+    for a, b, c in zip(first, second, third):
+        assert a is not b and b is not c
+        assert a.name is b.name is c.name is sys.intern(a.name)
+        assert a.name_en is b.name_en is c.name_en is sys.intern(a.name_en)
+        assert a.id is b.id is c.id
+        assert entity_factory._SNOWFLAKES[a.id] is a.id
+
+    assert [state.alert for state in third] == [True] * 25
+    # The last built state is the one reused next.
+    assert factory.deserialize_states(_payloads(alert=True))[0] is third[0]
+
+
+def test_renamed_state_is_rebuilt():
+    factory = entity_factory.EntityFactoryImpl(flyweight=True)
+    payload = _payloads()[0]
+    state = factory.deserialize_state(payload)
+    renamed = factory.deserialize_state({**payload, 'name_en': 'Vinnytsia region'})
+
+    assert renamed is not state
+    assert renamed.name_en == 'Vinnytsia region'
+    assert renamed.name is state.name
+
+
+def test_unknown_state_id():
+    factory = entity_factory.EntityFactoryImpl(flyweight=True)
+    payload = {**_payloads()[0], 'id': 26}
+    state = factory.deserialize_state(payload)
+
+    assert state.id == 26
+    assert factory.deserialize_state(dict(payload)) is state
+
+
+def test_plain_states_are_not_reused():
+    factory = entity_factory.EntityFactoryImpl()
+    first = factory.deserialize_states(_payloads())
+    second = factory.deserialize_states(_payloads())
+
+    assert not factory.flyweight
+    assert first == second
+    assert all(a is not b for a, b in zip(first, second))
@@ -0,0 +1,229 @@
+import asyncio
+import json
+
+import pytest
+
+import alertapi
+from alertapi.impl import event_manager as event_manager_
+from tests import conftest
+
+
+def test_drain_cancels_listeners_past_deadline():
+    async def main():
+        gateway = alertapi.GatewayClient('token')
+        event_manager = gateway.event_manager
+        started = []
+        cancelled = []
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(event):
+            started.append(event.state.id)
+
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(event.state.id)
+                raise
+
+        update = json.dumps({'state': conftest.STATES[0]})
+
+        # The update lane runs 16 listeners at once, so 4 events stay queued.
+        for _ in range(20):
+            event_manager.consume_raw_event('update', update)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + 0.1
+        assert not await event_manager.drain(0.1)
+        assert loop.time() - deadline < 0.5
+
+        await asyncio.sleep(0)
+        lane = event_manager.lane_stats()[0]
+        assert len(started) == 16
+        assert len(cancelled) == 16
+        assert lane.dropped == 4
+        assert lane.pending == 0
+
+    asyncio.run(main())
+
+
+def _update(state_id, alert=True):
+    return json.dumps({'state': {**conftest.STATES[state_id - 1], 'alert': alert}})
+
+
+def test_state_listeners_get_only_their_states():
+    async def main():
+        gateway = alertapi.GatewayClient('token')
+        calls = []
+
+        @gateway.listen(alertapi.StateUpdateEvent, states=('Kyiv', 12, 'Lviv oblast'))
+        async def on_kyiv_or_lviv(event):
+            calls.append(('kyiv or lviv', event.state.id))
+
+        @gateway.listen(alertapi.StateUpdateEvent, states=(1,))
+        async def on_vinnytsia(event):
+            calls.append(('vinnytsia', event.state.id))
+
+        @gateway.listen(alertapi.Event, states=(12,))
+        async def on_any_lviv_event(event):
+            calls.append(('any', event.state.id))
+
+        for state_id in (1, 12, 14, 25):
+            gateway.event_manager.consume_raw_event('update', _update(state_id))
+
+        assert await gateway.event_manager.drain(1)
+        # Lviv is listened for once, although it is given twice.
+        assert sorted(calls) == [('any', 12), ('kyiv or lviv', 12), ('kyiv or lviv', 25), ('vinnytsia', 1)]
+
+    asyncio.run(main())
+
+
+def test_predicate_listeners_are_filtered():
+    async def main():
+        gateway = alertapi.GatewayClient('token')
+        alerts = []
+        kyiv_clears = []
+        everything = []
+
+        @gateway.listen(alertapi.StateUpdateEvent, predicate=lambda event: event.state.alert)
+        async def on_alert(event):
+            alerts.append(event.state.id)
+
+        @gateway.listen(alertapi.StateUpdateEvent, states=('Kyiv',), predicate=lambda event: not event.state.alert)
+        async def on_kyiv_clear(event):
+            kyiv_clears.append(event.state.id)
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(event):
+            everything.append(event.state.id)
+
+        for state_id, alert in ((1, True), (2, False), (25, True), (25, False), (9, False)):
+            gateway.event_manager.consume_raw_event('update', _update(state_id, alert))
+
+        assert await gateway.event_manager.drain(1)
+        assert sorted(alerts) == [1, 25]
+        assert kyiv_clears == [25]
+        assert sorted(everything) == [1, 2, 9, 25, 25]
+
+    asyncio.run(main())
+
+
+def test_subscribe_checks_arguments():
+    gateway = alertapi.GatewayClient('token')
+
+    async def on_event(_):
+        pass
+
+    with pytest.raises(TypeError):
+        gateway.subscribe(alertapi.StateUpdateEvent, lambda _: None)
+    with pytest.raises(TypeError):
+        gateway.subscribe(int, on_event)
+    with pytest.raises(alertapi.StateNotFound):
+        gateway.subscribe(alertapi.StateUpdateEvent, on_event, states=('Atlantis',))
+
+
+def test_lane_worker_limit():
+    async def main():
+        gateway = alertapi.GatewayClient('token')
+        release = asyncio.Event()
+        running = 0
+        most_running = 0
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(_):
+            nonlocal running, most_running
+            running += 1
+            most_running = max(most_running, running)
+            await release.wait()
+            running -= 1
+
+        for _ in range(40):
+            gateway.event_manager.consume_raw_event('update', _update(1))
+
+        await asyncio.sleep(0.05)
+        lane = gateway.event_manager.lane_stats()[0]
+        assert (lane.name, lane.in_flight, lane.pending, lane.dispatched) == ('update', 16, 24, 0)
+
+        release.set()
+        assert await gateway.event_manager.drain(1)
+        lane = gateway.event_manager.lane_stats()[0]
+        assert (lane.in_flight, lane.pending, lane.dispatched, lane.dropped) == (0, 0, 40, 0)
+        assert most_running == 16
+
+    asyncio.run(main())
+
+
+def test_ping_lane_coalesces_pings():
+    async def main():
+        gateway = alertapi.GatewayClient('token')
+        release = asyncio.Event()
+        pings = 0
+
+        @gateway.listen(alertapi.PingEvent)
+        async def on_ping(_):
+            nonlocal pings
+            pings += 1
+            await release.wait()
+
+        for _ in range(5):
+            gateway.event_manager.consume_raw_event('ping', '')
+
+        # One ping is dispatched, one waits and the three before it were dropped.
+        ping_lane = gateway.event_manager.lane_stats()[2]
+        assert (ping_lane.name, ping_lane.in_flight, ping_lane.pending, ping_lane.dropped) == ('ping', 1, 1, 3)
+
+        release.set()
+        assert await gateway.event_manager.drain(1)
+        assert pings == 2
+        assert gateway.event_manager.lane_stats()[2].dispatched == 2
+
+    asyncio.run(main())
+
+
+def test_lanes_are_drained_by_priority():
+    async def main():
+        lanes = (
+            event_manager_.DispatchLane('update', ('update',), workers=1),
+            event_manager_.DispatchLane('hello', ('hello',), workers=4),
+        )
+        # The client reconciles its states on hello, from the stand-in server.
+        runner, url = await conftest.start_server()
+        gateway = alertapi.GatewayClient('token', base_urls=[url], dispatch_lanes=lanes)
+        release = asyncio.Event()
+        order = []
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(event):
+            order.append(event.state.id)
+            await release.wait()
+
+        @gateway.listen(alertapi.ClientConnectedEvent)
+        async def on_hello(_):
+            order.append('hello')
+
+        try:
+            gateway.event_manager.consume_raw_event('update', _update(1))
+            gateway.event_manager.consume_raw_event('update', _update(2))
+            gateway.event_manager.consume_raw_event('hello', '')
+            await asyncio.sleep(0.05)
+
+            # The hello lane waits while updates are queued, although it has free workers.
+            assert order == [1]
+            assert [lane.pending for lane in gateway.event_manager.lane_stats()] == [1, 1]
+
+            release.set()
+            assert await gateway.event_manager.drain(1)
+            assert order == [1, 2, 'hello']
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_default_lanes():
+    assert [(lane.name, lane.workers, lane.max_pending) for lane in event_manager_.DEFAULT_LANES] == [
+        ('update', 16, None), ('hello', 1, None), ('ping', 1, 1)
+    ]
+    assert event_manager_.DispatchLane('any', ['a', 'b', 'a']).event_types == frozenset(('a', 'b'))
+
+    with pytest.raises(ValueError):
+        alertapi.GatewayClient('token', dispatch_lanes=())
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import random
+
+import pytest
+
+from alertapi import exports
+from alertapi import history
+
+RECORDS = [
+    history.StateRecord(at=1_649_080_800.25, state_id=12, alert=True, changed=1_649_080_799),
+    history.StateRecord(at=1_649_080_801.5, state_id=25, alert=False, changed=1_649_077_200),
+    # The last change of the state was never received.
+    history.StateRecord(at=1_649_080_802.0, state_id=9, alert=True, changed=0),
+]
+
+
+def test_ndjson_lines():
+    lines = list(exports.ndjson_lines(RECORDS))
+
+    assert all(line.endswith('\n') and line.count('\n') == 1 for line in lines)
+    assert 'Львівська область' in lines[0]
+    assert [json.loads(line) for line in lines] == [
+        {
+            'type': 'update',
+            'at': '2022-04-04T14:00:00.250000+00:00',
+            'state': {
+                'id': 12,
+                'name': 'Львівська область',
+                'name_en': 'Lviv oblast',
+                'alert': True,
+                'changed': '2022-04-04T13:59:59+00:00'
+            }
+        },
+        {
+            'type': 'update',
+            'at': '2022-04-04T14:00:01.500000+00:00',
+            'state': {
+                'id': 25,
+                'name': 'м. Київ',
+                'name_en': 'Kyiv',
+                'alert': False,
+                'changed': '2022-04-04T13:00:00+00:00'
+            }
+        },
+        {
+            'type': 'update',
+            'at': '2022-04-04T14:00:02+00:00',
+            'state': {'id': 9, 'name': 'Київська область', 'name_en': 'Kyiv oblast', 'alert': True, 'changed': None}
+        },
+    ]
+
+
+def test_csv_lines():
+    rows = list(csv.reader(io.StringIO(''.join(exports.csv_lines(RECORDS)))))
+
+    assert rows == [
+        ['at', 'id', 'name', 'name_en', 'alert', 'changed'],
+        [
+            '2022-04-04T14:00:00.250000+00:00', '12', 'Львівська область', 'Lviv oblast', '1',
+            '2022-04-04T13:59:59+00:00'
+        ],
+        ['2022-04-04T14:00:01.500000+00:00', '25', 'м. Київ', 'Kyiv', '0', '2022-04-04T13:00:00+00:00'],
+        ['2022-04-04T14:00:02+00:00', '9', 'Київська область', 'Kyiv oblast', '1', ''],
+    ]
+
+
+def test_csv_lines_header():
+    assert list(exports.csv_lines([])) == ['at,id,name,name_en,alert,changed\n']
+    assert list(exports.csv_lines([], header=False)) == []
+    assert len(list(exports.csv_lines(RECORDS, header=False))) == 3
+
+
+def _random_records(count):
+    rng = random.Random(count)
+    at = 1_649_080_800.0
+    records = []
+
+    for _ in range(count):
+        at += rng.choice((0.0, 0.001, 0.5, 3600.0, -2.0))
+        changed = rng.choice((0, int(at), int(at) - rng.randint(0, 10 ** 6), int(at) + 5))
+        records.append(history.StateRecord(
+            at=round(at, 3), state_id=rng.randint(1, 25), alert=rng.random() < 0.5, changed=changed
+        ))
+    return records
+
+
+@pytest.mark.parametrize('compress', [True, False])
+@pytest.mark.parametrize('count', [0, 1, 50_000])
+def test_archive_round_trip(compress, count):
+    records = _random_records(count)
+    fp = io.BytesIO()
+
+    assert exports.write_archive(records, fp, compress=compress) == count
+
+    fp.seek(0)
+    restored = list(exports.read_archive(fp))
+    assert restored == [
+        history.StateRecord(
+            at=pytest.approx(record.at, abs=1e-6), state_id=record.state_id, alert=record.alert, changed=record.changed
+        )
+        for record in records
+    ]
+
+
+def test_archive_is_compact():
+    fp = io.BytesIO()
+    exports.write_archive(_random_records(10_000), fp, compress=False)
+
+    # Magic, flags and at most 3 to 5 bytes for most records.
+    assert len(fp.getvalue()) < 10_000 * 8
+
+
+def test_archive_rejects_invalid_files():
+    with pytest.raises(ValueError):
+        list(exports.read_archive(io.BytesIO(b'not an archive')))
+    with pytest.raises(ValueError):
+        list(exports.read_archive(io.BytesIO(b'AAR')))
+
+    for compress in (True, False):
+        fp = io.BytesIO()
+        exports.write_archive(RECORDS, fp, compress=compress)
+
+        with pytest.raises(ValueError):
+            list(exports.read_archive(io.BytesIO(fp.getvalue()[:-2])))
@@ -0,0 +1,104 @@
+import datetime
+import sys
+
+import pytest
+
+from alertapi import frames
+from tests import conftest
+
+numpy = pytest.importorskip('numpy')
+
+PAYLOADS = [
+    {**payload, 'changed': f'2022-04-{payload["id"]:02d}T16:00:00+03:00'}
+    for payload in conftest.STATES
+]
+
+
+def test_from_payloads():
+    frame = frames.StatesFrame.from_payloads(PAYLOADS)
+
+    assert len(frame) == 25
+    assert frame.id.dtype == numpy.int64
+    assert frame.alert.dtype == numpy.bool_
+    assert frame.changed.dtype == numpy.dtype('datetime64[s]')
+    assert frame.id.tolist() == list(range(1, 26))
+    assert frame.alert.tolist() == [payload['alert'] for payload in PAYLOADS]
+    assert frame.changed[0] == numpy.datetime64('2022-04-01T13:00:00')
+    # Names are interned, so equal names share one object.
+    assert frame.name_en[11] is sys.intern('Lviv oblast')
+
+
+def test_from_payloads_empty():
+    frame = frames.StatesFrame.from_payloads([])
+
+    assert len(frame) == 0
+    assert frame.active_count == 0
+    assert frame.to_states() == ()
+
+
+def test_filter():
+    frame = frames.StatesFrame.from_payloads(PAYLOADS)
+    recent = frame.filter(frame.changed >= numpy.datetime64('2022-04-20'))
+
+    assert recent.id.tolist() == [20, 21, 22, 23, 24, 25]
+    assert recent.name_en.tolist() == [payload['name_en'] for payload in PAYLOADS[19:]]
+    assert frame.filter(numpy.array([2, 0])).id.tolist() == [3, 1]
+    # The source frame stays the same.
+    assert len(frame) == 25
+
+
+def test_with_alert():
+    frame = frames.StatesFrame.from_payloads(PAYLOADS)
+    active = frame.with_alert()
+    calm = frame.with_alert(False)
+
+    assert active.id.tolist() == [payload['id'] for payload in PAYLOADS if payload['alert']]
+    assert calm.id.tolist() == [payload['id'] for payload in PAYLOADS if not payload['alert']]
+    assert active.active_count == frame.active_count == len(active)
+    assert calm.active_count == 0
+
+
+def test_to_states_round_trip():
+    frame = frames.StatesFrame.from_payloads(PAYLOADS)
+    states = frame.to_states()
+
+    for state, payload in zip(states, PAYLOADS):
+        assert (state.id, state.name, state.name_en, state.alert) == (
+            payload['id'], payload['name'], payload['name_en'], payload['alert']
+        )
+        assert state.changed == datetime.datetime.fromisoformat(payload['changed'])
+        assert state.changed.tzinfo is datetime.timezone.utc
+        assert type(state.alert) is bool
+
+    rebuilt = frames.StatesFrame.from_payloads([
+        {
+            'id': state.id,
+            'name': state.name,
+            'name_en': state.name_en,
+            'alert': state.alert,
+            'changed': state.changed.isoformat()
+        }
+        for state in states
+    ])
+    for column in ('id', 'alert', 'changed', 'name', 'name_en'):
+        assert (getattr(rebuilt, column) == getattr(frame, column)).all()
+
+
+def test_buffers():
+    frame = frames.StatesFrame.from_payloads(PAYLOADS)
+    buffers = frame.buffers()
+
+    assert set(buffers) == {'id', 'alert', 'changed'}
+    # 'l' or 'q' depending on the platform, both 64-bit signed integers.
+    for name in ('id', 'changed'):
+        assert (buffers[name].format in ('l', 'q'), buffers[name].shape, buffers[name].itemsize) == (True, (25,), 8)
+    assert (buffers['alert'].format, buffers['alert'].shape) == ('?', (25,))
+    assert buffers['changed'][0] == int(datetime.datetime(2022, 4, 1, 13, tzinfo=datetime.timezone.utc).timestamp())
+    assert buffers['alert'].tolist() == frame.alert.tolist()
+
+    # Contiguous columns are exported without a copy.
+    assert numpy.shares_memory(numpy.asarray(buffers['id']), frame.id)
+
+    # Filtered by indices, the columns are copies, but still exported in order.
+    reversed_ = frame.filter(numpy.arange(24, -1, -1)).buffers()
+    assert reversed_['id'].tolist() == list(range(25, 0, -1))
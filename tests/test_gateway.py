@@ -0,0 +1,190 @@
+import asyncio
+import http.server
+import threading
+
+import pytest
+from aiohttp import web
+
+import alertapi
+from tests import conftest
+
+
+async def _dropping_stream(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await response.prepare(request)
+    await response.write(conftest.sse('hello'))
+    await asyncio.sleep(0.05)
+    # The connection breaks in the middle of the chunked body.
+    request.transport.close()
+    return response
+
+
+async def _healthy_stream(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await response.prepare(request)
+    await response.write(conftest.sse('hello'))
+    await response.write(conftest.sse('update', {'state': conftest.STATES[1]}))
+    await asyncio.sleep(1)
+    return response
+
+
+async def _garbled_stream(request: web.Request) -> web.StreamResponse:
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await response.prepare(request)
+    await response.write(conftest.sse('hello'))
+    await response.write(b'event: update\ndata: \xff\xfe\n\n')
+    await response.write(conftest.sse('update', {'state': conftest.STATES[1]}))
+    await asyncio.sleep(1)
+    return response
+
+
+async def _refusing_stream(_: web.Request) -> web.Response:
+    return web.Response(status=401)
+
+
+class _RefusingHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(401)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *_) -> None:
+        pass
+
+
+def test_start_close_join():
+    async def main():
+        runner, url = await conftest.start_server(web.get('/api/states/live', _healthy_stream))
+        gateway = alertapi.GatewayClient('token', base_urls=[url])
+
+        try:
+            await gateway.start()
+            assert gateway.is_running
+
+            with pytest.raises(RuntimeError):
+                await gateway.start()
+
+            await gateway.close()
+            assert not gateway.is_running
+            await asyncio.wait_for(gateway.join(), 1)
+            # Closing a closed client does nothing.
+            await gateway.close()
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_join_returns_when_stream_is_refused():
+    async def main():
+        runner, url = await conftest.start_server(web.get('/api/states/live', _refusing_stream))
+        gateway = alertapi.GatewayClient('token', base_urls=[url])
+
+        try:
+            await gateway.start()
+            await asyncio.wait_for(gateway.join(), 5)
+            assert not gateway.is_running
+
+            with pytest.raises(ConnectionRefusedError):
+                await gateway.close()
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_connect_keeps_event_loop_policy():
+    pytest.importorskip('uvloop')
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _RefusingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    policy = asyncio.get_event_loop_policy()
+    gateway = alertapi.GatewayClient('token', base_urls=[f'http://127.0.0.1:{server.server_port}'])
+
+    try:
+        with pytest.raises(ConnectionRefusedError):
+            gateway.connect(use_uvloop=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert asyncio.get_event_loop_policy() is policy
+
+
+def test_invalid_utf8_does_not_stop_stream():
+    async def main():
+        runner, url = await conftest.start_server(web.get('/api/states/live', _garbled_stream))
+        updates = []
+        gateway = alertapi.GatewayClient('token', base_urls=[url])
+        # The garbled event fails in its listener task only.
+        asyncio.get_running_loop().set_exception_handler(lambda *_: None)
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(event):
+            updates.append(event.state)
+
+        try:
+            async with gateway:
+                for _ in range(100):
+                    if updates:
+                        break
+                    await asyncio.sleep(0.05)
+
+                assert gateway.is_running
+                assert [state.id for state in updates] == [2]
+                assert gateway.client.endpoints.stats()[0].failures == 0
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_dropped_stream_fails_over_to_next_endpoint():
+    async def main():
+        dropping, dropping_url = await conftest.start_server(web.get('/api/states/live', _dropping_stream))
+        healthy, healthy_url = await conftest.start_server(web.get('/api/states/live', _healthy_stream))
+        updates = []
+        gateway = alertapi.GatewayClient('token', base_urls=[dropping_url, healthy_url])
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(event):
+            updates.append(event.state)
+
+        try:
+            async with gateway:
+                for _ in range(100):
+                    if updates:
+                        break
+                    await asyncio.sleep(0.05)
+
+                assert gateway.is_running
+                assert [state.id for state in updates] == [2]
+                # The ranking also weighs latency, which is noise between local servers.
+                failures = {stats.url: stats.failures for stats in gateway.client.endpoints.stats()}
+                assert failures[dropping_url] >= 1
+                assert failures[healthy_url] == 0
+        finally:
+            await dropping.cleanup()
+            await healthy.cleanup()
+
+    asyncio.run(main())
+
+
+def test_dropped_stream_falls_back_to_polling():
+    async def main():
+        runner, url = await conftest.start_server(web.get('/api/states/live', _dropping_stream))
+        gateway = alertapi.GatewayClient('token', base_urls=[url], transport='auto', poll_interval=(0.05, 0.1))
+
+        try:
+            async with gateway:
+                for _ in range(100):
+                    if gateway.is_polling:
+                        break
+                    await asyncio.sleep(0.05)
+
+                assert gateway.is_running
+                assert gateway.is_polling
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
@@ -0,0 +1,157 @@
+import datetime
+import random
+
+import pytest
+
+from alertapi import history
+from alertapi import snowflakes
+from alertapi import states
+from alertapi.internal import bitmask
+from tests import conftest
+
+STARTED_AT = 1_000_000.0
+
+
+def _state(state_id, alert, changed):
+    payload = conftest.STATES[state_id - 1]
+    return states.State(
+        id=snowflakes.Snowflake(state_id),
+        name=payload['name'],
+        name_en=payload['name_en'],
+        alert=alert,
+        changed=datetime.datetime.fromtimestamp(changed, datetime.timezone.utc)
+    )
+
+
+class _BruteForce:
+    """Replays every record from the start for every lookup."""
+
+    def __init__(self, initial):
+        self.initial = initial
+        self.records = []
+
+    def record(self, at, state):
+        at = max([at, STARTED_AT, *(record[0] for record in self.records)])
+        self.records.append((at, state.id, state.alert, state.changed_epoch))
+
+    def state_at(self, at):
+        if at < STARTED_AT:
+            return None
+
+        alerts = {state.id: state.alert for state in self.initial}
+        changed = {state.id: state.changed_epoch for state in self.initial}
+
+        for record_at, state_id, alert, changed_epoch in self.records:
+            if record_at <= at:
+                alerts[state_id] = alert
+                changed[state_id] = changed_epoch
+
+        mask = sum(bitmask.state_bit(state_id) for state_id, alert in alerts.items() if alert)
+        return mask, tuple(changed.get(state_id, 0) for state_id in range(1, bitmask.STATES_COUNT + 1))
+
+
+def _histories(seed, checkpoint_interval, count=200):
+    rng = random.Random(seed)
+    initial = [_state(state_id, rng.random() < 0.3, 1_000 * state_id) for state_id in range(1, 21)]
+    recorded = history.StateHistory(initial, started_at=STARTED_AT, checkpoint_interval=checkpoint_interval)
+    brute_force = _BruteForce(initial)
+    at = STARTED_AT
+
+    for _ in range(count):
+        # Steps of zero record several updates at once, negative ones arrive late.
+        at += rng.choice((0.0, 0.5, 1.0, 7.0, -3.0))
+        state = _state(rng.randint(1, 25), rng.random() < 0.5, int(at))
+        recorded.record(state, at)
+        brute_force.record(at, state)
+
+    return recorded, brute_force
+
+
+def _moments(brute_force):
+    times = sorted({record[0] for record in brute_force.records})
+    moments = {STARTED_AT - 1, STARTED_AT, times[-1] + 100}
+
+    for at in times:
+        moments.update((at - 0.25, at, at + 0.25))
+    return sorted(moments)
+
+
+def _as_tuple(board):
+    return None if board is None else (board.alert_mask, tuple(board.changed))
+
+
+@pytest.mark.parametrize('checkpoint_interval', [1, 4, 7, 256])
+def test_state_at_matches_replay(checkpoint_interval):
+    recorded, brute_force = _histories(checkpoint_interval, checkpoint_interval)
+
+    assert len(recorded) == 200
+    assert recorded.checkpoints == 1 + 200 // checkpoint_interval
+
+    for at in _moments(brute_force):
+        assert _as_tuple(recorded.state_at(at)) == brute_force.state_at(at), at
+
+    assert _as_tuple(recorded.board)[0] == brute_force.state_at(float('inf'))[0]
+
+
+def test_state_at_checkpoint_boundaries():
+    recorded, brute_force = _histories(0, 4)
+
+    # A checkpoint is taken at the time of every fourth record.
+    for index in range(3, 200, 4):
+        for at in (brute_force.records[index][0], brute_force.records[index + 1][0] if index < 199 else None):
+            if at is not None:
+                assert _as_tuple(recorded.state_at(at)) == brute_force.state_at(at)
+
+
+@pytest.mark.parametrize('checkpoint_interval', [1, 5, 256])
+def test_boards_between_matches_replay(checkpoint_interval):
+    recorded, brute_force = _histories(10 + checkpoint_interval, checkpoint_interval)
+    end = brute_force.records[-1][0] + 2
+
+    for start, step in ((STARTED_AT - 4.5, 1.5), (STARTED_AT + 10.25, 0.75), (STARTED_AT, 60.0)):
+        boards = list(recorded.boards_between(start, end, step))
+        moments = [start + n * step for n in range(int((end - start) // step) + 1)]
+        moments = [at for at in moments if at >= STARTED_AT]
+
+        assert [board.at for board in boards] == pytest.approx(moments)
+        for board in boards:
+            assert _as_tuple(board) == brute_force.state_at(board.at)
+            assert _as_tuple(board) == _as_tuple(recorded.state_at(board.at))
+
+
+def test_boards_between_accepts_datetimes():
+    recorded, _ = _histories(3, 8, count=20)
+    start = datetime.datetime.fromtimestamp(STARTED_AT, datetime.timezone.utc)
+    step = datetime.timedelta(seconds=10)
+    boards = list(recorded.boards_between(start, start + 3 * step, step))
+
+    assert [board.at for board in boards] == [STARTED_AT, STARTED_AT + 10, STARTED_AT + 20, STARTED_AT + 30]
+    assert list(recorded.boards_between(STARTED_AT - 20, STARTED_AT - 10, 1)) == []
+
+    with pytest.raises(ValueError):
+        list(recorded.boards_between(STARTED_AT, STARTED_AT + 1, 0))
+
+
+def test_records_round_trip():
+    recorded, brute_force = _histories(4, 16, count=50)
+    copy = history.StateHistory(started_at=STARTED_AT, checkpoint_interval=16)
+    copy.extend(recorded.records())
+
+    assert [(record.at, record.state_id, record.alert, record.changed) for record in recorded.records()] == [
+        (at, state_id, alert, changed) for at, state_id, alert, changed in brute_force.records
+    ]
+    middle = brute_force.records[25][0]
+    assert all(record.at >= middle for record in recorded.records(start=middle))
+    assert all(record.at <= middle for record in recorded.records(end=middle))
+    # The copy starts without the initial states, so only the records are the same.
+    assert list(copy.records()) == list(recorded.records())
+
+
+def test_board_accessors():
+    board = history.StateHistory([_state(12, True, 1_649_077_200)], started_at=STARTED_AT).board
+
+    assert board.alerting == (12,)
+    assert board.is_alert(12) and not board.is_alert(1)
+    assert board.changed_at(12) == datetime.datetime(2022, 4, 4, 13, tzinfo=datetime.timezone.utc)
+    # Unknown changes are not the Unix epoch.
+    assert board.changed_at(1) is None
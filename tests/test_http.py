@@ -0,0 +1,87 @@
+import asyncio
+import functools
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from alertapi.impl import endpoints
+from alertapi.impl import http
+from tests import conftest
+
+
+class _RecordingResponse(aiohttp.ClientResponse):
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.instances.append(self)
+
+
+async def _failing_states(_: web.Request) -> web.Response:
+    return web.json_response({'error': 'unavailable'}, status=503)
+
+
+def test_rejected_response_is_released():
+    async def main():
+        runner, url = await conftest.start_server(states=_failing_states)
+        _RecordingResponse.instances.clear()
+        client = http.HttpClientImpl(
+            'token', functools.partial(aiohttp.ClientSession, response_class=_RecordingResponse), base_urls=[url]
+        )
+
+        try:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.poll_states()
+
+            assert _RecordingResponse.instances
+            assert all(response.connection is None for response in _RecordingResponse.instances)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_cancelled_request_only_raises_latency():
+    pool = endpoints.EndpointPool(['http://a', 'http://b'])
+    endpoint = pool.ranked()[0]
+    pool.record_success(endpoint, 0.5)
+
+    pool.record_cancelled(endpoint, 0.01)
+    assert endpoint.latency == 0.5
+
+    pool.record_cancelled(endpoint, 1.5)
+    assert endpoint.latency > 0.5
+
+
+def test_success_wins_over_error_completed_alongside():
+    class RacingClient(http.HttpClientImpl):
+        __slots__ = ()
+
+        async def _attempt(self, session, endpoint, compiled_route, headers=None):
+            if endpoint.url == 'http://a':
+                await released.wait()
+                raise ValueError('rejected payload')
+            released.set()
+            return {'states': conftest.STATES}, {}
+
+    async def main():
+        nonlocal released
+        released = asyncio.Event()
+        client = RacingClient('token', aiohttp.ClientSession, base_urls=['http://a', 'http://b'], hedge_delay=0.01)
+        payload, _ = await client.poll_states()
+        assert len(payload) == len(conftest.STATES)
+
+    released: asyncio.Event
+    asyncio.run(main())
+
+
+def test_unmeasured_endpoints_rank_after_measured_ones():
+    pool = endpoints.EndpointPool(['http://primary', 'http://mirror', 'http://backup'])
+    assert [endpoint.url for endpoint in pool.ranked()] == ['http://primary', 'http://mirror', 'http://backup']
+
+    pool.record_success(pool.ranked()[0], 0.2)
+    assert [endpoint.url for endpoint in pool.ranked()] == ['http://primary', 'http://mirror', 'http://backup']
+
+    pool.record_success(pool.ranked()[2], 0.1)
+    assert [endpoint.url for endpoint in pool.ranked()] == ['http://backup', 'http://primary', 'http://mirror']
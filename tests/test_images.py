@@ -0,0 +1,149 @@
+import asyncio
+import concurrent.futures
+import hashlib
+import threading
+
+from aiohttp import web
+
+from alertapi import images
+from tests import conftest
+
+MAP = b'\x89PNG map' * 1000
+LAST_MODIFIED = 'Mon, 04 Apr 2022 13:00:00 GMT'
+
+
+class _ImageServer:
+    def __init__(self):
+        self.content = MAP
+        self.requests = []
+
+    @property
+    def etag(self):
+        return f'"{hashlib.md5(self.content).hexdigest()}"'
+
+    async def handle(self, request):
+        self.requests.append(dict(request.headers))
+
+        if request.headers.get('If-None-Match') == self.etag:
+            return web.Response(status=304)
+        return web.Response(body=self.content, headers={'ETag': self.etag, 'Last-Modified': LAST_MODIFIED})
+
+
+async def _start(image_server):
+    return await conftest.start_server(
+        web.get('/map.png', image_server.handle), web.get('/copy.png', image_server.handle)
+    )
+
+
+def test_content_addressed_storage(tmp_path):
+    async def main():
+        image_server = _ImageServer()
+        runner, url = await _start(image_server)
+        cache = images.ImageCache(tmp_path)
+
+        try:
+            assert await images.Image(f'{url}/map.png', cache=cache).read() == MAP
+            assert await images.Image(f'{url}/copy.png', cache=cache).read() == MAP
+        finally:
+            await runner.cleanup()
+
+        digest = hashlib.sha256(MAP).hexdigest()
+        blobs = [path for path in (tmp_path / 'blobs').rglob('*') if path.is_file()]
+        assert blobs == [tmp_path / 'blobs' / digest[:2] / digest]
+        assert cache.lookup(f'{url}/map.png') == cache.lookup(f'{url}/copy.png') == blobs[0]
+        # The index survives the cache object.
+        assert images.ImageCache(tmp_path).lookup(f'{url}/map.png') == blobs[0]
+        assert not list(tmp_path.glob('*.part')) and not list(tmp_path.glob('*.tmp'))
+
+    asyncio.run(main())
+
+
+def test_revalidation(tmp_path):
+    async def main():
+        image_server = _ImageServer()
+        runner, url = await _start(image_server)
+        image = images.Image(f'{url}/map.png', cache=images.ImageCache(tmp_path))
+
+        try:
+            assert await image.read() == MAP
+            assert 'If-None-Match' not in image_server.requests[0]
+
+            assert await image.read() == MAP
+            assert image_server.requests[1]['If-None-Match'] == image_server.etag
+            assert image_server.requests[1]['If-Modified-Since'] == LAST_MODIFIED
+
+            image_server.content = b'new map'
+            assert await image.read() == b'new map'
+            assert len(image_server.requests) == 3
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_max_age(tmp_path):
+    async def main():
+        image_server = _ImageServer()
+        runner, url = await _start(image_server)
+        image = images.Image(f'{url}/map.png', cache=images.ImageCache(tmp_path, max_age=0.3))
+
+        try:
+            await image.read()
+            image_server.content = b'new map'
+
+            # Fresh copies are served without asking the server.
+            assert await image.read() == MAP
+            assert len(image_server.requests) == 1
+
+            await asyncio.sleep(0.4)
+            assert await image.read() == b'new map'
+            assert len(image_server.requests) == 2
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_save(tmp_path):
+    async def main():
+        image_server = _ImageServer()
+        runner, url = await _start(image_server)
+
+        try:
+            await images.Image(f'{url}/map.png').save(tmp_path / 'map.png')
+        finally:
+            await runner.cleanup()
+
+        assert (tmp_path / 'map.png').read_bytes() == MAP
+
+    asyncio.run(main())
+
+
+def test_file_io_runs_in_executor(tmp_path, monkeypatch):
+    opened = []
+    real_open = open
+
+    def recording_open(*args, **kwargs):
+        opened.append(threading.current_thread())
+        return real_open(*args, **kwargs)
+
+    async def main():
+        image_server = _ImageServer()
+        runner, url = await _start(image_server)
+        image = images.Image(f'{url}/map.png', cache=images.ImageCache(tmp_path, max_age=60))
+        asyncio.get_running_loop().set_default_executor(concurrent.futures.ThreadPoolExecutor(1))
+        monkeypatch.setattr('builtins.open', recording_open)
+
+        try:
+            await image.read()
+            await image.read()
+            await image.save(tmp_path / 'map.png')
+        finally:
+            monkeypatch.undo()
+            await runner.cleanup()
+
+        # The index, the cached copy and the saved file.
+        assert len(opened) >= 3
+        assert threading.main_thread() not in opened
+
+    asyncio.run(main())
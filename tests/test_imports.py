@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+
+import alertapi
+from alertapi import internal
+
+HEAVY_MODULES = ('aiohttp', 'alertapi.api', 'alertapi.impl', 'alertapi.images')
+
+
+def _loaded_modules(code: str) -> set:
+    return set(json.loads(subprocess.run(
+        [sys.executable, '-c', f'{code}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))'],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout))
+
+
+def test_star_import_exports_lazy_names():
+    namespace = {}
+    exec('from alertapi import *', namespace)
+
+    for name in ('APIClient', 'GatewayClient', 'State', 'StateUpdateEvent', 'StaleStream', 'Snowflake', 'impl'):
+        assert name in namespace
+    assert namespace['GatewayClient'] is alertapi.GatewayClient
+    assert 'importlib' not in namespace and 'typing' not in namespace
+
+
+def test_internal_star_import_exports_lazy_names():
+    namespace = {}
+    exec('from alertapi.internal import *', namespace)
+
+    for name in ('StateConverter', 'SSEParser', 'LatencyHistogram', 'alert_mask', 'POLYGONS', 'KYIV_CENTER'):
+        assert name in namespace
+    assert namespace['POLYGONS'] is internal.geometry.POLYGONS
+    assert 'importlib' not in namespace and 'typing' not in namespace
+
+
+def test_import_does_not_load_heavy_modules():
+    loaded = _loaded_modules('import alertapi')
+
+    assert 'alertapi' in loaded
+    assert not loaded.intersection(HEAVY_MODULES)
+
+
+def test_internal_import_does_not_load_utilities():
+    loaded = _loaded_modules('import alertapi.internal')
+
+    assert 'alertapi.internal' in loaded
+    assert 'alertapi.internal.geometry' not in loaded
+    assert 'alertapi.internal.converters' not in loaded
@@ -0,0 +1,129 @@
+import struct
+import xml.etree.ElementTree as ElementTree
+import zlib
+
+import pytest
+
+from alertapi import maps
+from alertapi import states
+from alertapi import snowflakes
+from alertapi.internal import bitmask
+from alertapi.internal import geometry
+from tests import conftest
+
+
+def _states(alerts):
+    return [
+        states.State(
+            id=snowflakes.Snowflake(payload['id']),
+            name=payload['name'],
+            name_en=payload['name_en'],
+            alert=payload['id'] in alerts,
+            changed=payload['changed']
+        )
+        for payload in conftest.STATES
+    ]
+
+
+def _decode_png(png):
+    assert png[:8] == b'\x89PNG\r\n\x1a\n'
+    chunks = {}
+    position = 8
+
+    while position < len(png):
+        length, kind = struct.unpack('>I4s', png[position:position + 8])
+        data = png[position + 8:position + 8 + length]
+        assert struct.unpack('>I', png[position + 8 + length:position + 12 + length])[0] == zlib.crc32(kind + data)
+        chunks[kind] = data
+        position += 12 + length
+
+    width, height = struct.unpack('>II', chunks[b'IHDR'][:8])
+    raw = zlib.decompress(chunks[b'IDAT'])
+    rows = [raw[y * (width + 1) + 1:(y + 1) * (width + 1)] for y in range(height)]
+    return width, height, chunks[b'PLTE'], rows
+
+
+def test_state_bit_and_mask_ids():
+    assert [bitmask.state_bit(state_id) for state_id in (1, 2, 25)] == [1, 2, 1 << 24]
+    assert list(bitmask.mask_ids(0)) == []
+    assert list(bitmask.mask_ids(bitmask.FULL_MASK)) == list(range(1, bitmask.STATES_COUNT + 1))
+
+    for ids in ([1], [3, 9, 25], [2, 4, 6, 8, 24]):
+        mask = 0
+        for state_id in ids:
+            mask |= bitmask.state_bit(state_id)
+        assert list(bitmask.mask_ids(mask)) == ids
+        assert all(isinstance(state_id, snowflakes.Snowflake) for state_id in bitmask.mask_ids(mask))
+
+
+def test_alert_mask():
+    assert bitmask.alert_mask(_states({1, 12, 25})) == 1 | 1 << 11 | 1 << 24
+    assert bitmask.alert_mask(_states(set())) == 0
+    assert bitmask.alert_mask(_states(set(range(1, 26)))) == bitmask.FULL_MASK
+
+
+def test_geometry_fits_canvas():
+    # Kyiv is drawn as a circle, every oblast as polygons.
+    assert set(geometry.POLYGONS) == set(range(1, 25))
+
+    for rings in geometry.POLYGONS.values():
+        for ring in rings:
+            assert len(ring) >= 3
+            assert all(0 <= x <= geometry.WIDTH and 0 <= y <= geometry.HEIGHT for x, y in ring)
+
+    x, y = geometry.KYIV_CENTER
+    assert geometry.KYIV_RADIUS < x < geometry.WIDTH - geometry.KYIV_RADIUS
+    assert geometry.KYIV_RADIUS < y < geometry.HEIGHT - geometry.KYIV_RADIUS
+
+
+def test_png_cache_is_keyed_by_mask():
+    renderer = maps.MapRenderer(width=300, cache_size=2)
+    mask = bitmask.alert_mask(_states({1, 25}))
+
+    png = renderer.render_png(mask)
+    assert renderer.render_png(_states({1, 25})) is png
+    assert renderer.render_png(_states({2})) is not png
+
+    # A third mask evicts the least recently used one.
+    renderer.render_png(_states({3}))
+    assert renderer.render_png(mask) is not png
+    assert renderer.render_png(mask) == png
+
+    renderer.clear_cache()
+    assert renderer.render_png(mask) is not png
+
+
+def test_png_output():
+    renderer = maps.MapRenderer(width=400, alert_color='#ff0000', calm_color='#00ff00', border_color='#0000ff')
+    width, height, palette, rows = _decode_png(renderer.render_png(bitmask.state_bit(25)))
+    scale = width / geometry.WIDTH
+
+    assert (width, height) == (renderer.width, renderer.height) == (400, round(geometry.HEIGHT * scale))
+    assert palette == bytes.fromhex('00ff00' '00ff00' 'ff0000' '0000ff')
+
+    x, y = geometry.KYIV_CENTER
+    assert rows[round(y * scale)][round(x * scale)] == 2
+    # Kyiv oblast around the city stays calm.
+    assert rows[round((y + geometry.KYIV_RADIUS + 10) * scale)][round(x * scale)] == 1
+    assert rows[0][0] == 0
+    assert any(3 in row for row in rows)
+
+
+def test_svg_output():
+    renderer = maps.MapRenderer(alert_color='#ff0000', calm_color='#00ff00')
+    svg = renderer.render_svg(_states({12, 25}))
+    root = ElementTree.fromstring(svg)
+    shapes = {element.get('id'): element for element in root.iter() if element.get('id')}
+
+    assert renderer.render_svg(bitmask.state_bit(12) | bitmask.state_bit(25)) is svg
+    assert root.get('viewBox') == f'0 0 {geometry.WIDTH} {geometry.HEIGHT}'
+    assert set(shapes) == {f'state-{state_id}' for state_id in range(1, 26)}
+    assert shapes['state-12'].get('fill') == shapes['state-25'].get('fill') == '#ff0000'
+    assert shapes['state-1'].get('fill') == '#00ff00'
+    assert shapes['state-25'].tag.endswith('circle')
+    assert shapes['state-12'].find('{http://www.w3.org/2000/svg}title').text == 'Lviv oblast'
+
+
+def test_invalid_color():
+    with pytest.raises(ValueError):
+        maps.MapRenderer(alert_color='red')
@@ -0,0 +1,97 @@
+import asyncio
+import re
+
+from aiohttp import test_utils
+
+import alertapi
+from alertapi.impl import metrics
+from tests import conftest
+
+SAMPLE = re.compile(r'^[a-z_]+(\{[a-z_]+="[^"]*"(,[a-z_]+="[^"]*")*\})? -?(\d+(\.\d+)?(e-?\d+)?|\+Inf)$')
+
+
+def _sample(text, name):
+    match = re.search(rf'^{name} (\S+)$', text, re.MULTILINE)
+    assert match is not None
+    return float(match.group(1))
+
+
+async def _wait_for(predicate):
+    for _ in range(100):
+        if predicate():
+            return
+        await asyncio.sleep(0.05)
+
+
+def test_health_before_start():
+    async def main():
+        gateway = alertapi.GatewayClient('token')
+
+        async with test_utils.TestClient(test_utils.TestServer(metrics.MetricsServer(gateway).application())) as http:
+            health = await http.get('/healthz')
+            readiness = await http.get('/readyz')
+
+            assert health.status == 503
+            assert readiness.status == 503
+            assert (await health.json())['status'] == 'unavailable'
+            assert (await readiness.json())['running'] is False
+
+    asyncio.run(main())
+
+
+def test_metrics_and_health_while_polling():
+    async def main():
+        runner, url = await conftest.start_server()
+        gateway = alertapi.GatewayClient('token', base_urls=[url], transport='polling', poll_interval=(0.05, 0.1))
+        server = metrics.MetricsServer(gateway)
+
+        try:
+            async with gateway, test_utils.TestClient(test_utils.TestServer(server.application())) as http:
+                await _wait_for(server.is_ready)
+                # Longer than the polls, which keep the age of the last event short.
+                await asyncio.sleep(0.5)
+
+                response = await http.get('/metrics')
+                text = await response.text()
+                assert response.status == 200
+                assert response.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+                assert _sample(text, 'alertapi_polling') == 1
+                assert _sample(text, 'alertapi_stream_connected') == 0
+                assert _sample(text, 'alertapi_last_event_age_seconds') < 0.3
+                assert _sample(text, 'alertapi_active_alerts') == sum(state['alert'] for state in conftest.STATES)
+                assert 'alertapi_state_alert{state_id="1",state="Vinnytsia oblast"} 1' in text
+
+                health = await http.get('/healthz')
+                readiness = await http.get('/readyz')
+                assert health.status == 200
+                assert readiness.status == 200
+                body = await readiness.json()
+                assert body['polling'] is True
+                assert body['stale_states'] is False
+                assert body['last_event_age'] < 0.3
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
+
+
+def test_metrics_text_format():
+    gateway = alertapi.GatewayClient('token')
+    text = metrics.MetricsServer(gateway).render()
+    families = set()
+
+    assert text.endswith('\n')
+
+    for line in text.splitlines():
+        if line.startswith('# HELP '):
+            families.add(line.split(' ')[2])
+        elif line.startswith('# TYPE '):
+            name, kind = line.split(' ')[2:]
+            assert name in families
+            assert kind in ('gauge', 'counter', 'histogram')
+        else:
+            assert SAMPLE.match(line), line
+            name = line.split('{')[0].split(' ')[0]
+            assert re.sub(r'_(bucket|sum|count)$', '', name) in families or name in families
+
+    assert 'alertapi_listener_duration_seconds_bucket{lane="update",le="+Inf"} 0' in text
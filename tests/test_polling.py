@@ -0,0 +1,54 @@
+import asyncio
+
+from aiohttp import web
+
+import alertapi
+from tests import conftest
+
+
+def test_polled_events_pass_through_the_lanes():
+    async def main():
+        polls = 0
+
+        async def changing_states(_: web.Request) -> web.Response:
+            nonlocal polls
+            polls += 1
+            states = [dict(state) for state in conftest.STATES]
+            if polls > 1:
+                states[1]['alert'] = not states[1]['alert']
+            return web.json_response({'states': states})
+
+        app = web.Application()
+        app.router.add_get('/api/states', changing_states)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', 0).start()
+        host, port = runner.addresses[0][:2]
+
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, context: errors.append(context['exception']))
+        gateway = alertapi.GatewayClient(
+            'token', base_urls=[f'http://{host}:{port}'], transport='polling', poll_interval=(0.05, 0.05)
+        )
+
+        @gateway.listen(alertapi.StateUpdateEvent)
+        async def on_update(event):
+            raise RuntimeError(event.state.id)
+
+        try:
+            async with gateway:
+                for _ in range(100):
+                    if errors:
+                        break
+                    await asyncio.sleep(0.05)
+
+                assert await gateway.event_manager.drain(1)
+                stats = {lane.name: lane for lane in gateway.event_manager.lane_stats()}
+                assert stats['hello'].dispatched == 1
+                assert stats['update'].dispatched >= 1
+                assert isinstance(errors[0], RuntimeError)
+                assert errors[0].args == (2,)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+import asyncio
+import datetime
+
+import pytest
+
+import alertapi
+from alertapi import queries
+from tests import conftest
+
+PAYLOADS = [
+    {**payload, 'changed': f'2022-04-04T16:{30 - payload["id"]:02d}:00+03:00'}
+    for payload in conftest.STATES
+]
+
+
+def _ids(payloads):
+    return [payload['id'] for payload in payloads]
+
+
+def test_matches():
+    lviv = PAYLOADS[11]
+
+    assert queries.StateQuery().matches(lviv)
+    assert queries.StateQuery(states='Lviv').matches(lviv)
+    assert queries.StateQuery(states=(12, 'Kyiv')).matches(lviv)
+    assert not queries.StateQuery(states='Kyiv').matches(lviv)
+    assert queries.StateQuery(with_alert=False).matches(lviv)
+    assert not queries.StateQuery(with_alert=True).matches(lviv)
+    # Strictly after the moment.
+    assert queries.StateQuery(changed_since='2022-04-04T16:17:59+03:00').matches(lviv)
+    assert not queries.StateQuery(changed_since='2022-04-04T16:18:00+03:00').matches(lviv)
+    assert not queries.StateQuery(states=12, with_alert=True).matches(lviv)
+
+
+def test_changed_since_conversions():
+    moment = datetime.datetime(2022, 4, 4, 13, 18, tzinfo=datetime.timezone.utc)
+
+    assert queries.StateQuery(changed_since=moment).changed_since == moment.timestamp()
+    assert queries.StateQuery(changed_since=moment.replace(tzinfo=None)).changed_since == moment.timestamp()
+    assert queries.StateQuery(changed_since='2022-04-04T16:18:00+03:00').changed_since == moment.timestamp()
+    assert queries.StateQuery(changed_since=1649078280).changed_since == moment.timestamp()
+
+
+def test_changed_since_keeps_fractions_of_seconds():
+    payload = {**PAYLOADS[0], 'changed': '2022-04-04T16:00:00.500+03:00'}
+    moment = datetime.datetime(2022, 4, 4, 13, tzinfo=datetime.timezone.utc)
+
+    assert queries.StateQuery(changed_since=moment + datetime.timedelta(milliseconds=200)).matches(payload)
+    assert not queries.StateQuery(changed_since=moment + datetime.timedelta(milliseconds=700)).matches(payload)
+    assert queries.StateQuery(changed_since=moment.timestamp() + 0.2).apply([payload]) == (payload,)
+    assert queries.StateQuery(changed_since=moment.timestamp() + 0.7).apply([payload]) == ()
+
+
+def test_apply_pushes_cheap_filters_down(monkeypatch):
+    parsed = []
+    changed_timestamp = queries._changed_timestamp
+
+    def recording_changed_timestamp(payload):
+        parsed.append(payload['id'])
+        return changed_timestamp(payload)
+
+    monkeypatch.setattr(queries, '_changed_timestamp', recording_changed_timestamp)
+    query = queries.StateQuery(states=range(1, 11), with_alert=True, changed_since='2022-04-04T16:22:00+03:00')
+
+    assert _ids(query.apply(PAYLOADS)) == [1, 3, 5, 7]
+    # Timestamps are parsed only for the rows left by the state and alert filters.
+    assert parsed == [1, 3, 5, 7, 9]
+
+    parsed.clear()
+    assert len(queries.StateQuery(states=(1, 2)).apply(PAYLOADS)) == 2
+    assert parsed == []
+
+
+def test_apply_order_and_limit():
+    assert _ids(queries.StateQuery().apply(PAYLOADS)) == list(range(1, 26))
+    assert _ids(queries.StateQuery(order='changed').apply(PAYLOADS)) == list(range(25, 0, -1))
+    assert _ids(queries.StateQuery(order='-changed').apply(PAYLOADS)) == list(range(1, 26))
+    assert _ids(queries.StateQuery(order='changed', limit=3).apply(PAYLOADS)) == [25, 24, 23]
+    # The limit keeps the API order when no order is set.
+    assert _ids(queries.StateQuery(limit=2).apply(PAYLOADS)) == [1, 2]
+    assert _ids(queries.StateQuery(with_alert=True, limit=0).apply(PAYLOADS)) == []
+
+    # Sorting is stable for equal timestamps.
+    same = [{**payload, 'changed': '2022-04-04T16:00:00+03:00'} for payload in PAYLOADS[:5]]
+    assert _ids(queries.StateQuery(order='-changed').apply(same)) == [1, 2, 3, 4, 5]
+
+
+def test_invalid_order():
+    with pytest.raises(ValueError):
+        queries.StateQuery(order='name')
+
+
+def test_fetch_states_applies_query():
+    async def main():
+        runner, url = await conftest.start_server()
+        client = alertapi.APIClient('token', base_urls=[url])
+
+        try:
+            query = queries.StateQuery(states=('Kyiv', 'Lviv oblast', 'Odesa'), order='changed')
+            states = await client.fetch_states(query=query)
+        finally:
+            await runner.cleanup()
+
+        assert [state.id for state in states] == [12, 14, 25]
+
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from alertapi import regions
+from alertapi import snapshots
+from alertapi import snowflakes
+from alertapi import states
+from alertapi.internal import bitmask
+from tests import conftest
+
+ALL_STATES = range(1, bitmask.STATES_COUNT + 1)
+
+
+def _snapshot(alerts):
+    return snapshots.StateSnapshot(
+        states.State(
+            id=snowflakes.Snowflake(payload['id']),
+            name=payload['name'],
+            name_en=payload['name_en'],
+            alert=payload['id'] in alerts,
+            changed=payload['changed']
+        )
+        for payload in conftest.STATES
+    )
+
+
+def test_adjacency_is_symmetric():
+    assert set(regions.NEIGHBORS) == set(ALL_STATES)
+
+    for state_id in ALL_STATES:
+        adjacent = regions.neighbors(state_id)
+
+        assert adjacent
+        assert state_id not in adjacent
+        assert list(adjacent) == sorted(adjacent)
+        assert regions.neighbors_mask(state_id) == sum(bitmask.state_bit(other) for other in adjacent)
+
+        for other in adjacent:
+            assert state_id in regions.neighbors(other)
+
+
+def test_regions_partition_states():
+    masks = list(regions.REGIONS.values())
+
+    assert sum(masks) == bitmask.FULL_MASK
+    assert all(a & b == 0 for i, a in enumerate(masks) for b in masks[i + 1:])
+
+    for state_id in ALL_STATES:
+        assert regions.region_mask(regions.region_of(state_id)) & bitmask.state_bit(state_id)
+
+    with pytest.raises(ValueError):
+        regions.region_mask('nowhere')
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_queries_match_brute_force(seed):
+    rng = random.Random(seed)
+    alerts = {state_id for state_id in ALL_STATES if rng.random() < 0.4}
+    snapshot = _snapshot(alerts)
+    assert snapshot.alert_mask == sum(bitmask.state_bit(state_id) for state_id in alerts)
+
+    for state_id in ALL_STATES:
+        expected = [other for other in regions.neighbors(state_id) if other in alerts]
+
+        for source in (snapshot, snapshot.alert_mask):
+            assert list(bitmask.mask_ids(regions.neighbors_alerting(state_id, source))) == expected
+
+    for name in regions.REGIONS:
+        expected = sum(1 for state_id in alerts if regions.region_of(state_id) == name)
+
+        assert regions.region_active_count(name, snapshot) == expected
+        assert regions.region_active_count(name, snapshot.alert_mask) == expected
+
+
+def test_queries_follow_snapshot_updates():
+    snapshot = _snapshot(set())
+    assert not regions.neighbors_alerting(9, snapshot)
+
+    kyiv = snapshot.states[25]
+    snapshot.update(states.State(
+        id=kyiv.id, name=kyiv.name, name_en=kyiv.name_en, alert=True, changed=kyiv.raw_changed
+    ))
+
+    assert list(bitmask.mask_ids(regions.neighbors_alerting(9, snapshot))) == [25]
+    assert regions.region_active_count('north', snapshot) == 1
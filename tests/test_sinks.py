@@ -0,0 +1,236 @@
+import asyncio
+import os
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from alertapi.api import sink
+from alertapi.impl import sinks
+from tests import conftest
+
+
+class _RecordingSink(sink.Sink):
+    def __init__(self, failures=0, delay=0.0):
+        self.records = []
+        self.failures = failures
+        self.delay = delay
+        self.closed = False
+
+    @property
+    def name(self):
+        return 'recording'
+
+    async def write(self, records):
+        await asyncio.sleep(self.delay)
+
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError('Sink is down')
+        self.records.extend(records)
+
+    async def close(self):
+        self.closed = True
+
+
+def _records(start, stop):
+    return [f'{i}\n'.encode() for i in range(start, stop)]
+
+
+def test_failed_replay_keeps_the_failed_chunk(tmp_path):
+    spill_path = tmp_path / 'spill.ndjson'
+    spill_path.write_bytes(b''.join(_records(0, 8)))
+
+    async def main():
+        recording = _RecordingSink(failures=1)
+        runner = sinks.SinkRunner(recording, max_batch_size=4, max_delay=0.01, max_retries=0, spill_path=spill_path)
+
+        runner.submit(b'8\n')
+        await asyncio.sleep(0.1)
+        assert recording.records == []
+
+        runner.submit(b'9\n')
+        await runner.close()
+        return recording
+
+    recording = asyncio.run(main())
+    assert recording.records == _records(0, 10)
+    assert not spill_path.exists()
+
+
+def test_close_waits_for_the_batch_being_written():
+    async def main():
+        recording = _RecordingSink(delay=0.2)
+        runner = sinks.SinkRunner(recording, max_batch_size=2, max_delay=0.01)
+
+        for record in _records(0, 5):
+            runner.submit(record)
+        await asyncio.sleep(0.05)
+
+        await runner.close()
+        return recording, runner.stats()
+
+    recording, stats = asyncio.run(main())
+    assert recording.records == _records(0, 5)
+    assert recording.closed
+    assert stats.written == 5
+
+
+def test_close_spills_the_batch_being_written_after_timeout(tmp_path):
+    spill_path = tmp_path / 'spill.ndjson'
+
+    async def main():
+        runner = sinks.SinkRunner(_RecordingSink(delay=10), max_batch_size=2, max_delay=0.01, spill_path=spill_path)
+
+        for record in _records(0, 5):
+            runner.submit(record)
+        await asyncio.sleep(0.05)
+
+        await runner.close(timeout=0.1)
+        return runner.stats()
+
+    stats = asyncio.run(main())
+    assert spill_path.read_bytes() == b''.join(_records(0, 5))
+    assert stats.spilled == 5
+
+
+def test_overflow_during_replay_keeps_submission_order(tmp_path):
+    spill_path = tmp_path / 'spill.ndjson'
+    spill_path.write_bytes(b''.join(_records(0, 4)))
+
+    async def main():
+        recording = _RecordingSink(failures=1, delay=0.05)
+        runner = sinks.SinkRunner(
+            recording, max_batch_size=2, max_delay=0.01, max_pending=2, max_retries=0, spill_path=spill_path
+        )
+
+        runner.submit(b'4\n')
+        await asyncio.sleep(0.02)
+        # The replay is failing meanwhile, so these overflow the pending records.
+        for record in _records(5, 12):
+            runner.submit(record)
+        await asyncio.sleep(0.1)
+
+        await runner.close()
+        return recording
+
+    recording = asyncio.run(main())
+    assert recording.records == _records(0, 12)
+
+
+def test_failed_deliveries_only_append_to_the_spill(tmp_path):
+    spill_path = tmp_path / 'spill.ndjson'
+    spill_path.write_bytes(b''.join(_records(0, 100)))
+    inode = spill_path.stat().st_ino
+    # Holding the file open keeps its inode from being reused by a rewritten file.
+    held = open(spill_path, 'rb')
+
+    async def main():
+        runner = sinks.SinkRunner(
+            _RecordingSink(failures=100), max_batch_size=10, max_delay=0.01, max_retries=0, spill_path=spill_path
+        )
+
+        for record in _records(100, 105):
+            runner.submit(record)
+            await asyncio.sleep(0.03)
+
+        assert spill_path.stat().st_ino == inode
+        await runner.close(timeout=0.1)
+
+    try:
+        asyncio.run(main())
+    finally:
+        held.close()
+    assert spill_path.read_bytes() == b''.join(_records(0, 105))
+
+
+def test_file_sink_appends_records(tmp_path):
+    path = tmp_path / 'events.ndjson'
+    path.write_bytes(b'0\n')
+
+    async def main():
+        file_sink = sinks.FileSink(path)
+        await file_sink.write(_records(1, 3))
+        await file_sink.write(_records(3, 4))
+        await file_sink.close()
+
+    asyncio.run(main())
+    assert path.read_bytes() == b''.join(_records(0, 4))
+
+
+def _serve_lines(received):
+    async def handle(reader, writer):
+        received.extend(await reader.read())
+        writer.close()
+
+    return handle
+
+
+def test_socket_sink_streams_over_tcp():
+    async def main():
+        received = bytearray()
+        server = await asyncio.start_server(_serve_lines(received), '127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        socket_sink = sinks.SocketSink(host, port)
+
+        async with server:
+            await socket_sink.write(_records(0, 2))
+            await socket_sink.write(_records(2, 4))
+            await socket_sink.close()
+            await asyncio.sleep(0.05)
+        return bytes(received)
+
+    assert asyncio.run(main()) == b''.join(_records(0, 4))
+
+
+@pytest.mark.skipif(not hasattr(asyncio, 'start_unix_server'), reason='Unix sockets are not supported')
+def test_socket_sink_streams_over_unix_socket(tmp_path):
+    path = tmp_path / 'sink.sock'
+
+    async def main():
+        received = bytearray()
+        server = await asyncio.start_unix_server(_serve_lines(received), os.fspath(path))
+        socket_sink = sinks.SocketSink(path=path)
+
+        async with server:
+            await socket_sink.write(_records(0, 3))
+            await socket_sink.close()
+            await asyncio.sleep(0.05)
+        return bytes(received), socket_sink.name
+
+    received, name = asyncio.run(main())
+    assert received == b''.join(_records(0, 3))
+    assert name == f'unix:{path}'
+
+
+def test_webhook_sink_posts_ndjson_batches():
+    async def main():
+        batches = []
+
+        async def hook(request: web.Request) -> web.Response:
+            batches.append((request.content_type, request.headers['Authorization'], await request.read()))
+            return web.Response(status=204)
+
+        async def failing(_: web.Request) -> web.Response:
+            return web.Response(status=500)
+
+        runner, url = await conftest.start_server(web.post('/hook', hook), web.post('/failing', failing))
+        webhook = sinks.WebhookSink(f'{url}/hook', headers={'Authorization': 'Bearer secret'})
+        failing_webhook = sinks.WebhookSink(f'{url}/failing')
+
+        try:
+            await webhook.write(_records(0, 2))
+            await webhook.write(_records(2, 3))
+
+            with pytest.raises(aiohttp.ClientResponseError):
+                await failing_webhook.write(_records(0, 1))
+        finally:
+            await webhook.close()
+            await failing_webhook.close()
+            await runner.cleanup()
+        return batches
+
+    assert asyncio.run(main()) == [
+        ('application/x-ndjson', 'Bearer secret', b''.join(_records(0, 2))),
+        ('application/x-ndjson', 'Bearer secret', b'2\n'),
+    ]
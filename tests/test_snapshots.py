@@ -0,0 +1,30 @@
+from alertapi import snapshots
+from alertapi.impl import entity_factory
+from tests import conftest
+
+
+def _states():
+    factory = entity_factory.EntityFactoryImpl()
+    return [factory.deserialize_state(payload) for payload in conftest.STATES]
+
+
+def test_update_keeps_received_at():
+    states = _states()
+    snapshot = snapshots.StateSnapshot(states, received_at=1000.0)
+
+    snapshot.update(states[0])
+    assert snapshot.received_at == 1000.0
+    assert snapshot.updated_at > 1000.0
+
+    snapshot.reconcile(states)
+    assert snapshot.received_at == snapshot.updated_at > 1000.0
+
+
+def test_round_trip_keeps_both_times():
+    snapshot = snapshots.StateSnapshot(_states(), last_event_id='42', received_at=1000.0, updated_at=2000.0)
+    loaded = snapshots.StateSnapshot.from_bytes(snapshot.to_bytes())
+
+    assert (loaded.received_at, loaded.updated_at) == (1000.0, 2000.0)
+    assert loaded.last_event_id == '42'
+    assert loaded.alert_mask == snapshot.alert_mask
+    assert loaded.stale
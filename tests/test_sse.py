@@ -0,0 +1,86 @@
+import pytest
+
+from alertapi.internal import sse
+
+
+def _feed(*chunks):
+    parser = sse.SSEParser()
+    events = []
+
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return parser, events
+
+
+@pytest.mark.parametrize(
+    'chunks',
+    [
+        (b'event: update\ndata: 1\n\n',),
+        (b'event: update\r\ndata: 1\r\n\r\n',),
+        (b'event: update\rdata: 1\r\r\n',),
+        (b'event: update\r', b'\ndata: 1\r', b'\n\r', b'\n'),
+        (b'event: update\r', b'data: 1\r', b'\r', b': keep-alive\n'),
+        (b'eve', b'nt: upd', b'ate\ndata', b': 1\n', b'\n'),
+    ]
+)
+def test_line_endings_across_chunks(chunks):
+    assert _feed(*chunks)[1] == [('update', '1')]
+
+
+def test_cr_at_chunk_end_waits_for_next_chunk():
+    parser = sse.SSEParser()
+
+    assert parser.feed(b'data: 1\r\r') == []
+    # The second CR is a blank line once the next chunk does not continue it with LF.
+    assert parser.feed(b'data: 2\n\n') == [('message', '1'), ('message', '2')]
+
+
+def test_multiline_data():
+    assert _feed(b'data: first\ndata:second\ndata:  third\n\n')[1] == [('message', 'first\nsecond\n third')]
+
+
+def test_comments_and_unknown_fields_are_ignored():
+    assert _feed(b': keep-alive\n\n:comment\nfoo: bar\ndata: 1\n\n')[1] == [('message', '1')]
+
+
+def test_events_without_data_are_not_dispatched():
+    assert _feed(b'event: ping\n\n')[1] == []
+
+
+def test_retry():
+    parser, _ = _feed(b'retry: 2500\n\n')
+    assert parser.retry == 2500
+
+    parser.feed(b'retry: soon\n\n')
+    assert parser.retry == 2500
+
+
+def test_last_event_id_is_committed_on_dispatch():
+    parser = sse.SSEParser()
+
+    parser.feed(b'id: 1\ndata: a\n\n')
+    assert parser.last_event_id == '1'
+
+    # The event is cut before its blank line.
+    parser.feed(b'id: 2\ndata: b\n')
+    assert parser.last_event_id == '1'
+
+    parser.feed(b'\n')
+    assert parser.last_event_id == '2'
+
+
+def test_last_event_id_persists_and_rejects_null():
+    parser = sse.SSEParser()
+
+    parser.feed(b'id: 1\ndata: a\n\ndata: b\n\n')
+    assert parser.last_event_id == '1'
+
+    parser.feed(b'id: 2\x003\ndata: c\n\n')
+    assert parser.last_event_id == '1'
+
+    parser.feed(b'id\ndata: d\n\n')
+    assert parser.last_event_id == ''
+
+
+def test_invalid_utf8_is_replaced():
+    assert _feed(b'event: up\xffdate\ndata: \xfe1\n\n')[1] == [('up�date', '�1')]
@@ -0,0 +1,84 @@
+import copy
+import datetime
+import pickle
+
+import attr
+import pytest
+
+from alertapi import snowflakes
+from alertapi import states
+
+RAW_CHANGED = '2022-04-04T16:00:00+03:00'
+CHANGED = datetime.datetime(2022, 4, 4, 13, tzinfo=datetime.timezone.utc)
+
+
+def _state(changed=RAW_CHANGED, alert=True):
+    return states.State(
+        id=snowflakes.Snowflake(12), name='Львівська область', name_en='Lviv oblast', alert=alert, changed=changed
+    )
+
+
+@pytest.mark.parametrize('changed', [RAW_CHANGED, CHANGED, CHANGED.replace(tzinfo=None)])
+def test_changed(changed):
+    state = _state(changed)
+
+    assert state.changed == CHANGED
+    assert state.changed.tzinfo is not None
+    assert state.changed_epoch == int(CHANGED.timestamp())
+    assert type(state.changed_epoch) is int
+    assert state.raw_changed is changed
+
+
+def test_changed_is_cached():
+    state = _state()
+    changed = state.changed
+
+    assert state.changed is changed
+    assert state.changed_epoch is state.changed_epoch
+
+
+def test_changed_epoch_does_not_build_datetime():
+    state = _state()
+    state.changed_epoch
+
+    assert state._changed_datetime is None
+
+
+def test_equality_and_hash_ignore_cache():
+    filled, empty = _state(), _state()
+    filled.changed
+    filled.changed_epoch
+
+    assert filled == empty
+    assert hash(filled) == hash(empty)
+    assert len({filled, empty}) == 1
+    assert filled != _state(alert=False)
+    assert hash(filled) != hash(_state(alert=False))
+
+
+def test_repr_ignores_cache():
+    state = _state()
+    before = repr(state)
+    state.changed
+
+    assert repr(state) == before
+    assert before == (
+        "State(id=12, name='Львівська область', name_en='Lviv oblast', alert=True, "
+        "changed='2022-04-04T16:00:00+03:00')"
+    )
+
+
+def test_frozen():
+    state = _state()
+
+    with pytest.raises(attr.exceptions.FrozenInstanceError):
+        state.alert = False
+
+
+def test_copy_and_pickle():
+    state = _state()
+    state.changed
+
+    for clone in (copy.copy(state), pickle.loads(pickle.dumps(state))):
+        assert clone == state
+        assert clone.changed == CHANGED
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import alertapi
+from alertapi import errors
+from alertapi.impl import token_pool
+from tests import conftest
+
+
+def test_requests_spread_across_tokens():
+    pool = token_pool.TokenPool(['a', 'b', 'c'])
+    leases = [pool.acquire() for _ in range(3)]
+
+    assert sorted(lease.token for lease in leases) == ['a', 'b', 'c']
+    for lease in leases:
+        lease.release(200)
+
+    for _ in range(3):
+        with pool.acquire():
+            pass
+
+    assert [stats.requests for stats in pool.stats()] == [2, 2, 2]
+    assert [stats.utilization for stats in pool.stats()] == pytest.approx([1 / 3] * 3)
+    assert all(stats.in_flight == 0 for stats in pool.stats())
+
+
+def test_throttled_token_is_ejected_for_retry_after():
+    pool = token_pool.TokenPool(['a', 'b'])
+    pool.acquire().release(429, {'Retry-After': '30'})
+
+    stats = pool.stats()[0]
+    assert stats.throttled == 1
+    assert 29 < stats.ejected_for <= 30
+    assert {pool.acquire().token for _ in range(3)} == {'b'}
+
+    pool.acquire().release(429)
+    with pytest.raises(errors.TokensExhausted) as exc_info:
+        pool.acquire()
+    assert 29 < exc_info.value.retry_after <= 30
+
+
+def test_quota_headers_prefer_tokens_with_more_remaining():
+    pool = token_pool.TokenPool(['a', 'b'])
+    first, second = pool.acquire(), pool.acquire()
+    first.release(200, {'X-RateLimit-Remaining': '5'})
+    second.release(200, {'X-RateLimit-Remaining': '50'})
+
+    assert [stats.remaining for stats in pool.stats()] == [5, 50]
+    assert pool.select() == 'b'
+
+
+def test_token_is_ejected_after_repeated_auth_failures():
+    pool = token_pool.TokenPool(['a', 'b'], invalid_threshold=3)
+
+    for _ in range(2):
+        pool.acquire().release(401)
+        pool.acquire().release(200)
+    assert pool.stats()[0].ejected_for == 0
+
+    for _ in range(3):
+        lease = pool.acquire()
+        lease.release(401 if lease.token == 'a' else 200)
+
+    stats = pool.stats()[0]
+    assert stats.invalid
+    assert stats.ejected_for > 0
+
+
+def test_last_token_is_not_ejected_for_auth_failures():
+    pool = token_pool.TokenPool(['a'], invalid_threshold=1)
+
+    for _ in range(5):
+        pool.acquire().release(403)
+
+    assert pool.stats()[0].invalid
+    assert pool.select() == 'a'
+
+
+def test_stream_waits_for_exhausted_tokens():
+    async def live(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        await response.write(conftest.sse('hello'))
+        await asyncio.sleep(1)
+        return response
+
+    async def main():
+        runner, url = await conftest.start_server(web.get('/api/states/live', live))
+        pool = token_pool.TokenPool(['a'])
+        pool.acquire().release(429, {'Retry-After': '0.2'})
+        connected = asyncio.Event()
+        gateway = alertapi.GatewayClient(pool, base_urls=[url])
+
+        @gateway.listen(alertapi.ClientConnectedEvent)
+        async def on_hello(_):
+            connected.set()
+
+        try:
+            async with gateway:
+                await asyncio.wait_for(connected.wait(), 5)
+                assert gateway.is_running
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(main())
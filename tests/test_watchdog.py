@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+import alertapi
+from alertapi.impl import watchdog
+from tests import conftest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(watchdog.time, 'monotonic', clock)
+    return clock
+
+
+def test_ping_intervals_and_jitter(clock):
+    heartbeat = watchdog.HeartbeatWatchdog(5.0, 3)
+
+    for interval in (5.0, 5.0, 7.0, 5.0):
+        heartbeat.ping()
+        clock.now += interval
+    heartbeat.ping()
+
+    stats = heartbeat.stats()
+    assert stats.pings == 5
+    assert stats.mean_interval == pytest.approx(5.5)
+    assert stats.max_interval == pytest.approx(7.0)
+    # RFC 3550: J += (|D| - J) / 16 for the differences 0, 2 and -2 of consecutive intervals.
+    expected = 0.0
+    for difference in (0.0, 2.0, 2.0):
+        expected += (difference - expected) / 16
+    assert stats.jitter == pytest.approx(expected)
+
+
+def test_steady_pings_have_no_jitter(clock):
+    heartbeat = watchdog.HeartbeatWatchdog()
+
+    for _ in range(10):
+        heartbeat.ping()
+        clock.now += 5.0
+
+    assert heartbeat.stats().jitter == 0.0
+
+
+def test_reset_keeps_totals_but_not_intervals(clock):
+    heartbeat = watchdog.HeartbeatWatchdog()
+    heartbeat.ping()
+    clock.now += 5.0
+    heartbeat.ping()
+
+    # The gap of a reconnect is no ping interval.
+    clock.now += 60.0
+    heartbeat.reset()
+    heartbeat.ping()
+
+    stats = heartbeat.stats()
+    assert stats.pings == 3
+    assert stats.max_interval == pytest.approx(5.0)
+
+
+def test_stale_threshold(clock):
+    heartbeat = watchdog.HeartbeatWatchdog(5.0, 3)
+    assert heartbeat.timeout == 15.0
+
+    clock.now += 14.5
+    assert not heartbeat.is_stale()
+    assert heartbeat.stats().silence == 14.5
+
+    # Any event counts, not only pings.
+    heartbeat.feed()
+    clock.now += 14.5
+    assert not heartbeat.is_stale()
+
+    clock.now += 0.5
+    assert heartbeat.is_stale()
+    assert heartbeat.stats().stale
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        watchdog.HeartbeatWatchdog(0)
+    with pytest.raises(ValueError):
+        watchdog.HeartbeatWatchdog(5.0, 0)
+
+
+def test_wait_stale_waits_for_silence():
+    async def main():
+        heartbeat = watchdog.HeartbeatWatchdog(0.05, 2)
+        waiting = asyncio.create_task(heartbeat.wait_stale())
+
+        # Events keep postponing the deadline.
+        for _ in range(5):
+            await asyncio.sleep(0.05)
+            heartbeat.feed()
+            assert not waiting.done()
+
+        await asyncio.wait_for(waiting, 1)
+        assert heartbeat.is_stale()
+        assert heartbeat.stats().stale_streams == 1
+
+    asyncio.run(main())
+
+
+def test_stale_stream_reconnects():
+    connections = 0
+    closing = None
+
+    async def silent_stream(request):
+        nonlocal connections
+        connections += 1
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        await response.write(conftest.sse('hello'))
+        # The connection stays open, but nothing arrives anymore.
+        await closing.wait()
+        return response
+
+    async def main():
+        nonlocal closing
+        closing = asyncio.Event()
+        runner, url = await conftest.start_server(web.get('/api/states/live', silent_stream))
+        gateway = alertapi.GatewayClient('token', base_urls=[url], ping_interval=0.1, missed_pings=2)
+
+        try:
+            async with gateway:
+                for _ in range(100):
+                    if connections >= 2:
+                        break
+                    await asyncio.sleep(0.05)
+
+                assert connections >= 2
+                assert gateway.is_running
+                assert gateway.watchdog.stats().stale_streams >= 1
+                assert gateway.reconnects >= 1
+        finally:
+            closing.set()
+            await runner.cleanup()
+
+    asyncio.run(main())